@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from .models import Category, Comment, Post, Tag
+from .services import BlogCommentService
 
 
 @admin.register(Category)
@@ -31,10 +32,10 @@ class PostAdmin(admin.ModelAdmin):
         ("Basic Information", {"fields": ("title", "slug", "author", "category")}),
         ("Content", {"fields": ("content", "excerpt", "featured_image")}),
         ("Settings", {"fields": ("status", "is_featured", "tags")}),
-        ("Metadata", {"fields": ("views_count", "published_at"), "classes": ("collapse",)}),
+        ("Metadata", {"fields": ("views_count", "word_count", "reading_time", "published_at"), "classes": ("collapse",)}),
     )
 
-    readonly_fields = ("views_count",)
+    readonly_fields = ("views_count", "word_count", "reading_time")
 
 
 @admin.register(Comment)
@@ -45,11 +46,11 @@ class CommentAdmin(admin.ModelAdmin):
     actions = ["approve_comments", "unapprove_comments"]
 
     def approve_comments(self, request, queryset):
-        queryset.update(is_approved=True)
+        BlogCommentService.set_approval(queryset, True)
 
     approve_comments.short_description = "Approve selected comments"
 
     def unapprove_comments(self, request, queryset):
-        queryset.update(is_approved=False)
+        BlogCommentService.set_approval(queryset, False)
 
     unapprove_comments.short_description = "Unapprove selected comments"
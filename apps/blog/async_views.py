@@ -0,0 +1,217 @@
+"""Async twins of the public read endpoints, for deployments served by an ASGI server.
+
+They run on Django's async ORM, so a request waiting on the database does not hold a
+worker thread. Payloads, validators and query budgets match the DRF views in ``views.py``;
+requests those views handle with numbered pages or search are delegated to them.
+"""
+
+import asyncio
+import math
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from apps.core.cache import aget_generations, cache_response
+from apps.core.conditional import latest, not_modified, set_validators, weak_etag
+from apps.core.query_budget import query_budget
+
+from .counters import post_view_counter
+from .models import Category, Post, Tag
+from .pagination import CommentPagination, PopularPostsPagination, PublishedFeedPagination, TrendingPostsPagination
+from .serializers import CategorySerializer, PostDetailSerializer, PostListSerializer, TagSerializer
+from .services import BlogAnalyticsService, BlogPostService, BlogRecommendationService, BlogTaxonomyService
+from .views import POST_LIST_MODELS, PostDetailView, PostListView
+
+
+def _not_found(detail: str = "Not found.") -> JsonResponse:
+    return JsonResponse({"detail": detail}, status=404)
+
+
+async def _post_list_data(posts, request: Request) -> list:
+    """``PostListSerializer`` data, with the buffered view counts fetched from the cache first."""
+    pending = await post_view_counter.apending(post.id for post in posts)
+    return PostListSerializer(posts, many=True, context={"request": request, "pending_views": pending}).data
+
+
+async def _keyset_page(paginator, queryset, request: Request) -> dict:
+    posts = await paginator.apaginate_queryset(queryset, request)
+    return paginator.get_paginated_data(await _post_list_data(posts, request))
+
+
+async def _numbered_page(queryset, serializer_class, request: Request) -> dict:
+    """``PageNumberPagination`` payload, counted and fetched through the async ORM."""
+    paginator = PageNumberPagination()
+    page_size = paginator.get_page_size(request)
+    try:
+        number = int(request.query_params.get(paginator.page_query_param, 1))
+    except ValueError:
+        raise NotFound(paginator.invalid_page_message)
+
+    count = await queryset.acount()
+    pages = max(1, math.ceil(count / page_size))
+    if not 1 <= number <= pages:
+        raise NotFound(paginator.invalid_page_message)
+    offset = (number - 1) * page_size
+    items = [item async for item in queryset[offset : offset + page_size]]
+
+    url = request.build_absolute_uri()
+    previous = None
+    if number == 2:
+        previous = remove_query_param(url, paginator.page_query_param)
+    elif number > 2:
+        previous = replace_query_param(url, paginator.page_query_param, number - 1)
+    return {
+        "count": count,
+        "next": replace_query_param(url, paginator.page_query_param, number + 1) if number < pages else None,
+        "previous": previous,
+        "results": serializer_class(items, many=True, context={"request": request}).data,
+    }
+
+
+@query_budget(4)
+@require_GET
+@cache_response(*POST_LIST_MODELS)
+async def post_list_view(request):
+    params = request.GET
+    if "page" in params or params.get("search"):
+        # Numbered pages and relevance-ranked search stay on the sync view
+        response = await sync_to_async(PostListView.as_view())(request)
+        return await sync_to_async(response.render)()
+
+    drf_request = Request(request)
+    # Same filters as the sync view
+    queryset = PostListView(request=drf_request, args=(), kwargs={}, format_kwarg=None).get_queryset()
+    paginator = PublishedFeedPagination()
+    try:
+        posts = await paginator.apaginate_queryset(queryset, drf_request)
+    except NotFound as exc:
+        return _not_found(exc.detail)
+
+    etag = weak_etag(
+        [(post.id, post.updated_at, post.comments_count) for post in posts], await aget_generations((Category, Tag))
+    )
+    last_modified = latest(*(post.updated_at for post in posts))
+    response = not_modified(request, etag, last_modified)
+    if response is None:
+        response = JsonResponse(paginator.get_paginated_data(await _post_list_data(posts, drf_request)))
+    return set_validators(response, etag, last_modified)
+
+
+@query_budget(8)
+@require_GET
+async def post_detail_view(request, slug):
+    if request.headers.get("If-None-Match") or request.headers.get("If-Modified-Since"):
+        state = await BlogPostService.aget_post_validators(slug)
+        if state is None:
+            return _not_found()
+        etag, last_modified = PostDetailView.get_validators(**state, generations=await aget_generations((Category, Tag)))
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            await BlogPostService.aincrement_post_views(Post(id=state["post_id"]))
+            return response
+
+    try:
+        post = await BlogPostService.get_post_detail(CommentPagination.page_size).aget(slug=slug)
+    except Post.DoesNotExist:
+        return _not_found()
+
+    # The buffered view count and the related-posts query don't depend on each other
+    _, related_posts = await asyncio.gather(
+        BlogPostService.aincrement_post_views(post),
+        BlogRecommendationService.aget_related_posts(post),
+    )
+
+    drf_request = Request(request)
+    # Category post counts may still hit the database while serializing
+    data = await sync_to_async(lambda: PostDetailSerializer(post, context={"request": drf_request}).data)()
+    data["related_posts"] = await _post_list_data(related_posts, drf_request)
+    data["comments_next"] = None
+    if post.comments_count > len(post.comment_page):
+        url = reverse("blog:comment-list", kwargs={"post_slug": post.slug})
+        data["comments_next"] = CommentPagination().get_link_after(drf_request, post.comment_page[-1], url)
+
+    etag, last_modified = PostDetailView.get_validators(
+        post.id, post.updated_at, post.comments_count, post.comments_updated_at, await aget_generations((Category, Tag))
+    )
+    return set_validators(JsonResponse(data), etag, last_modified)
+
+
+@query_budget(3)
+@require_GET
+@cache_response(*POST_LIST_MODELS)
+async def featured_posts_view(request):
+    posts = [post async for post in BlogPostService.get_featured_posts().defer("content")]
+    return JsonResponse(await _post_list_data(posts, Request(request)), safe=False)
+
+
+@query_budget(3)
+@require_GET
+@cache_response(*POST_LIST_MODELS)
+async def popular_posts_view(request):
+    try:
+        data = await _keyset_page(
+            PopularPostsPagination(), BlogPostService.get_published_posts().defer("content"), Request(request)
+        )
+    except NotFound as exc:
+        return _not_found(exc.detail)
+    return JsonResponse(data)
+
+
+@query_budget(3)
+@require_GET
+@cache_response(*POST_LIST_MODELS)
+async def trending_posts_view(request):
+    try:
+        data = await _keyset_page(
+            TrendingPostsPagination(), BlogPostService.get_published_posts().defer("content"), Request(request)
+        )
+    except NotFound as exc:
+        return _not_found(exc.detail)
+    return JsonResponse(data)
+
+
+@query_budget(3)
+@require_GET
+@cache_response(*POST_LIST_MODELS)
+async def recent_posts_view(request):
+    try:
+        data = await _keyset_page(
+            PublishedFeedPagination(), BlogPostService.get_published_posts().defer("content"), Request(request)
+        )
+    except NotFound as exc:
+        return _not_found(exc.detail)
+    return JsonResponse(data)
+
+
+@query_budget(3)
+@require_GET
+@cache_response(Category, Post)
+async def category_list_view(request):
+    try:
+        data = await _numbered_page(BlogTaxonomyService.get_categories(), CategorySerializer, Request(request))
+    except NotFound as exc:
+        return _not_found(exc.detail)
+    return JsonResponse(data)
+
+
+@query_budget(3)
+@require_GET
+@cache_response(Tag, Post)
+async def tag_list_view(request):
+    try:
+        data = await _numbered_page(BlogTaxonomyService.get_tags(), TagSerializer, Request(request))
+    except NotFound as exc:
+        return _not_found(exc.detail)
+    return JsonResponse(data)
+
+
+@query_budget(2)
+@require_GET
+async def blog_stats_view(request):
+    return JsonResponse(await BlogAnalyticsService.aget_blog_stats())
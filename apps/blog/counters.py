@@ -0,0 +1,214 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+from django.dispatch import Signal
+
+from apps.core.db import use_primary
+
+from .models import Post
+
+# Sent after buffered views have been written to blog_posts, with deltas={post_id: views}
+views_flushed = Signal()
+
+
+def apply_view_deltas(deltas: Dict[int, int], batch_size: int = 500) -> None:
+    """Add ``deltas`` to ``views_count`` with one ``UPDATE ... CASE`` per batch."""
+    items = [(post_id, delta) for post_id, delta in deltas.items() if delta]
+    for start in range(0, len(items), batch_size):
+        batch = items[start : start + batch_size]
+        increment = Case(
+            *[When(id=post_id, then=Value(delta)) for post_id, delta in batch],
+            default=Value(0),
+            output_field=PositiveIntegerField(),
+        )
+        Post.objects.filter(id__in=[post_id for post_id, _ in batch]).update(views_count=F("views_count") + increment)
+
+
+class PostViewCounter:
+    """Write-behind buffer for post views.
+
+    Views are accumulated with the cache's atomic ``incr`` (one key per post) and written
+    to the database in batches by ``flush()``. Posts with pending views are found through an
+    append-only log built from an ``incr`` sequence, so no cache-specific set type is needed.
+    If the cache is unavailable, or is a per-process cache no flusher could read, views go
+    to a per-process buffer that the process writes through itself every
+    ``local_flush_interval`` seconds.
+    """
+
+    key_prefix = "blog:views"
+    local_flush_interval = 30
+
+    def __init__(self, cache_alias: str = None):
+        self.cache_alias = cache_alias or getattr(settings, "BLOG_VIEW_COUNTER_CACHE", "default")
+        self._local = defaultdict(int)
+        self._local_lock = threading.Lock()
+        self._local_flushed_at = time.monotonic()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    @property
+    def shared(self) -> bool:
+        """Whether a separate flusher process sees this cache's entries."""
+        return not isinstance(self.cache, (LocMemCache, DummyCache))
+
+    def check_shared(self) -> None:
+        """Refuse a per-process cache: a separate flusher would never see the web processes' views."""
+        if not self.shared:
+            raise ImproperlyConfigured(
+                f"Post views are buffered in the {self.cache_alias!r} cache ({type(self.cache).__name__}), whose "
+                "entries live in one process, so flush_post_views cannot see them. Point BLOG_VIEW_COUNTER_CACHE "
+                "at a cache shared by all processes (Redis, Memcached, database)."
+            )
+
+    def _pending_key(self, post_id: int) -> str:
+        return f"{self.key_prefix}:pending:{post_id}"
+
+    def _log_key(self, seq: int) -> str:
+        return f"{self.key_prefix}:log:{seq}"
+
+    @property
+    def _seq_key(self) -> str:
+        return f"{self.key_prefix}:log:seq"
+
+    @property
+    def _flushed_key(self) -> str:
+        return f"{self.key_prefix}:log:flushed"
+
+    @property
+    def _gap_key(self) -> str:
+        return f"{self.key_prefix}:log:gap"
+
+    def _incr(self, key: str, delta: int = 1) -> int:
+        self.cache.add(key, 0, timeout=None)
+        return self.cache.incr(key, delta)
+
+    def _register(self, post_id: int) -> None:
+        # Two steps: a flusher can see the new sequence number before its log entry (see flush)
+        self.cache.set(self._log_key(self._incr(self._seq_key)), post_id, timeout=None)
+
+    def record(self, post_id: int, count: int = 1) -> None:
+        if not self.shared:
+            # No flusher can see a per-process cache (the dev default): this process writes its own views
+            self._record_local(post_id, count)
+            return
+        try:
+            if self._incr(self._pending_key(post_id), count) == count:
+                # First views since the last flush: make the post discoverable by the flusher
+                self._register(post_id)
+        except Exception:
+            self._record_local(post_id, count)
+
+    def _record_local(self, post_id: int, count: int) -> None:
+        with self._local_lock:
+            self._local[post_id] += count
+        self.flush_local()
+
+    def pending(self, post_ids: Iterable[int]) -> Dict[int, int]:
+        post_ids = list(post_ids)
+        if not post_ids:
+            return {}
+        pending = defaultdict(int)
+        try:
+            pending.update(self.pending_from_cache(post_ids))
+        except Exception:
+            pass
+        for post_id in post_ids:
+            if post_id in self._local:
+                pending[post_id] += self._local[post_id]
+        return dict(pending)
+
+    async def apending(self, post_ids: Iterable[int]) -> Dict[int, int]:
+        """``pending`` for async views, without blocking the event loop."""
+        post_ids = list(post_ids)
+        if not post_ids:
+            return {}
+        pending = defaultdict(int)
+        keys = {self._pending_key(post_id): post_id for post_id in post_ids}
+        try:
+            pending.update({keys[key]: int(value) for key, value in (await self.cache.aget_many(list(keys))).items()})
+        except Exception:
+            pass
+        for post_id in post_ids:
+            if post_id in self._local:
+                pending[post_id] += self._local[post_id]
+        return dict(pending)
+
+    @use_primary()
+    def flush(self, batch_size: int = 500) -> Dict[int, int]:
+        """Write buffered views to the database and return the deltas that were applied.
+
+        Run a single flusher at a time. Deltas are subtracted from the cache only after the
+        database write commits, so a crash can at worst re-apply one batch, never drop it.
+        With a per-process cache, this process's own buffer is written instead.
+        """
+        if not self.shared:
+            return self.flush_local(force=True)
+        start = self.cache.get(self._flushed_key, 0)
+        end = self.cache.get(self._seq_key, 0)
+
+        entries = {}
+        log_keys = [self._log_key(seq) for seq in range(start + 1, end + 1)]
+        for offset in range(0, len(log_keys), batch_size):
+            entries.update(self.cache.get_many(log_keys[offset : offset + batch_size]))
+        end = self._readable_end(start, end, entries)
+        log_keys = log_keys[: end - start]
+        post_ids = {entries[key] for key in log_keys if key in entries}
+
+        deltas = {post_id: delta for post_id, delta in self.pending_from_cache(post_ids).items() if delta > 0}
+        if deltas:
+            with transaction.atomic():
+                apply_view_deltas(deltas, batch_size=batch_size)
+            for post_id, delta in deltas.items():
+                if self.cache.decr(self._pending_key(post_id), delta) > 0:
+                    # Views that arrived mid-flush did not register themselves; keep them discoverable
+                    self._register(post_id)
+
+        self.cache.set(self._flushed_key, end, timeout=None)
+        self.cache.delete_many(log_keys)
+
+        if deltas:
+            views_flushed.send(sender=type(self), deltas=deltas)
+        return deltas
+
+    def _readable_end(self, start: int, end: int, entries: Dict[str, int]) -> int:
+        """Last sequence number the flush may consume: the one before the first missing log entry.
+
+        A missing entry is usually a ``_register`` between its two steps; skipping it would
+        leave that post's views pending with nothing pointing at them. An entry still missing
+        at the next flush belonged to a writer that died in between, and is skipped.
+        """
+        stalled = self.cache.get(self._gap_key)
+        for seq in range(start + 1, end + 1):
+            if self._log_key(seq) not in entries and seq != stalled:
+                self.cache.set(self._gap_key, seq, timeout=None)
+                return seq - 1
+        return end
+
+    def pending_from_cache(self, post_ids: Iterable[int]) -> Dict[int, int]:
+        keys = {self._pending_key(post_id): post_id for post_id in post_ids}
+        return {keys[key]: int(value) for key, value in self.cache.get_many(list(keys)).items()}
+
+    def flush_local(self, force: bool = False) -> Dict[int, int]:
+        if not force and time.monotonic() - self._local_flushed_at < self.local_flush_interval:
+            return {}
+        with self._local_lock:
+            deltas, self._local = dict(self._local), defaultdict(int)
+            self._local_flushed_at = time.monotonic()
+        if deltas:
+            apply_view_deltas(deltas)
+            views_flushed.send(sender=type(self), deltas=deltas)
+        return deltas
+
+
+post_view_counter = PostViewCounter()
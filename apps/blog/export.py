@@ -0,0 +1,173 @@
+import csv
+import json
+import zlib
+from datetime import datetime, time
+from typing import Dict, Iterable, Iterator, Optional
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Comment, Post
+
+ENTITIES = ("posts", "comments", "users")
+FORMATS = ("ndjson", "csv")
+DEFAULT_CHUNK_SIZE = 2000
+
+POST_FIELDS = [
+    "id",
+    "title",
+    "slug",
+    "status",
+    "author",
+    "category",
+    "tags",
+    "excerpt",
+    "content",
+    "is_featured",
+    "views_count",
+    "word_count",
+    "reading_time",
+    "created_at",
+    "updated_at",
+    "published_at",
+]
+COMMENT_FIELDS = ["id", "post_id", "author_id", "content", "is_approved", "created_at", "updated_at"]
+USER_FIELDS = [
+    "id",
+    "email",
+    "username",
+    "first_name",
+    "last_name",
+    "is_active",
+    "is_staff",
+    "is_verified",
+    "date_joined",
+    "created_at",
+    "updated_at",
+]
+
+FIELDS = {"posts": POST_FIELDS, "comments": COMMENT_FIELDS, "users": USER_FIELDS}
+
+
+def parse_updated_since(value: Optional[str]) -> Optional[datetime]:
+    """Accept an ISO date or datetime; naive values are in the current time zone."""
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid updated_since value: {value!r}")
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _since(queryset, updated_since: Optional[datetime]):
+    return queryset if updated_since is None else queryset.filter(updated_at__gte=updated_since)
+
+
+def export_posts(updated_since=None, chunk_size=DEFAULT_CHUNK_SIZE) -> Iterator[Dict]:
+    # Drafts included: this is a full dump, not the public feed
+    queryset = _since(Post.objects.all(), updated_since).select_related("author", "category").prefetch_related("tags")
+    for post in queryset.order_by("id").iterator(chunk_size=chunk_size):
+        yield {
+            "id": post.id,
+            "title": post.title,
+            "slug": post.slug,
+            "status": post.status,
+            "author": {"id": post.author_id, "username": post.author.username},
+            "category": post.category and {"id": post.category_id, "name": post.category.name, "slug": post.category.slug},
+            "tags": [tag.name for tag in post.tags.all()],
+            "excerpt": post.excerpt,
+            "content": post.content,
+            "is_featured": post.is_featured,
+            "views_count": post.views_count,
+            "word_count": post.word_count,
+            "reading_time": post.reading_time,
+            "created_at": post.created_at,
+            "updated_at": post.updated_at,
+            "published_at": post.published_at,
+        }
+
+
+def export_comments(updated_since=None, chunk_size=DEFAULT_CHUNK_SIZE) -> Iterator[Dict]:
+    queryset = _since(Comment.objects.all(), updated_since).order_by("id").values(*COMMENT_FIELDS)
+    yield from queryset.iterator(chunk_size=chunk_size)
+
+
+def export_users(updated_since=None, chunk_size=DEFAULT_CHUNK_SIZE) -> Iterator[Dict]:
+    queryset = _since(get_user_model().objects.all(), updated_since).order_by("id").values(*USER_FIELDS)
+    yield from queryset.iterator(chunk_size=chunk_size)
+
+
+EXPORTERS = {"posts": export_posts, "comments": export_comments, "users": export_users}
+
+
+def iter_records(entities: Iterable[str], updated_since=None, chunk_size=DEFAULT_CHUNK_SIZE) -> Iterator[Dict]:
+    """Records of each entity in turn, tagged with their ``type`` (for mixed NDJSON dumps)."""
+    for entity in entities:
+        for record in EXPORTERS[entity](updated_since=updated_since, chunk_size=chunk_size):
+            yield {"type": entity, **record}
+
+
+def render_ndjson(records: Iterable[Dict]) -> Iterator[str]:
+    for record in records:
+        yield json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the formatted line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def render_csv(records: Iterable[Dict], fields) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for record in records:
+        row = []
+        for field in fields:
+            value = record.get(field)
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            row.append("" if value is None else value)
+        yield writer.writerow(row)
+
+
+def render(entities, output: str = "ndjson", updated_since=None, chunk_size=DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Stream ``entities`` as NDJSON (any number) or CSV (exactly one entity)."""
+    if output == "csv":
+        if len(entities) != 1:
+            raise ValueError("CSV exports take exactly one entity")
+        records = EXPORTERS[entities[0]](updated_since=updated_since, chunk_size=chunk_size)
+        return render_csv(records, FIELDS[entities[0]])
+    return render_ndjson(iter_records(entities, updated_since=updated_since, chunk_size=chunk_size))
+
+
+def encode(chunks: Iterable[str], compress: bool = False, flush_every: int = 1 << 16) -> Iterator[bytes]:
+    """UTF-8 encode ``chunks``, optionally as one gzip stream, yielding buffers of about ``flush_every`` bytes."""
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer = []
+    size = 0
+    for chunk in chunks:
+        data = chunk.encode()
+        buffer.append(data)
+        size += len(data)
+        if size >= flush_every:
+            data = b"".join(buffer)
+            buffer, size = [], 0
+            data = compressor.compress(data) if compressor else data
+            if data:
+                yield data
+    data = b"".join(buffer)
+    if compressor:
+        data = compressor.compress(data) + compressor.flush()
+    if data:
+        yield data
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.blog.audit import ACCEPTED, audited_querysets
+from apps.core.explain import analyze, explain, find_issues, suggest_index, table_rows
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN every blog service queryset and flag full-table scans and sorts on large tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--min-rows", type=int, default=1000, help="Ignore tables smaller than this")
+        parser.add_argument("--plans", action="store_true", help="Print every plan")
+        parser.add_argument(
+            "--analyze", action="store_true", help="Refresh the planner statistics first, so plans match the data"
+        )
+        parser.add_argument("--fail", action="store_true", help="Exit with an error if anything is flagged (for CI)")
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ("sqlite", "postgresql"):
+            raise CommandError(f"Plans on {connection.vendor} are not supported")
+        if options["analyze"]:
+            analyze()
+
+        rows = {}
+        flagged = 0
+        for name, queryset in audited_querysets():
+            plan = explain(queryset)
+            base_table = queryset.model._meta.db_table
+            issues = []
+            for issue in find_issues(plan, connection.vendor):
+                count = table_rows(issue.table or base_table, cache=rows)
+                # Unknown tables are subquery aliases: keep them, their size can't be told
+                if count is None or count >= options["min_rows"]:
+                    issues.append((issue, count))
+
+            if options["plans"]:
+                self.stdout.write(f"{name}:\n{plan}\n")
+            if not issues:
+                self.stdout.write(f"{name}: ok")
+                continue
+            if name in ACCEPTED:
+                self.stdout.write(f"{name}: accepted ({ACCEPTED[name]})")
+                continue
+
+            flagged += 1
+            summary = ", ".join(
+                f"{issue.kind} {issue.table or base_table}" + ("" if count is None else f" ({count} rows)")
+                for issue, count in issues
+            )
+            self.stdout.write(self.style.WARNING(f"{name}: {summary}"))
+            suggestion = suggest_index(queryset)
+            if suggestion:
+                self.stdout.write(f"    consider {queryset.model.__name__}.Meta.indexes: {suggestion}")
+            else:
+                self.stdout.write(
+                    "    no missing index to suggest; where an existing one fits, the planner preferred "
+                    "another plan (stale statistics? run again with --analyze)"
+                )
+
+        if flagged and options["fail"]:
+            raise CommandError(f"{flagged} querysets need attention")
+        self.stdout.write(self.style.SUCCESS(f"Audited querysets, {flagged} flagged"))
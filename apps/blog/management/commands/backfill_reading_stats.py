@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from apps.blog.models import Post
+
+
+class Command(BaseCommand):
+    help = "Compute stored word_count/reading_time for existing posts in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--all", action="store_true", help="Recompute every post, not only rows without a word count")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Post.objects.all() if options["all"] else Post.objects.filter(word_count=0)
+        queryset = queryset.only("id", "content").order_by("id")
+
+        last_id = 0
+        updated = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+
+            for post in batch:
+                post.update_reading_stats()
+            Post.objects.bulk_update(batch, ["word_count", "reading_time"])
+
+            last_id = batch[-1].id
+            updated += len(batch)
+            self.stdout.write(f"Updated {updated} posts")
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled reading stats for {updated} posts"))
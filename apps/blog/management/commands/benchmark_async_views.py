@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+from django.urls import reverse
+
+from apps.blog.models import Post
+from apps.core.benchmark import summarize
+
+# endpoint -> (sync view, async view)
+ENDPOINTS = {
+    "list": ("blog:post-list", "blog:async-post-list"),
+    "detail": ("blog:post-detail", "blog:async-post-detail"),
+    "popular": ("blog:popular-posts", "blog:async-popular-posts"),
+    "categories": ("blog:category-list", "blog:async-category-list"),
+    "stats": ("blog:blog-stats", "blog:async-blog-stats"),
+}
+
+
+class Command(BaseCommand):
+    help = "Compare throughput and latency of the sync (WSGI) and async (ASGI) read endpoints at several concurrency limits"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--endpoint", choices=sorted(ENDPOINTS), default="list")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per run")
+        parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+        parser.add_argument("--host", default="localhost", help="Host header (must be in ALLOWED_HOSTS)")
+        parser.add_argument("--cached", action="store_true", help="Let anonymous responses come from the response cache")
+
+    def handle(self, *args, **options):
+        sync_name, async_name = ENDPOINTS[options["endpoint"]]
+        kwargs = {}
+        if options["endpoint"] == "detail":
+            slug = Post.objects.filter(status="published").values_list("slug", flat=True).first()
+            if slug is None:
+                raise CommandError("No published posts to request; run seed data first")
+            kwargs = {"slug": slug}
+        self.host = options["host"]
+        self.cached = options["cached"]
+        self.total = options["requests"]
+
+        self.stdout.write(f"{'mode':<6} {'concurrency':>11} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+        for concurrency in options["concurrency"]:
+            for mode, result in (
+                ("wsgi", self.run_sync(reverse(sync_name, kwargs=kwargs), concurrency)),
+                ("asgi", asyncio.run(self.run_async(reverse(async_name, kwargs=kwargs), concurrency))),
+            ):
+                self.stdout.write(
+                    f"{mode:<6} {concurrency:>11} {result['rps']:>9.1f} {result['p50']:>8.1f} "
+                    f"{result['p95']:>8.1f} {result['errors']:>7}"
+                )
+
+    def params(self, index):
+        # A distinct query string per request keeps the response cache out of the measurement
+        return {} if self.cached else {"bench": index}
+
+    def run_sync(self, url, concurrency):
+        local = threading.local()
+        latencies, errors = [], 0
+
+        def fetch(index):
+            if not hasattr(local, "client"):
+                local.client = Client(SERVER_NAME=self.host)
+            started = time.perf_counter()
+            response = local.client.get(url, self.params(index))
+            return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for latency, status in pool.map(fetch, range(self.total)):
+                latencies.append(latency)
+                errors += status >= 400
+        return summarize(latencies, time.perf_counter() - started, errors)
+
+    async def run_async(self, url, concurrency):
+        client = AsyncClient(SERVER_NAME=self.host)
+        limit = asyncio.Semaphore(concurrency)
+
+        async def fetch(index):
+            async with limit:
+                started = time.perf_counter()
+                response = await client.get(url, self.params(index))
+                return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(fetch(index) for index in range(self.total)))
+        elapsed = time.perf_counter() - started
+        return summarize([latency for latency, _ in results], elapsed, sum(status >= 400 for _, status in results))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.blog import export
+
+
+class Command(BaseCommand):
+    help = "Stream posts, comments and users as NDJSON or CSV for the warehouse"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--entity", action="append", choices=export.ENTITIES, help="Repeatable; defaults to all")
+        parser.add_argument("--format", choices=export.FORMATS, default="ndjson", dest="output_format")
+        parser.add_argument("--output", default="-", help="File path, or - for stdout")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument("--updated-since", help="ISO date/datetime; only rows updated at or after it")
+        parser.add_argument("--chunk-size", type=int, default=export.DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        entities = options["entity"] or list(export.ENTITIES)
+        try:
+            updated_since = export.parse_updated_since(options["updated_since"])
+            chunks = export.render(
+                entities, options["output_format"], updated_since=updated_since, chunk_size=options["chunk_size"]
+            )
+        except ValueError as exc:
+            raise CommandError(exc)
+
+        if options["output"] == "-":
+            if options["gzip"]:
+                raise CommandError("--gzip needs --output")
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["output"], "wb") as output:
+            for data in export.encode(chunks, compress=options["gzip"]):
+                output.write(data)
+        self.stderr.write(self.style.SUCCESS(f"Exported {', '.join(entities)} to {options['output']}"))
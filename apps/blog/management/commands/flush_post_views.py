@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.blog.counters import post_view_counter
+
+
+class Command(BaseCommand):
+    help = "Write buffered post views to blog_posts.views_count"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--interval", type=int, default=0, help="Keep running and flush every N seconds")
+
+    def handle(self, *args, **options):
+        post_view_counter.check_shared()
+        while True:
+            deltas = post_view_counter.flush(batch_size=options["batch_size"])
+            self.stdout.write(f"Flushed {sum(deltas.values())} views across {len(deltas)} posts")
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
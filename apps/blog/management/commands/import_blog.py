@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from apps.blog.importer import DEFAULT_BATCH_SIZE, BlogImporter
+
+
+class Command(BaseCommand):
+    help = "Bulk-import posts, tags and comments from an NDJSON file (resumable)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Records per transaction")
+        parser.add_argument("--source", help="Checkpoint name; defaults to the file path")
+        parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start from the top")
+
+    def handle(self, *args, **options):
+        importer = BlogImporter(batch_size=options["batch_size"], log=self.stdout.write)
+        counts = importer.run(options["path"], source=options["source"], restart=options["restart"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {counts['posts']} posts and {counts['comments']} comments ({counts['skipped']} skipped). "
+                "Their related posts are refreshed by rebuild_related_posts --stale."
+            )
+        )
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.blog.services import BlogRecommendationService
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored related-post lists, of every published post or only of those flagged by edits"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--stale", action="store_true", help="Only refresh posts whose lists edits made stale")
+        parser.add_argument("--loop", action="store_true", help="With --stale, keep polling instead of exiting")
+        parser.add_argument("--interval", type=float, default=10.0, help="Seconds between polls with --loop")
+
+    def handle(self, *args, **options):
+        if not options["stale"]:
+            rebuilt = BlogRecommendationService.rebuild_all(batch_size=options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt related posts for {rebuilt} posts"))
+            return
+
+        while True:
+            refreshed = BlogRecommendationService.refresh_stale(batch_size=options["batch_size"])
+            if refreshed or not options["loop"]:
+                self.stdout.write(f"Refreshed related posts for {refreshed} stale posts")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
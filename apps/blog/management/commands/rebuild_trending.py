@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from apps.blog.services import BlogTrendingService
+
+
+class Command(BaseCommand):
+    help = "Recompute trending scores from the hourly view buckets and drop buckets past their weight"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--prune-half-lives",
+            type=float,
+            default=30,
+            help="Delete buckets older than this many half-lives first (0 keeps them all)",
+        )
+
+    def handle(self, *args, **options):
+        if options["prune_half_lives"]:
+            pruned = BlogTrendingService.prune_buckets(options["prune_half_lives"] * BlogTrendingService.half_life())
+            self.stdout.write(f"Pruned {pruned} view buckets")
+        rebuilt = BlogTrendingService.rebuild_scores(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt trending scores for {rebuilt} posts"))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.blog.services import BlogAnalyticsService
+
+
+class Command(BaseCommand):
+    help = "Recompute the blog stats snapshot from scratch"
+
+    def handle(self, *args, **options):
+        stats = BlogAnalyticsService.reconcile_blog_stats()
+        summary = ", ".join(f"{field}={value}" for field, value in stats.items())
+        self.stdout.write(self.style.SUCCESS(f"Reconciled blog stats: {summary}"))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from apps.blog.seeding import DEFAULT_BATCH_SIZE, SEED_PASSWORD, BlogSeeder
+
+
+class Command(BaseCommand):
+    help = "Fill the database with realistic users, posts and comments for load testing (bulk inserts)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=5000)
+        parser.add_argument("--posts", type=int, default=100_000)
+        parser.add_argument("--comments", type=int, default=1_000_000)
+        parser.add_argument("--tags", type=int, default=80, help="Size of the tag vocabulary")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per insert")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed; the same seed generates the same data")
+        parser.add_argument(
+            "--skip-search-index", action="store_true", help="Leave indexing to rebuild_search_index (about half the time)"
+        )
+
+    def handle(self, *args, **options):
+        seeder = BlogSeeder(
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            search_index=not options["skip_search_index"],
+            log=self.stdout.write,
+        )
+        counts = seeder.run(options["users"], options["posts"], options["comments"], tags=options["tags"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {counts['users']} users, {counts['posts']} posts and {counts['comments']} comments "
+                f"(password '{SEED_PASSWORD}'). Run rebuild_related_posts to fill recommendations."
+            )
+        )
@@ -1,10 +1,39 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import Q
 from django.urls import reverse
-from django.utils.text import slugify
 
+from apps.core.slugs import UniqueSlugMixin
 
-class Category(models.Model):
+
+class TrackedFieldsMixin:
+    """Remember ``TRACKED_FIELDS`` as loaded so post_save receivers can tell what a save changed."""
+
+    TRACKED_FIELDS = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {name: getattr(instance, name) for name in cls.TRACKED_FIELDS if name in field_names}
+        return instance
+
+    def get_changed_fields(self):
+        """Tracked fields that differ from the values loaded from the database (all of them for new rows)."""
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None:
+            return set(self.TRACKED_FIELDS)
+        return {name for name, value in loaded.items() if getattr(self, name) != value}
+
+    def get_loaded_value(self, name, default=None):
+        return getattr(self, "_loaded_values", {}).get(name, default)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # post_save receivers have seen the changes by now; later saves compare against this state
+        self._loaded_values = {name: getattr(self, name) for name in self.TRACKED_FIELDS}
+
+
+class Category(UniqueSlugMixin, models.Model):
     name = models.CharField(max_length=100, unique=True)
     slug = models.SlugField(max_length=100, unique=True, blank=True)
     description = models.TextField(blank=True)
@@ -18,13 +47,13 @@ class Category(models.Model):
     def __str__(self):
         return self.name
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
 
+class Post(TrackedFieldsMixin, UniqueSlugMixin, models.Model):
+    WORDS_PER_MINUTE = 200
+    SLUG_SOURCE = "title"
+    # Columns whose changes trigger derived-data refreshes (related posts, stats)
+    TRACKED_FIELDS = ("status", "category_id", "author_id")
 
-class Post(models.Model):
     STATUS_CHOICES = [
         ("draft", "Draft"),
         ("published", "Published"),
@@ -38,9 +67,17 @@ class Post(models.Model):
     content = models.TextField()
     excerpt = models.TextField(max_length=500, blank=True)
     featured_image = models.ImageField(upload_to="blog/images/", null=True, blank=True)
+    # Resized copies, filled in by generate_image_variants (see apps.core.images)
+    featured_image_variants = models.JSONField(default=dict, blank=True, editable=False)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="draft")
     is_featured = models.BooleanField(default=False)
     views_count = models.PositiveIntegerField(default=0)
+    # log2 of the decayed view count, anchored at a fixed epoch (see BlogTrendingService)
+    trending_score = models.FloatField(default=0, editable=False)
+    # Set when the stored related-post list needs a refresh (see BlogRecommendationService.refresh_stale)
+    related_stale = models.BooleanField(default=False, editable=False)
+    word_count = models.PositiveIntegerField(default=0)
+    reading_time = models.PositiveSmallIntegerField(default=1)
     tags = models.ManyToManyField("Tag", related_name="posts", blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -53,20 +90,41 @@ class Post(models.Model):
             models.Index(fields=["-created_at"]),
             models.Index(fields=["status"]),
             models.Index(fields=["author"]),
+            # Keyset pagination: each feed seeks on (ordering column, id)
+            models.Index(fields=["status", "-published_at", "-id"], name="blog_posts_status_pub_idx"),
+            models.Index(fields=["status", "-views_count", "-id"], name="blog_posts_status_views_idx"),
+            models.Index(fields=["status", "-trending_score", "-id"], name="blog_posts_status_trend_idx"),
+            models.Index(fields=["author", "-created_at", "-id"], name="blog_posts_author_created_idx"),
+            models.Index(fields=["status", "author", "-published_at", "-id"], name="blog_posts_status_author_idx"),
+            # Booleans compile to a bare column test, which only a matching partial index can seek on
+            models.Index(fields=["status", "-created_at"], condition=Q(is_featured=True), name="blog_posts_featured_idx"),
+            models.Index(fields=["id"], condition=Q(related_stale=True), name="blog_posts_related_stale_idx"),
         ]
 
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.title)
+        self.update_excerpt()
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self.update_reading_stats()
+        elif "content" in update_fields:
+            self.update_reading_stats()
+            kwargs["update_fields"] = {*update_fields, "word_count", "reading_time"}
+
+        super().save(*args, **kwargs)
 
+    def update_excerpt(self):
         # Auto-generate excerpt if not provided
         if not self.excerpt and self.content:
             self.excerpt = self.content[:497] + "..." if len(self.content) > 500 else self.content
 
-        super().save(*args, **kwargs)
+    def update_reading_stats(self):
+        # Kept separate from save() so bulk_create/bulk_update paths can fill the stored values too
+        self.word_count = len(self.content.split())
+        self.reading_time = max(1, round(self.word_count / self.WORDS_PER_MINUTE))
 
     def get_absolute_url(self):
         return reverse("blog:post-detail", kwargs={"slug": self.slug})
@@ -76,7 +134,9 @@ class Post(models.Model):
         self.save(update_fields=["views_count"])
 
 
-class Comment(models.Model):
+class Comment(TrackedFieldsMixin, models.Model):
+    TRACKED_FIELDS = ("is_approved",)
+
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="comments")
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="comments")
     content = models.TextField()
@@ -87,12 +147,18 @@ class Comment(models.Model):
     class Meta:
         db_table = "blog_comments"
         ordering = ["-created_at"]
+        indexes = [
+            # Approved comments of one post in cursor order (also serves the per-post counts)
+            models.Index(
+                fields=["post", "-created_at", "-id"], condition=Q(is_approved=True), name="blog_comments_post_appr_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author.username} on {self.post.title}"
 
 
-class Tag(models.Model):
+class Tag(UniqueSlugMixin, models.Model):
     name = models.CharField(max_length=50, unique=True)
     slug = models.SlugField(max_length=50, unique=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -104,7 +170,85 @@ class Tag(models.Model):
     def __str__(self):
         return self.name
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+
+class RelatedPost(models.Model):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="related_entries")
+    related = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="related_from")
+    score = models.PositiveIntegerField()
+
+    class Meta:
+        db_table = "blog_related_posts"
+        constraints = [
+            models.UniqueConstraint(fields=["post", "related"], name="blog_related_post_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["post", "-score"], name="blog_related_post_score_idx"),
+        ]
+
+
+class PostViewBucket(models.Model):
+    """Views of a post flushed within one hour; the raw material of trending scores."""
+
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="view_buckets")
+    hour = models.DateTimeField()
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "blog_post_view_buckets"
+        constraints = [
+            models.UniqueConstraint(fields=["post", "hour"], name="blog_view_bucket_post_hour_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["hour"], name="blog_view_bucket_hour_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} @ {self.hour:%Y-%m-%d %H:00}: {self.views}"
+
+
+class PostSearchTerm(models.Model):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="search_terms")
+    term = models.CharField(max_length=64)
+    weight = models.PositiveIntegerField()
+
+    class Meta:
+        db_table = "blog_post_search_terms"
+        constraints = [
+            models.UniqueConstraint(fields=["term", "post"], name="blog_search_term_post_uniq"),
+        ]
+
+
+class BlogStats(models.Model):
+    """Single-row snapshot behind the stats endpoint, kept current by signal deltas."""
+
+    SINGLETON_ID = 1
+
+    total_posts = models.PositiveIntegerField(default=0)
+    total_categories = models.PositiveIntegerField(default=0)
+    total_tags = models.PositiveIntegerField(default=0)
+    total_views = models.PositiveBigIntegerField(default=0)
+    total_comments = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "blog_stats"
+        verbose_name_plural = "Blog stats"
+
+    def __str__(self):
+        return f"Blog stats ({self.updated_at:%Y-%m-%d %H:%M})"
+
+
+class ImportCheckpoint(models.Model):
+    """How far ``import_blog`` got through a source file; updated in the same transaction as each batch."""
+
+    source = models.CharField(max_length=255, unique=True)
+    position = models.BigIntegerField(default=0)
+    rows = models.PositiveIntegerField(default=0)
+    completed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "blog_import_checkpoints"
+
+    def __str__(self):
+        return f"{self.source} @ {self.position}"
@@ -0,0 +1,22 @@
+from apps.core.pagination import KeysetCursorPagination
+
+
+class PublishedFeedPagination(KeysetCursorPagination):
+    ordering = ("-published_at", "-id")
+
+
+class PopularPostsPagination(KeysetCursorPagination):
+    ordering = ("-views_count", "-id")
+
+
+class TrendingPostsPagination(KeysetCursorPagination):
+    ordering = ("-trending_score", "-id")
+
+
+class AuthorPostsPagination(KeysetCursorPagination):
+    ordering = ("-created_at", "-id")
+
+
+class CommentPagination(KeysetCursorPagination):
+    ordering = ("-created_at", "-id")
+    page_size = 20
@@ -0,0 +1,218 @@
+import re
+from abc import ABC, abstractmethod
+from collections import Counter
+from html import escape
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import OuterRef, Q, Subquery, Sum
+from django.utils.module_loading import import_string
+
+from .models import Post, PostSearchTerm
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+MAX_TERM_LENGTH = 64
+SNIPPET_WORDS = 30
+
+# Relative weight of a single occurrence in each field; titles dominate the ranking.
+FIELD_WEIGHTS = {"title": 10, "excerpt": 3, "content": 1}
+
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token[:MAX_TERM_LENGTH] for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def parse_query(query: str):
+    """Split a query into exact terms plus an optional trailing prefix term.
+
+    The last word is matched as a prefix unless the query ends with whitespace, which
+    gives search-as-you-type behaviour ("djan" finds "django").
+    """
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return [], None
+    if query[-1:].isspace():
+        return terms, None
+    return terms[:-1], terms[-1]
+
+
+class BaseSearchBackend(ABC):
+    """Backends implement ``search``; indexing hooks default to no-ops for those that need no index."""
+
+    def index_post(self, post: Post) -> None:
+        pass
+
+    def index_posts(self, posts: Iterable[Post]) -> None:
+        for post in posts:
+            self.index_post(post)
+
+    def rebuild(self, batch_size: int = 500) -> int:
+        return 0
+
+    @abstractmethod
+    def search(self, queryset, query: str):
+        """Filter ``queryset`` to posts matching ``query``, best matches first."""
+
+    def snippet(self, post: Post, query: str) -> str:
+        """Return an HTML-escaped window of the post body with matched words wrapped in <mark>."""
+        exact, prefix = parse_query(query)
+        words = post.content.split()
+        if not words:
+            return ""
+
+        def matches(word):
+            for token in tokenize(word):
+                if token in exact or (prefix and token.startswith(prefix)):
+                    return True
+            return False
+
+        first = next((index for index, word in enumerate(words) if matches(word)), 0)
+        start = max(0, first - SNIPPET_WORDS // 3)
+        window = words[start : start + SNIPPET_WORDS]
+
+        parts = [f"<mark>{escape(word)}</mark>" if matches(word) else escape(word) for word in window]
+        text = " ".join(parts)
+        if start > 0:
+            text = "… " + text
+        if start + SNIPPET_WORDS < len(words):
+            text += " …"
+        return text
+
+
+class InvertedIndexSearchBackend(BaseSearchBackend):
+    """Portable search over the ``PostSearchTerm`` table (one weighted row per post and term)."""
+
+    @staticmethod
+    def build_terms(post: Post) -> Dict[str, int]:
+        weights = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(getattr(post, field) or ""):
+                weights[token] += weight
+        return dict(weights)
+
+    def index_post(self, post: Post) -> None:
+        terms = self.build_terms(post)
+        existing = dict(PostSearchTerm.objects.filter(post=post).values_list("term", "weight"))
+
+        removed = existing.keys() - terms.keys()
+        added = [PostSearchTerm(post=post, term=term, weight=weight) for term, weight in terms.items() if term not in existing]
+        changed = {term: weight for term, weight in terms.items() if term in existing and existing[term] != weight}
+
+        with transaction.atomic():
+            if removed:
+                PostSearchTerm.objects.filter(post=post, term__in=removed).delete()
+            if added:
+                PostSearchTerm.objects.bulk_create(added)
+            if changed:
+                rows = list(PostSearchTerm.objects.filter(post=post, term__in=changed))
+                for row in rows:
+                    row.weight = changed[row.term]
+                PostSearchTerm.objects.bulk_update(rows, ["weight"])
+
+    def index_posts(self, posts: Iterable[Post]) -> None:
+        """Index freshly created posts in one insert; use ``index_post`` for edits."""
+        # post_id rather than post: skips a router check per row, which dominates bulk imports
+        rows = [
+            PostSearchTerm(post_id=post.id, term=term, weight=weight)
+            for post in posts
+            for term, weight in self.build_terms(post).items()
+        ]
+        PostSearchTerm.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+    def rebuild(self, batch_size: int = 500) -> int:
+        PostSearchTerm.objects.all().delete()
+        indexed = 0
+        last_id = 0
+        queryset = Post.objects.only("id", "title", "excerpt", "content").order_by("id")
+        while True:
+            batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                return indexed
+            self.index_posts(batch)
+            indexed += len(batch)
+            last_id = batch[-1].id
+
+    @staticmethod
+    def _term_filter(term: str, prefix: bool) -> Q:
+        if prefix:
+            # A range keeps the lookup on the term index on every database, unlike LIKE 'x%'
+            return Q(term__gte=term, term__lt=term + "\uffff")
+        return Q(term=term)
+
+    def search(self, queryset, query: str):
+        exact, prefix = parse_query(query)
+        conditions = [self._term_filter(term, False) for term in exact]
+        if prefix:
+            conditions.append(self._term_filter(prefix, True))
+        if not conditions:
+            return queryset.none()
+
+        any_term = Q()
+        for condition in conditions:
+            # Every query term has to match (AND semantics)
+            queryset = queryset.filter(id__in=PostSearchTerm.objects.filter(condition).values("post_id"))
+            any_term |= condition
+
+        rank = (
+            PostSearchTerm.objects.filter(any_term, post=OuterRef("pk"))
+            .values("post")
+            .annotate(total=Sum("weight"))
+            .values("total")
+        )
+        return queryset.annotate(search_rank=Subquery(rank)).order_by("-search_rank", "-published_at", "-id")
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Full-text search with weighted ``tsvector`` ranking backed by a GIN expression index."""
+
+    config = "english"
+    index_name = "blog_posts_search_gin"
+
+    def get_vector(self):
+        from django.contrib.postgres.search import SearchVector
+
+        return (
+            SearchVector("title", weight="A", config=self.config)
+            + SearchVector("excerpt", weight="B", config=self.config)
+            + SearchVector("content", weight="C", config=self.config)
+        )
+
+    def rebuild(self, batch_size: int = 500) -> int:
+        from django.contrib.postgres.indexes import GinIndex
+
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Post._meta.db_table)
+        if self.index_name not in constraints:
+            with connection.schema_editor() as schema_editor:
+                schema_editor.add_index(Post, GinIndex(self.get_vector(), name=self.index_name))
+        return Post.objects.count()
+
+    def search(self, queryset, query: str):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        exact, prefix = parse_query(query)
+        terms = exact + ([f"{prefix}:*"] if prefix else [])
+        if not terms:
+            return queryset.none()
+
+        search_query = SearchQuery(" & ".join(terms), search_type="raw", config=self.config)
+        vector = self.get_vector()
+        return (
+            queryset.annotate(search_document=vector, search_rank=SearchRank(vector, search_query))
+            .filter(search_document=search_query)
+            .order_by("-search_rank", "-published_at", "-id")
+        )
+
+
+def get_search_backend() -> BaseSearchBackend:
+    backend_path = getattr(settings, "BLOG_SEARCH_BACKEND", None)
+    if backend_path:
+        return import_string(backend_path)()
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+    return InvertedIndexSearchBackend()
@@ -0,0 +1,256 @@
+import itertools
+import math
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import List
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.core.cache import bump_generation
+from apps.core.explain import analyze
+from apps.core.slugs import allocate_slugs, assign_slugs
+
+from .models import Category, Comment, Post, Tag
+from .search import get_search_backend
+from .services import BlogAnalyticsService, BlogTagService, BlogTrendingService
+
+DEFAULT_BATCH_SIZE = 2000
+SEED_PASSWORD = "seed-password"
+HISTORY_DAYS = 730
+
+FIRST_NAMES = "Ada Alan Barbara Claude Dennis Donald Edsger Frances Grace Guido Ken Linus Margaret Niklaus Radia Tim".split()
+LAST_NAMES = "Allen Hopper Knuth Lamport Liskov Lovelace Perlman Ritchie Rossum Thompson Torvalds Turing Wirth".split()
+CATEGORIES = [
+    "Technology",
+    "Programming",
+    "Databases",
+    "DevOps",
+    "Security",
+    "Design",
+    "Career",
+    "Open Source",
+    "Data Science",
+    "Mobile",
+    "Cloud",
+    "Testing",
+]
+WORDS = (
+    "cache query index latency python django request server client thread async database replica shard "
+    "queue worker deploy build test release schema migration model view template router token session "
+    "cookie header payload stream batch buffer memory profile trace metric alert budget plan scan sort "
+    "join filter order limit cursor page result error retry timeout backoff lock commit rollback"
+).split()
+TITLE_OPENERS = ["Understanding", "Scaling", "Debugging", "A tour of", "Lessons from", "Notes on", "Rethinking"]
+STATUS_WEIGHTS = {"published": 88, "draft": 10, "archived": 2}
+TAGS_PER_POST_WEIGHTS = [10, 25, 30, 20, 10, 5]  # 0 to 5 tags
+
+
+def zipf_weights(count: int, exponent: float = 1.1) -> List[float]:
+    """Cumulative weights where the item of rank ``r`` is picked in proportion to ``1 / r ** exponent``."""
+    return list(itertools.accumulate(1 / rank**exponent for rank in range(1, count + 1)))
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let ``bulk_create`` store the given ``created_at``/``updated_at`` values instead of "now"."""
+    fields = [
+        field
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class BlogSeeder:
+    """Generate users, categories, tags, posts and comments with bulk inserts, for load testing.
+
+    Distributions follow what a real blog looks like rather than uniform noise: a few prolific
+    authors and popular categories/tags (Zipf), log-normal post lengths and view counts, more
+    posts in recent months, and comments concentrated on the most viewed posts. The same
+    ``seed`` produces the same data.
+    """
+
+    def __init__(self, seed: int = 0, batch_size: int = DEFAULT_BATCH_SIZE, search_index: bool = True, log=None):
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.search_index = search_index
+        self.log = log or (lambda message: None)
+        self.now = timezone.now()
+        self.paragraphs = [self.sentence(self.random.randint(40, 120)) for _ in range(200)]
+        self.counts = {"users": 0, "posts": 0, "comments": 0}
+
+    def run(self, users: int, posts: int, comments: int, tags: int = 80) -> dict:
+        started = time.monotonic()
+        with explicit_timestamps(Post, Comment):
+            user_ids = self.seed_users(users)
+            category_ids = self.seed_categories()
+            tag_ids = [tag.id for tag in BlogTagService.get_or_create_tags(self.tag_names(tags))]
+            published = self.seed_posts(posts, user_ids, category_ids, tag_ids)
+            self.seed_comments(comments, user_ids, published)
+        self.finish()
+        self.log(f"Seeded {self.counts} in {time.monotonic() - started:.1f}s")
+        return self.counts
+
+    # Vocabulary ------------------------------------------------------------
+
+    def sentence(self, words: int) -> str:
+        return " ".join(self.random.choices(WORDS, k=words)).capitalize() + "."
+
+    def content(self) -> str:
+        # Log-normal length, median around 700 words
+        paragraphs = min(60, max(1, round(self.random.lognormvariate(2.1, 0.6))))
+        return "\n\n".join(self.random.choices(self.paragraphs, k=paragraphs))
+
+    def title(self) -> str:
+        return f"{self.random.choice(TITLE_OPENERS)} {' '.join(self.random.sample(WORDS, 3))}"
+
+    def tag_names(self, count: int) -> List[str]:
+        names = list(WORDS) + [f"{first}-{second}" for first, second in itertools.combinations(WORDS[:20], 2)]
+        return names[:count]
+
+    def past(self, days: float = HISTORY_DAYS):
+        # Skewed towards recent dates: the blog publishes more as it grows
+        return self.now - timedelta(days=days * (1 - math.sqrt(self.random.random())))
+
+    def batches(self, total: int):
+        for start in range(0, total, self.batch_size):
+            yield min(self.batch_size, total - start)
+
+    # Rows -----------------------------------------------------------------
+
+    def seed_users(self, count: int) -> List[int]:
+        User = get_user_model()
+        password = make_password(SEED_PASSWORD)  # hashing once keeps seeding fast
+        start = (User.objects.aggregate(last=Max("id"))["last"] or 0) + 1
+        for size in self.batches(count):
+            users = []
+            for number in range(start, start + size):
+                first, last = self.random.choice(FIRST_NAMES), self.random.choice(LAST_NAMES)
+                users.append(
+                    User(
+                        username=f"{first}.{last}{number}".lower(),
+                        email=f"{first}.{last}{number}@example.com".lower(),
+                        first_name=first,
+                        last_name=last,
+                        password=password,
+                        is_verified=self.random.random() < 0.7,
+                    )
+                )
+            User.objects.bulk_create(users)
+            start += size
+            self.counts["users"] += size
+        # New and existing users can all author posts and comments; the shuffle decides who is prolific
+        user_ids = list(User.objects.filter(is_active=True).order_by("id").values_list("id", flat=True))
+        self.random.shuffle(user_ids)
+        return user_ids
+
+    def seed_categories(self) -> List[int]:
+        missing = set(CATEGORIES) - set(Category.objects.filter(name__in=CATEGORIES).values_list("name", flat=True))
+        categories = [Category(name=name, description=f"Posts about {name.lower()}") for name in sorted(missing)]
+        assign_slugs(categories, "name")
+        Category.objects.bulk_create(categories, ignore_conflicts=True)
+        names = dict(Category.objects.filter(name__in=CATEGORIES).values_list("name", "id"))
+        return [names[name] for name in CATEGORIES]
+
+    def seed_posts(self, count: int, user_ids, category_ids, tag_ids) -> List[tuple]:
+        """Insert posts; returns ``(id, published_at, views)`` of the published ones."""
+        if not user_ids:
+            return []
+        authors, categories, tags = zipf_weights(len(user_ids)), zipf_weights(len(category_ids)), zipf_weights(len(tag_ids))
+        statuses = list(STATUS_WEIGHTS)
+        published = []
+        backend = get_search_backend()
+        for size in self.batches(count):
+            titles = [self.title() for _ in range(size)]
+            posts = []
+            for title, slug in zip(titles, allocate_slugs(Post, titles)):
+                created_at = self.past()
+                status = self.random.choices(statuses, weights=STATUS_WEIGHTS.values())[0]
+                post = Post(
+                    title=title,
+                    slug=slug,
+                    author_id=self.random.choices(user_ids, cum_weights=authors)[0],
+                    category_id=(
+                        None if self.random.random() < 0.05 else self.random.choices(category_ids, cum_weights=categories)[0]
+                    ),
+                    content=self.content(),
+                    status=status,
+                    is_featured=status == "published" and self.random.random() < 0.02,
+                    views_count=int(self.random.lognormvariate(4, 1.5)) if status == "published" else 0,
+                    created_at=created_at,
+                    updated_at=created_at,
+                    published_at=created_at + timedelta(hours=self.random.uniform(0, 48)) if status == "published" else None,
+                )
+                if post.published_at:
+                    # As if every view came on publication day; no view buckets are seeded
+                    post.trending_score = BlogTrendingService.add_views(0, post.views_count, post.published_at)
+                post.update_excerpt()
+                post.update_reading_stats()
+                posts.append(post)
+
+            with transaction.atomic():
+                Post.objects.bulk_create(posts)
+                through = Post.tags.through
+                through.objects.bulk_create(
+                    [
+                        through(post_id=post.id, tag_id=tag_id)
+                        for post in posts
+                        for tag_id in set(
+                            self.random.choices(
+                                tag_ids, cum_weights=tags, k=self.random.choices(range(6), TAGS_PER_POST_WEIGHTS)[0]
+                            )
+                        )
+                    ]
+                )
+                if self.search_index:
+                    backend.index_posts(posts)
+            published += [(post.id, post.published_at, post.views_count) for post in posts if post.published_at]
+            self.counts["posts"] += size
+            self.log(f"{self.counts['posts']}/{count} posts")
+        return published
+
+    def seed_comments(self, count: int, user_ids, published) -> None:
+        if not published or not user_ids:
+            return
+        # Comments follow readers: a post's share grows with its views
+        weights = list(itertools.accumulate(views + 1 for _, _, views in published))
+        authors = zipf_weights(len(user_ids), exponent=0.8)
+        for size in self.batches(count):
+            comments = []
+            for post_id, published_at, _ in self.random.choices(published, cum_weights=weights, k=size):
+                age = (self.now - published_at).total_seconds()
+                created_at = published_at + timedelta(seconds=age * self.random.random() ** 3)
+                comments.append(
+                    Comment(
+                        post_id=post_id,
+                        author_id=self.random.choices(user_ids, cum_weights=authors)[0],
+                        content=self.sentence(self.random.randint(5, 60)),
+                        is_approved=self.random.random() < 0.95,
+                        created_at=created_at,
+                        updated_at=created_at,
+                    )
+                )
+            Comment.objects.bulk_create(comments)
+            self.counts["comments"] += size
+            self.log(f"{self.counts['comments']}/{count} comments")
+
+    def finish(self) -> None:
+        # bulk_create sends no signals: rebuild what the receivers would have maintained
+        BlogAnalyticsService.reconcile_blog_stats()
+        bump_generation(Post, Comment, Category, Tag)
+        # Fresh tables have no planner statistics; benchmarks and audits should see real plans
+        analyze()
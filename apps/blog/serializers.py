@@ -1,6 +1,12 @@
+from django.db import models
 from rest_framework import serializers
 
+from apps.core.serializers import ImageVariantsField
+
+from .counters import post_view_counter
 from .models import Category, Comment, Post, Tag
+from .pagination import CommentPagination
+from .services import BlogCommentService, BlogTagService
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -11,6 +17,8 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ["id", "name", "slug", "description", "posts_count", "created_at"]
 
     def get_posts_count(self, obj):
+        if hasattr(obj, "posts_count"):
+            return obj.posts_count
         return obj.posts.filter(status="published").count()
 
 
@@ -22,6 +30,8 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "slug", "posts_count", "created_at"]
 
     def get_posts_count(self, obj):
+        if hasattr(obj, "posts_count"):
+            return obj.posts_count
         return obj.posts.filter(status="published").count()
 
 
@@ -35,12 +45,32 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ["author_name", "author_username", "is_approved", "created_at", "updated_at"]
 
 
+class PendingViewsListSerializer(serializers.ListSerializer):
+    """Adds views still buffered in the view counter, fetched once for the whole list.
+
+    Async views fetch them beforehand with ``post_view_counter.apending`` and pass them in
+    the ``pending_views`` context, so serializing does not block the event loop on the cache.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        pending = self.context.get("pending_views")
+        if pending is None:
+            pending = post_view_counter.pending(item.id for item in items)
+        representation = super().to_representation(items)
+        for row in representation:
+            row["views_count"] += pending.get(row["id"], 0)
+        return representation
+
+
 class PostListSerializer(serializers.ModelSerializer):
     author_name = serializers.CharField(source="author.full_name", read_only=True)
     author_username = serializers.CharField(source="author.username", read_only=True)
     category_name = serializers.CharField(source="category.name", read_only=True)
     comments_count = serializers.SerializerMethodField()
-    reading_time = serializers.SerializerMethodField()
+    featured_image_variants = ImageVariantsField()
+    # Only present on search results, where the list view attaches a highlighted excerpt
+    search_snippet = serializers.CharField(read_only=True)
 
     class Meta:
         model = Post
@@ -53,32 +83,33 @@ class PostListSerializer(serializers.ModelSerializer):
             "category_name",
             "excerpt",
             "featured_image",
+            "featured_image_variants",
             "is_featured",
             "views_count",
             "comments_count",
             "reading_time",
+            "search_snippet",
             "created_at",
             "published_at",
         ]
+        list_serializer_class = PendingViewsListSerializer
 
     def get_comments_count(self, obj):
+        if hasattr(obj, "comments_count"):
+            return obj.comments_count
         return obj.comments.filter(is_approved=True).count()
 
-    def get_reading_time(self, obj):
-        # Estimate reading time (average 200 words per minute)
-        word_count = len(obj.content.split())
-        return max(1, round(word_count / 200))
-
 
 class PostDetailSerializer(serializers.ModelSerializer):
     author_name = serializers.CharField(source="author.full_name", read_only=True)
     author_username = serializers.CharField(source="author.username", read_only=True)
     author_avatar = serializers.ImageField(source="author.avatar", read_only=True)
+    author_avatar_variants = ImageVariantsField(source="author.avatar_variants")
+    featured_image_variants = ImageVariantsField()
     category = CategorySerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
-    comments = CommentSerializer(many=True, read_only=True)
+    comments = serializers.SerializerMethodField()
     comments_count = serializers.SerializerMethodField()
-    reading_time = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
@@ -89,10 +120,12 @@ class PostDetailSerializer(serializers.ModelSerializer):
             "author_name",
             "author_username",
             "author_avatar",
+            "author_avatar_variants",
             "category",
             "content",
             "excerpt",
             "featured_image",
+            "featured_image_variants",
             "tags",
             "is_featured",
             "views_count",
@@ -104,12 +137,22 @@ class PostDetailSerializer(serializers.ModelSerializer):
             "published_at",
         ]
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data["views_count"] += post_view_counter.pending([instance.id]).get(instance.id, 0)
+        return data
+
     def get_comments_count(self, obj):
+        if hasattr(obj, "comments_count"):
+            return obj.comments_count
         return obj.comments.filter(is_approved=True).count()
 
-    def get_reading_time(self, obj):
-        word_count = len(obj.content.split())
-        return max(1, round(word_count / 200))
+    def get_comments(self, obj):
+        # Only the first page is embedded; the rest is served by the post's comments endpoint
+        comments = getattr(obj, "comment_page", None)
+        if comments is None:
+            comments = BlogCommentService.get_post_comments(obj)[: CommentPagination.page_size]
+        return CommentSerializer(comments, many=True).data
 
 
 class PostCreateUpdateSerializer(serializers.ModelSerializer):
@@ -124,9 +167,8 @@ class PostCreateUpdateSerializer(serializers.ModelSerializer):
         post = Post.objects.create(**validated_data)
 
         # Handle tags
-        for tag_name in tags_data:
-            tag, created = Tag.objects.get_or_create(name=tag_name.strip())
-            post.tags.add(tag)
+        if tags_data:
+            BlogTagService.set_post_tags(post, tags_data, created=True)
 
         return post
 
@@ -140,9 +182,6 @@ class PostCreateUpdateSerializer(serializers.ModelSerializer):
 
         # Handle tags if provided
         if tags_data is not None:
-            instance.tags.clear()
-            for tag_name in tags_data:
-                tag, created = Tag.objects.get_or_create(name=tag_name.strip())
-                instance.tags.add(tag)
+            BlogTagService.set_post_tags(instance, tags_data)
 
         return instance
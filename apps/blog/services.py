@@ -1,19 +1,94 @@
-from typing import List, Optional
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from django.db import models
-from django.db.models import Count, F, Q, Sum
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Case, Count, Exists, F, Max, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.text import slugify
 
-from .models import Category, Comment, Post, Tag
+from apps.core.cache import bump_generation
+from apps.core.db import use_primary
+
+from .counters import post_view_counter
+from .models import BlogStats, Category, Comment, Post, PostViewBucket, RelatedPost, Tag
+from .search import get_search_backend
+
+
+def _correlated_count(queryset, group_by: str):
+    """Rows of ``queryset`` (filtered on an ``OuterRef``) counted in a correlated subquery.
+
+    Unlike ``Count`` over a join, this adds no GROUP BY to the outer query, so its composite
+    indexes can deliver rows already ordered and stop at the page's LIMIT.
+    """
+    counted = queryset.order_by().values(group_by).annotate(total=Count("*")).values("total")
+    return Coalesce(Subquery(counted, output_field=models.IntegerField()), 0)
+
+
+def _approved_comments():
+    return Comment.objects.filter(post=OuterRef("pk"), is_approved=True)
 
 
 class BlogPostService:
     @staticmethod
     def get_published_posts():
-        return (
+        return BlogPostService.with_comments_count(
             Post.objects.filter(status="published", published_at__lte=timezone.now())
             .select_related("author", "category")
             .prefetch_related("tags")
+            .order_by("-created_at")
+        )
+
+    @staticmethod
+    def with_comments_count(queryset):
+        return queryset.annotate(comments_count=_correlated_count(_approved_comments(), "post"))
+
+    @staticmethod
+    def get_post_detail(comments_page_size: int):
+        """Published posts with everything the detail payload embeds, including the first comments page."""
+        first_page = BlogCommentService.get_post_comments()[:comments_page_size]
+        return BlogPostService.with_comments_updated_at(
+            BlogPostService.get_published_posts()
+            .prefetch_related(None)
+            .prefetch_related(
+                models.Prefetch("tags", queryset=BlogTaxonomyService.get_tags()),
+                models.Prefetch("comments", queryset=first_page, to_attr="comment_page"),
+            )
+        )
+
+    @staticmethod
+    def post_validators_queryset(slug: str):
+        return (
+            BlogPostService.with_comments_updated_at(
+                Post.objects.filter(status="published", published_at__lte=timezone.now(), slug=slug)
+            )
+            .annotate(post_id=F("id"), comments_total=_correlated_count(_approved_comments(), "post"))
+            .values("post_id", "updated_at", "comments_total", "comments_updated_at")
+        )
+
+    @staticmethod
+    def get_post_validators(slug: str) -> Optional[dict]:
+        """The values the detail ETag/Last-Modified are built from, without loading the post itself."""
+        return BlogPostService.post_validators_queryset(slug).first()
+
+    @staticmethod
+    async def aget_post_validators(slug: str) -> Optional[dict]:
+        return await BlogPostService.post_validators_queryset(slug).afirst()
+
+    @staticmethod
+    def with_comments_updated_at(queryset):
+        latest = _approved_comments().order_by().values("post").annotate(latest=Max("updated_at")).values("latest")
+        return queryset.annotate(comments_updated_at=Subquery(latest))
+
+    @staticmethod
+    def get_author_posts(author):
+        return BlogPostService.with_comments_count(
+            Post.objects.filter(author=author).select_related("author", "category").order_by("-created_at")
         )
 
     @staticmethod
@@ -22,9 +97,7 @@ class BlogPostService:
 
     @staticmethod
     def search_posts(query: str):
-        return BlogPostService.get_published_posts().filter(
-            Q(title__icontains=query) | Q(content__icontains=query) | Q(excerpt__icontains=query)
-        )
+        return get_search_backend().search(BlogPostService.get_published_posts(), query)
 
     @staticmethod
     def get_posts_by_category(category_slug: str):
@@ -47,21 +120,109 @@ class BlogPostService:
 
     @staticmethod
     def increment_post_views(post: Post):
-        Post.objects.filter(id=post.id).update(views_count=F("views_count") + 1)
+        # Buffered in the cache and written in batches by the flush_post_views command
+        post_view_counter.record(post.id)
+
+    @staticmethod
+    async def aincrement_post_views(post: Post):
+        # Cache clients block; run off the event loop so it overlaps with the caller's queries
+        await sync_to_async(post_view_counter.record, thread_sensitive=False)(post.id)
+
+
+class BlogTaxonomyService:
+    @staticmethod
+    def get_categories():
+        published = Post.objects.filter(category=OuterRef("pk"), status="published")
+        return Category.objects.annotate(posts_count=_correlated_count(published, "category")).order_by("name")
+
+    @staticmethod
+    def get_tags():
+        published = Post.tags.through.objects.filter(tag=OuterRef("pk"), post__status="published")
+        return Tag.objects.annotate(posts_count=_correlated_count(published, "tag")).order_by("name")
+
+
+class BlogTagService:
+    @staticmethod
+    def normalize_names(names) -> List[str]:
+        """Strip and collapse whitespace, dropping blanks and names that map to the same slug."""
+        normalized = {}
+        for name in names:
+            name = " ".join(name.split())
+            slug = slugify(name)
+            if slug and slug not in normalized:
+                normalized[slug] = name
+        return list(normalized.values())
+
+    @staticmethod
+    def get_or_create_tags(names) -> List[Tag]:
+        """Resolve tag names with one lookup, one bulk insert for the missing ones and one re-read."""
+        wanted = {slugify(name): name for name in BlogTagService.normalize_names(names)}
+        if not wanted:
+            return []
+
+        lookup = Q(slug__in=wanted) | Q(name__in=wanted.values())
+        found = {tag.slug: tag for tag in Tag.objects.filter(lookup)}
+        found.update({slugify(tag.name): tag for tag in found.values()})
+
+        missing = [Tag(name=name, slug=slug) for slug, name in wanted.items() if slug not in found]
+        if missing:
+            # Concurrent requests may insert the same tags; re-read instead of failing on conflicts
+            Tag.objects.bulk_create(missing, ignore_conflicts=True)
+            created = Tag.objects.filter(slug__in=[tag.slug for tag in missing])
+            found.update({tag.slug: tag for tag in created})
+
+        return [found[slug] for slug in wanted if slug in found]
+
+    @staticmethod
+    @transaction.atomic
+    def set_post_tags(post: Post, names, created: bool = False) -> List[Tag]:
+        """Replace ``post``'s tags, touching only the through rows that actually change."""
+        tags = BlogTagService.get_or_create_tags(names)
+        wanted = {tag.id for tag in tags}
+        current = set() if created else set(Post.tags.through.objects.filter(post_id=post.pk).values_list("tag_id", flat=True))
+
+        # remove()/add() keep m2m_changed firing for the related-posts and stats receivers
+        if current - wanted:
+            post.tags.remove(*(current - wanted))
+        if wanted - current:
+            post.tags.add(*(wanted - current))
+        return tags
 
 
 class BlogAnalyticsService:
     @staticmethod
     def get_popular_posts(limit: int = 10):
-        return BlogPostService.get_published_posts().order_by("-views_count")[:limit]
+        return BlogPostService.get_published_posts().order_by("-views_count", "-id")[:limit]
+
+    @staticmethod
+    def get_trending_posts(limit: int = 10):
+        return BlogPostService.get_published_posts().order_by("-trending_score", "-id")[:limit]
 
     @staticmethod
     def get_recent_posts(limit: int = 10):
         return BlogPostService.get_published_posts().order_by("-published_at")[:limit]
 
+    STATS_FIELDS = ("total_posts", "total_categories", "total_tags", "total_views", "total_comments")
+
     @staticmethod
     def get_blog_stats():
-        published_posts = BlogPostService.get_published_posts()
+        stats = BlogStats.objects.filter(pk=BlogStats.SINGLETON_ID).values(*BlogAnalyticsService.STATS_FIELDS).first()
+        if stats is None:
+            # No snapshot yet (fresh database or a failed delta): build it once
+            stats = BlogAnalyticsService.reconcile_blog_stats()
+        return stats
+
+    @staticmethod
+    async def aget_blog_stats():
+        stats = await BlogStats.objects.filter(pk=BlogStats.SINGLETON_ID).values(*BlogAnalyticsService.STATS_FIELDS).afirst()
+        if stats is None:
+            stats = await sync_to_async(BlogAnalyticsService.reconcile_blog_stats)()
+        return stats
+
+    @staticmethod
+    def compute_blog_stats():
+        # Counted by status only, like the deltas applied on publish/unpublish
+        published_posts = Post.objects.filter(status="published")
 
         return {
             "total_posts": published_posts.count(),
@@ -71,6 +232,49 @@ class BlogAnalyticsService:
             "total_comments": Comment.objects.filter(post__status="published", is_approved=True).count(),
         }
 
+    @staticmethod
+    def reconcile_blog_stats():
+        # Counted on the primary: a lagging replica would write stale totals back
+        with use_primary():
+            stats = BlogAnalyticsService.compute_blog_stats()
+        BlogStats.objects.update_or_create(pk=BlogStats.SINGLETON_ID, defaults=stats)
+        return stats
+
+    @staticmethod
+    def apply_stats_deltas(**deltas: int) -> None:
+        """Add ``deltas`` to the snapshot; a missing row is left for the next read to rebuild."""
+        updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if updates:
+            BlogStats.objects.filter(pk=BlogStats.SINGLETON_ID).update(**updates)
+
+    @staticmethod
+    def count_unshared_tags(tag_ids, post: Post) -> int:
+        """Number of ``tag_ids`` that no published post other than ``post`` uses."""
+        shared = Post.tags.through.objects.filter(tag_id=OuterRef("pk"), post__status="published").exclude(post_id=post.pk)
+        return Tag.objects.filter(id__in=tag_ids).exclude(Exists(shared)).count()
+
+    @staticmethod
+    def get_post_contribution(post: Post, category_id=None) -> dict:
+        """What a published ``post`` adds to the snapshot on top of every other published post."""
+        category_id = post.category_id if category_id is None else category_id
+        tag_ids = Post.tags.through.objects.filter(post_id=post.pk).values("tag_id")
+        return {
+            "total_posts": 1,
+            "total_views": post.views_count,
+            "total_comments": post.comments.filter(is_approved=True).count(),
+            "total_categories": int(bool(category_id) and not BlogAnalyticsService.category_shared(category_id, post)),
+            "total_tags": BlogAnalyticsService.count_unshared_tags(tag_ids, post),
+        }
+
+    @staticmethod
+    def recount_tags() -> None:
+        total_tags = Tag.objects.filter(posts__status="published").distinct().count()
+        BlogStats.objects.filter(pk=BlogStats.SINGLETON_ID).update(total_tags=total_tags)
+
+    @staticmethod
+    def category_shared(category_id: int, post: Post) -> bool:
+        return Post.objects.filter(category_id=category_id, status="published").exclude(pk=post.pk).exists()
+
     @staticmethod
     def get_category_stats():
         return (
@@ -88,12 +292,29 @@ class BlogCommentService:
     def create_comment(post: Post, author, content: str):
         return Comment.objects.create(post=post, author=author, content=content)
 
+    @staticmethod
+    def get_post_comments(post=None):
+        """Approved comments, newest first, with authors joined for serialization."""
+        queryset = Comment.objects.filter(is_approved=True).select_related("author").order_by("-created_at", "-id")
+        return queryset if post is None else queryset.filter(post=post)
+
     @staticmethod
     def approve_comment(comment: Comment):
         comment.is_approved = True
         comment.save()
         return comment
 
+    @staticmethod
+    @transaction.atomic
+    def set_approval(queryset, is_approved: bool) -> int:
+        """Bulk (un)approve comments; ``update()`` skips signals, so adjust the stats snapshot here."""
+        changing = queryset.exclude(is_approved=is_approved)
+        published = changing.filter(post__status="published").count()
+        updated = changing.update(is_approved=is_approved)
+        BlogAnalyticsService.apply_stats_deltas(total_comments=published if is_approved else -published)
+        bump_generation(Comment)
+        return updated
+
     @staticmethod
     def get_recent_comments(limit: int = 10):
         return (
@@ -104,26 +325,318 @@ class BlogCommentService:
 
 
 class BlogRecommendationService:
+    # Symmetric relatedness score: shared category, each shared tag, same author
+    CATEGORY_SCORE = 3
+    TAG_SCORE = 2
+    AUTHOR_SCORE = 1
+    STORED_LIMIT = 10
+    CANDIDATE_LIMIT = 500
+
+    @staticmethod
+    def get_stored_related_posts(post: Post, limit: int = 5):
+        return (
+            BlogPostService.get_published_posts()
+            .filter(related_from__post=post)
+            .order_by("-related_from__score", "-published_at", "-id")
+            .defer("content")[:limit]
+        )
+
+    @staticmethod
+    def get_fallback_related_posts(post: Post, limit: int = 5):
+        # Recent posts, for posts without a stored list yet
+        return BlogPostService.get_published_posts().exclude(id=post.id).order_by("-published_at").defer("content")[:limit]
+
     @staticmethod
     def get_related_posts(post: Post, limit: int = 5):
-        related_posts = BlogPostService.get_published_posts().exclude(id=post.id)
-
-        # Priority 1: Same category
-        if post.category:
-            category_posts = related_posts.filter(category=post.category)[:limit]
-            if category_posts.count() >= limit:
-                return category_posts
-
-        # Priority 2: Same tags
-        if post.tags.exists():
-            tag_posts = related_posts.filter(tags__in=post.tags.all()).distinct()[:limit]
-            if tag_posts.count() >= limit:
-                return tag_posts
-
-        # Priority 3: Same author
-        author_posts = related_posts.filter(author=post.author)[:limit]
-        if author_posts.count() >= limit:
-            return author_posts
-
-        # Fallback: Recent posts
-        return BlogAnalyticsService.get_recent_posts(limit)
+        related_posts = BlogRecommendationService.get_stored_related_posts(post, limit)
+        if related_posts:
+            return related_posts
+        return BlogRecommendationService.get_fallback_related_posts(post, limit)
+
+    @staticmethod
+    async def aget_related_posts(post: Post, limit: int = 5) -> List[Post]:
+        related_posts = [related async for related in BlogRecommendationService.get_stored_related_posts(post, limit)]
+        if related_posts:
+            return related_posts
+        return [related async for related in BlogRecommendationService.get_fallback_related_posts(post, limit)]
+
+    @staticmethod
+    def score_candidates(post: Post, limit: int) -> List[Tuple[int, int]]:
+        """Return ``(post_id, score)`` for published posts related to ``post``, best first."""
+        return list(BlogRecommendationService.get_candidates(post)[:limit])
+
+    @staticmethod
+    def get_candidates(post: Post):
+        """``(post_id, related_score)`` rows of every published post sharing something with ``post``."""
+        service = BlogRecommendationService
+        relation = Q(author_id=post.author_id)
+        score = Case(When(author_id=post.author_id, then=Value(service.AUTHOR_SCORE)), default=Value(0))
+        queryset = Post.objects.filter(status="published").exclude(id=post.id)
+
+        if post.category_id:
+            relation |= Q(category_id=post.category_id)
+            score = score + Case(When(category_id=post.category_id, then=Value(service.CATEGORY_SCORE)), default=Value(0))
+
+        tag_ids = list(Post.tags.through.objects.filter(post_id=post.id).values_list("tag_id", flat=True))
+        if tag_ids:
+            relation |= Q(tags__in=tag_ids)
+            queryset = queryset.annotate(shared_tags=Count("tags", filter=Q(tags__in=tag_ids), distinct=True))
+            score = score + F("shared_tags") * service.TAG_SCORE
+
+        return (
+            queryset.filter(relation)
+            .annotate(related_score=score)
+            .order_by("-related_score", "-published_at", "-id")
+            .values_list("id", "related_score")
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild_related_posts(post: Post) -> None:
+        """Recompute the stored related-post list of ``post`` only."""
+        RelatedPost.objects.filter(post=post).delete()
+        if post.status != "published":
+            return
+        candidates = BlogRecommendationService.score_candidates(post, BlogRecommendationService.STORED_LIMIT)
+        RelatedPost.objects.bulk_create(
+            [RelatedPost(post=post, related_id=related_id, score=score) for related_id, score in candidates]
+        )
+
+    @staticmethod
+    def mark_stale(post: Post) -> None:
+        """Queue ``post``'s related lists for ``refresh_stale``; the request pays a bounded cost only.
+
+        An unpublished post leaves every list it appears in right away (one DELETE); the
+        owners of those lists are flagged to be refilled.
+        """
+        if post.status != "published":
+            Post.objects.filter(related_entries__related=post).update(related_stale=True)
+            RelatedPost.objects.filter(related=post).delete()
+        Post.objects.filter(id=post.id).update(related_stale=True)
+
+    @staticmethod
+    @use_primary()
+    def refresh_stale(batch_size: int = 100) -> int:
+        """Refresh the related lists of flagged posts, as a worker would; returns posts refreshed."""
+        refreshed = 0
+        queryset = Post.objects.only("id", "status", "category_id", "author_id")
+        while True:
+            batch = list(queryset.filter(related_stale=True).order_by("id")[:batch_size])
+            if not batch:
+                return refreshed
+            for post in batch:
+                # The flag is cleared in the refresh's transaction: a failed refresh leaves the post
+                # queued, and an edit made meanwhile flags it again
+                with transaction.atomic():
+                    if Post.objects.filter(id=post.id, related_stale=True).update(related_stale=False):
+                        BlogRecommendationService.refresh_related_posts(post)
+                        refreshed += 1
+
+    @staticmethod
+    @transaction.atomic
+    def refresh_related_posts(post: Post, created: bool = False) -> None:
+        """Rebuild ``post``'s list and patch the lists of posts it is (or was) related to.
+
+        Scores are symmetric, so the candidate scores computed for ``post`` also say where it
+        belongs in every other post's list. Only lists where ``post`` dropped out or lost score
+        need a full rebuild, because something unseen may now outrank it.
+        """
+        service = BlogRecommendationService
+        previous_owners = set()
+        if not created:
+            previous_owners = set(RelatedPost.objects.filter(related=post).values_list("post_id", flat=True))
+
+        if post.status != "published":
+            RelatedPost.objects.filter(Q(post=post) | Q(related=post)).delete()
+            for owner in Post.objects.filter(id__in=previous_owners):
+                service.rebuild_related_posts(owner)
+            return
+
+        candidates = service.score_candidates(post, service.CANDIDATE_LIMIT)
+        if not created:
+            RelatedPost.objects.filter(post=post).delete()
+        if candidates:
+            RelatedPost.objects.bulk_create(
+                [
+                    RelatedPost(post=post, related_id=related_id, score=score)
+                    for related_id, score in candidates[: service.STORED_LIMIT]
+                ]
+            )
+
+        scores = dict(candidates)
+        lists = defaultdict(dict)
+        for owner_id, related_id, score in RelatedPost.objects.filter(post_id__in=scores.keys() | previous_owners).values_list(
+            "post_id", "related_id", "score"
+        ):
+            lists[owner_id][related_id] = score
+
+        to_rebuild = previous_owners - scores.keys()
+        stale = Q(pk__in=[])
+        added = []
+        for owner_id, score in scores.items():
+            entries = lists[owner_id]
+            previous = entries.get(post.id)
+            if previous == score:
+                continue
+            if previous is not None and score < previous:
+                to_rebuild.add(owner_id)
+                continue
+
+            merged = {**entries, post.id: score}
+            kept = dict(sorted(merged.items(), key=lambda item: -item[1])[: service.STORED_LIMIT])
+            if post.id not in kept:
+                continue
+            for related_id in (merged.keys() - kept.keys()) | ({post.id} if previous is not None else set()):
+                stale |= Q(post_id=owner_id, related_id=related_id)
+            added.append(RelatedPost(post_id=owner_id, related_id=post.id, score=score))
+
+        if added:
+            RelatedPost.objects.filter(stale).delete()
+            RelatedPost.objects.bulk_create(added)
+        if to_rebuild:
+            for owner in Post.objects.filter(id__in=to_rebuild):
+                service.rebuild_related_posts(owner)
+
+    @staticmethod
+    @use_primary()
+    def rebuild_all(batch_size: int = 500) -> int:
+        rebuilt = 0
+        last_id = 0
+        queryset = Post.objects.filter(status="published").only("id", "status", "category_id", "author_id").order_by("id")
+        while True:
+            batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                return rebuilt
+            # Only flags of the posts about to be rebuilt: edits to posts already passed stay queued
+            Post.objects.filter(id__in=[post.id for post in batch], related_stale=True).update(related_stale=False)
+            for post in batch:
+                BlogRecommendationService.rebuild_related_posts(post)
+            rebuilt += len(batch)
+            last_id = batch[-1].id
+
+
+class BlogTrendingService:
+    """Exponentially decayed view counts, kept in ``Post.trending_score``.
+
+    A view ``h`` hours old weighs ``2 ** (-h / half_life)``. Decaying every score each hour would
+    rewrite every post; instead each view is weighed by ``2 ** (t / half_life)``, with ``t``
+    counted from a fixed epoch, which ranks posts identically and never changes once added.
+    The sum grows without bound, so its log2 is stored. Flushed views are added to hourly
+    ``PostViewBucket`` rows and to the scores of their posts only: nothing else is rewritten.
+    """
+
+    EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+    @staticmethod
+    def half_life() -> float:
+        """Hours after which a view counts half; ``BLOG_TRENDING_HALF_LIFE_HOURS``."""
+        return getattr(settings, "BLOG_TRENDING_HALF_LIFE_HOURS", 24)
+
+    @staticmethod
+    def truncate_to_hour(moment: datetime) -> datetime:
+        return moment.replace(minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def weight_exponent(moment: datetime) -> float:
+        return (moment - BlogTrendingService.EPOCH).total_seconds() / 3600 / BlogTrendingService.half_life()
+
+    @staticmethod
+    def add_views(score: float, views: int, moment: datetime) -> float:
+        """``score`` with ``views`` made at ``moment`` added; 0 stands for no views."""
+        if views <= 0:
+            return score
+        term = math.log2(views) + BlogTrendingService.weight_exponent(moment)
+        if not score:
+            return term
+        # log2(2^a + 2^b) without leaving log space
+        high, low = max(score, term), min(score, term)
+        return high + math.log2(1 + 2 ** (low - high))
+
+    @staticmethod
+    def decayed_views(score: float, moment: Optional[datetime] = None) -> float:
+        """The view count ``score`` stands for, decayed to ``moment`` (now by default)."""
+        if not score:
+            return 0.0
+        return 2 ** (score - BlogTrendingService.weight_exponent(moment or timezone.now()))
+
+    @staticmethod
+    def record_views(deltas: Dict[int, int], moment: Optional[datetime] = None, batch_size: int = 500) -> None:
+        """Add flushed view ``deltas`` (``{post_id: views}``) to this hour's buckets and to trending scores.
+
+        Called by the single view flusher, so read-modify-write of the scores does not race.
+        """
+        hour = BlogTrendingService.truncate_to_hour(moment or timezone.now())
+        items = [(post_id, delta) for post_id, delta in deltas.items() if delta > 0]
+        for start in range(0, len(items), batch_size):
+            batch = dict(items[start : start + batch_size])
+            with transaction.atomic():
+                buckets = dict(PostViewBucket.objects.filter(hour=hour, post_id__in=list(batch)).values_list("post_id", "id"))
+                if buckets:
+                    PostViewBucket.objects.filter(id__in=list(buckets.values())).update(
+                        views=F("views")
+                        + Case(
+                            *[When(id=bucket_id, then=Value(batch[post_id])) for post_id, bucket_id in buckets.items()],
+                            default=Value(0),
+                            output_field=models.PositiveIntegerField(),
+                        )
+                    )
+                scores = dict(Post.objects.filter(id__in=list(batch)).values_list("id", "trending_score"))
+                PostViewBucket.objects.bulk_create(
+                    [
+                        PostViewBucket(post_id=post_id, hour=hour, views=views)
+                        for post_id, views in batch.items()
+                        if post_id not in buckets and post_id in scores
+                    ]
+                )
+                BlogTrendingService.store_scores(
+                    {post_id: BlogTrendingService.add_views(score, batch[post_id], hour) for post_id, score in scores.items()}
+                )
+
+    @staticmethod
+    def store_scores(scores: Dict[int, float]) -> None:
+        if not scores:
+            return
+        Post.objects.filter(id__in=list(scores)).update(
+            trending_score=Case(
+                *[When(id=post_id, then=Value(score)) for post_id, score in scores.items()],
+                default=F("trending_score"),
+                output_field=models.FloatField(),
+            )
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild_scores(batch_size: int = 500, post_ids: Optional[Iterable[int]] = None) -> int:
+        """Recompute scores from the buckets; returns posts scored.
+
+        Every score after changing the half-life or pruning; only those of ``post_ids`` after
+        rows were written without the flusher, e.g. by an import.
+        """
+        if post_ids is None:
+            scopes = [(Post.objects.all(), PostViewBucket.objects.all())]
+        else:
+            post_ids = sorted(post_ids)
+            chunks = [post_ids[start : start + batch_size] for start in range(0, len(post_ids), batch_size)]
+            scopes = [(Post.objects.filter(id__in=ids), PostViewBucket.objects.filter(post_id__in=ids)) for ids in chunks]
+        rebuilt = 0
+        for posts, buckets in scopes:
+            posts.exclude(trending_score=0).update(trending_score=0)
+            scores = {}
+            rows = buckets.order_by("post_id").values_list("post_id", "hour", "views")
+            for post_id, hour, views in rows.iterator(chunk_size=batch_size * 10):
+                if post_id not in scores and len(scores) >= batch_size:
+                    BlogTrendingService.store_scores(scores)
+                    rebuilt += len(scores)
+                    scores = {}
+                scores[post_id] = BlogTrendingService.add_views(scores.get(post_id, 0), views, hour)
+            BlogTrendingService.store_scores(scores)
+            rebuilt += len(scores)
+        bump_generation(Post)
+        return rebuilt
+
+    @staticmethod
+    def prune_buckets(older_than_hours: float) -> int:
+        """Delete buckets older than ``older_than_hours``; after many half-lives they no longer weigh on any ranking."""
+        cutoff = timezone.now() - timedelta(hours=older_than_hours)
+        deleted, _ = PostViewBucket.objects.filter(hour__lt=cutoff).delete()
+        return deleted
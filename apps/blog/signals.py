@@ -0,0 +1,183 @@
+import threading
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from apps.core.cache import bump_generation
+from apps.core.images import mark_stale
+
+from .counters import views_flushed
+from .models import Category, Comment, Post, Tag
+from .search import get_search_backend
+from .services import BlogAnalyticsService, BlogRecommendationService, BlogTrendingService
+
+SEARCHABLE_FIELDS = {"title", "excerpt", "content"}
+
+# Posts between pre_delete and post_delete; their cascaded comments are counted with the post
+_deleting = threading.local()
+
+
+def _deleting_post_ids():
+    if not hasattr(_deleting, "post_ids"):
+        _deleting.post_ids = set()
+    return _deleting.post_ids
+
+
+@receiver(pre_save, sender=Post)
+def mark_featured_image_variants_stale(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw:
+        mark_stale(instance, "featured_image", "featured_image_variants", update_fields)
+
+
+@receiver(post_save, sender=Post)
+def index_post_for_search(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not SEARCHABLE_FIELDS.intersection(update_fields)):
+        return
+    if created:
+        # Nothing indexed yet, so skip diffing against existing terms
+        get_search_backend().index_posts([instance])
+    else:
+        get_search_backend().index_post(instance)
+
+
+@receiver(post_save, sender=Post)
+def mark_related_posts_stale(sender, instance, created=False, raw=False, **kwargs):
+    changed = instance.get_changed_fields()
+    if raw or not changed or (instance.status != "published" and (created or "status" not in changed)):
+        return
+    BlogRecommendationService.mark_stale(instance)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def mark_related_posts_stale_on_tags_change(sender, instance, action, reverse, pk_set=None, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    post_ids = list(pk_set or ()) if reverse else [instance.id]
+    Post.objects.filter(id__in=post_ids, status="published").update(related_stale=True)
+
+
+@receiver(pre_delete, sender=Post)
+def mark_related_owners_stale(sender, instance, **kwargs):
+    # The cascade removes the post from their lists; the worker refills them
+    Post.objects.filter(related_entries__related=instance).update(related_stale=True)
+
+
+@receiver(post_save, sender=Post)
+def update_stats_for_post(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    was_published = instance.get_loaded_value("status") == "published"
+    is_published = instance.status == "published"
+    old_category_id = instance.get_loaded_value("category_id")
+
+    if is_published != was_published:
+        sign = 1 if is_published else -1
+        category_id = instance.category_id if is_published else old_category_id
+        contribution = BlogAnalyticsService.get_post_contribution(instance, category_id=category_id)
+        BlogAnalyticsService.apply_stats_deltas(**{field: sign * value for field, value in contribution.items()})
+    elif is_published and "category_id" in instance.get_changed_fields():
+        gained = bool(instance.category_id) and not BlogAnalyticsService.category_shared(instance.category_id, instance)
+        lost = bool(old_category_id) and not BlogAnalyticsService.category_shared(old_category_id, instance)
+        BlogAnalyticsService.apply_stats_deltas(total_categories=int(gained) - int(lost))
+
+
+@receiver(pre_delete, sender=Post)
+def remember_stats_contribution(sender, instance, **kwargs):
+    _deleting_post_ids().add(instance.pk)
+    if instance.status == "published":
+        instance._stats_contribution = BlogAnalyticsService.get_post_contribution(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_stats_contribution(sender, instance, **kwargs):
+    _deleting_post_ids().discard(instance.pk)
+    contribution = getattr(instance, "_stats_contribution", None)
+    if contribution:
+        BlogAnalyticsService.apply_stats_deltas(**{field: -value for field, value in contribution.items()})
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_stats_for_tags(sender, instance, action, reverse, pk_set=None, **kwargs):
+    if reverse:
+        # Tag-side edits (admin) are rare; recount rather than work out deltas per post
+        if action in ("post_add", "post_remove", "post_clear"):
+            BlogAnalyticsService.recount_tags()
+        return
+    if instance.status != "published":
+        return
+
+    if action == "pre_clear":
+        instance._cleared_tag_ids = list(instance.tags.values_list("id", flat=True))
+    elif action in ("post_add", "post_remove") and pk_set:
+        unshared = BlogAnalyticsService.count_unshared_tags(pk_set, instance)
+        BlogAnalyticsService.apply_stats_deltas(total_tags=unshared if action == "post_add" else -unshared)
+    elif action == "post_clear":
+        unshared = BlogAnalyticsService.count_unshared_tags(getattr(instance, "_cleared_tag_ids", ()), instance)
+        BlogAnalyticsService.apply_stats_deltas(total_tags=-unshared)
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Tag)
+def remember_taxonomy_stats_contribution(sender, instance, **kwargs):
+    # Counted while a published post uses it; the posts lose it without sending signals
+    instance._counted_in_stats = instance.posts.filter(status="published").exists()
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Tag)
+def remove_taxonomy_stats_contribution(sender, instance, **kwargs):
+    if getattr(instance, "_counted_in_stats", False):
+        field = "total_categories" if sender is Category else "total_tags"
+        BlogAnalyticsService.apply_stats_deltas(**{field: -1})
+
+
+@receiver(post_save, sender=Comment)
+def update_stats_for_comment(sender, instance, raw=False, **kwargs):
+    was_approved = bool(instance.get_loaded_value("is_approved", False))
+    if raw or was_approved == instance.is_approved:
+        return
+    if instance.post.status == "published":
+        BlogAnalyticsService.apply_stats_deltas(total_comments=1 if instance.is_approved else -1)
+
+
+@receiver(post_delete, sender=Comment)
+def update_stats_for_deleted_comment(sender, instance, **kwargs):
+    if not instance.is_approved or instance.post_id in _deleting_post_ids():
+        return
+    if Post.objects.filter(pk=instance.post_id, status="published").exists():
+        BlogAnalyticsService.apply_stats_deltas(total_comments=-1)
+
+
+@receiver(views_flushed)
+def record_trending_views(sender, deltas, **kwargs):
+    BlogTrendingService.record_views(deltas)
+
+
+@receiver(views_flushed)
+def update_stats_for_views(sender, deltas, **kwargs):
+    published = Post.objects.filter(id__in=list(deltas), status="published").values_list("id", flat=True)
+    BlogAnalyticsService.apply_stats_deltas(total_views=sum(deltas[post_id] for post_id in published))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_cached_responses(sender, **kwargs):
+    bump_generation(sender)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_cached_responses_on_tags_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_generation(Post)
+
+
+@receiver(views_flushed)
+def invalidate_cached_responses_on_views(sender, **kwargs):
+    # Popular and trending feeds are ordered by views_count and trending_score
+    bump_generation(Post)
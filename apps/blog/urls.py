@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import async_views, views
 
 app_name = "blog"
 
@@ -11,15 +11,30 @@ urlpatterns = [
     path("posts/my/", views.my_posts_view, name="my-posts"),
     path("posts/featured/", views.featured_posts_view, name="featured-posts"),
     path("posts/popular/", views.popular_posts_view, name="popular-posts"),
+    path("posts/trending/", views.trending_posts_view, name="trending-posts"),
     path("posts/recent/", views.recent_posts_view, name="recent-posts"),
     path("posts/<slug:slug>/", views.PostDetailView.as_view(), name="post-detail"),
     path("posts/<slug:slug>/edit/", views.PostUpdateView.as_view(), name="post-update"),
     path("posts/<slug:slug>/delete/", views.PostDeleteView.as_view(), name="post-delete"),
     # Comment URLs
-    path("posts/<slug:post_slug>/comments/", views.CommentCreateView.as_view(), name="comment-create"),
+    path("posts/<slug:post_slug>/comments/", views.CommentListCreateView.as_view(), name="comment-list"),
+    # Alias of comment-list (same view, never matched first), kept for existing reverse() callers
+    path("posts/<slug:post_slug>/comments/", views.CommentListCreateView.as_view(), name="comment-create"),
     # Category and Tag URLs
     path("categories/", views.CategoryListView.as_view(), name="category-list"),
     path("tags/", views.TagListView.as_view(), name="tag-list"),
     # Analytics URLs
     path("stats/", views.blog_stats_view, name="blog-stats"),
+    # Warehouse export (staff only)
+    path("export/", views.export_view, name="blog-export"),
+    # Async read endpoints (same payloads; for ASGI deployments)
+    path("async/posts/", async_views.post_list_view, name="async-post-list"),
+    path("async/posts/featured/", async_views.featured_posts_view, name="async-featured-posts"),
+    path("async/posts/popular/", async_views.popular_posts_view, name="async-popular-posts"),
+    path("async/posts/trending/", async_views.trending_posts_view, name="async-trending-posts"),
+    path("async/posts/recent/", async_views.recent_posts_view, name="async-recent-posts"),
+    path("async/posts/<slug:slug>/", async_views.post_detail_view, name="async-post-detail"),
+    path("async/categories/", async_views.category_list_view, name="async-category-list"),
+    path("async/tags/", async_views.tag_list_view, name="async-tag-list"),
+    path("async/stats/", async_views.blog_stats_view, name="async-blog-stats"),
 ]
@@ -1,10 +1,29 @@
 from django.db.models import Q
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.decorators import method_decorator
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
+from apps.core.cache import cache_response, get_generations
+from apps.core.conditional import latest, not_modified, set_validators, weak_etag
+from apps.core.pagination import CachedCountPagination
+from apps.core.query_budget import query_budget
+from apps.core.throttling import CommentRateThrottle, SearchRateThrottle
+
+from . import export
 from .models import Category, Comment, Post, Tag
+from .pagination import (
+    AuthorPostsPagination,
+    CommentPagination,
+    PopularPostsPagination,
+    PublishedFeedPagination,
+    TrendingPostsPagination,
+)
+from .search import get_search_backend
 from .serializers import (
     CategorySerializer,
     CommentSerializer,
@@ -13,12 +32,35 @@ from .serializers import (
     PostListSerializer,
     TagSerializer,
 )
-from .services import BlogAnalyticsService, BlogCommentService, BlogPostService, BlogRecommendationService
+from .services import (
+    BlogAnalyticsService,
+    BlogCommentService,
+    BlogPostService,
+    BlogRecommendationService,
+    BlogTaxonomyService,
+)
+
+EXPORT_CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
 
+# Everything a post card renders: the post, its comment count, category and tags
+POST_LIST_MODELS = (Post, Comment, Category, Tag)
 
+
+@method_decorator(cache_response(*POST_LIST_MODELS), name="get")
 class PostListView(generics.ListAPIView):
     serializer_class = PostListSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [SearchRateThrottle]
+    query_budget = 4
+
+    @property
+    def pagination_class(self):
+        # Relevance-ranked search results and legacy ?page= clients keep numbered pages;
+        # the default feed is keyset-paginated so deep pages cost the same as the first.
+        params = self.request.query_params
+        if "page" in params or params.get("search"):
+            return CachedCountPagination
+        return PublishedFeedPagination
 
     def get_queryset(self):
         queryset = BlogPostService.get_published_posts()
@@ -48,18 +90,66 @@ class PostListView(generics.ListAPIView):
         if featured == "true":
             queryset = queryset.filter(is_featured=True)
 
-        return queryset
+        if search:
+            # Search results keep the body loaded for their highlighted snippets
+            return queryset
+
+        # List payloads only carry the excerpt, so skip loading full article bodies
+        return queryset.defer("content")
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        posts = page if page is not None else list(queryset)
+
+        # Validators come from the rows already fetched, so a 304 skips only serialization
+        etag = weak_etag([(post.id, post.updated_at, post.comments_count) for post in posts], get_generations((Category, Tag)))
+        last_modified = latest(*(post.updated_at for post in posts))
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            serializer = self.get_serializer(posts, many=True)
+            response = self.get_paginated_response(serializer.data) if page is not None else Response(serializer.data)
+        return set_validators(response, etag, last_modified)
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        search = self.request.query_params.get("search")
+        if search and page is not None:
+            backend = get_search_backend()
+            for post in page:
+                post.search_snippet = backend.snippet(post, search)
+        return page
 
 
 class PostDetailView(generics.RetrieveAPIView):
     serializer_class = PostDetailSerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = "slug"
+    query_budget = 8
 
     def get_queryset(self):
-        return BlogPostService.get_published_posts()
+        return BlogPostService.get_post_detail(CommentPagination.page_size)
+
+    @staticmethod
+    def get_validators(post_id, updated_at, comments_total, comments_updated_at, generations=None):
+        if generations is None:
+            generations = get_generations((Category, Tag))
+        etag = weak_etag(post_id, updated_at, comments_total, comments_updated_at, generations)
+        return etag, latest(updated_at, comments_updated_at)
 
     def retrieve(self, request, *args, **kwargs):
+        if request.headers.get("If-None-Match") or request.headers.get("If-Modified-Since"):
+            # Revalidation: answer from one narrow query before loading the post, comments and related posts
+            state = BlogPostService.get_post_validators(self.kwargs[self.lookup_field])
+            if state is None:
+                raise Http404
+            etag, last_modified = self.get_validators(**state)
+            response = not_modified(request, etag, last_modified)
+            if response is not None:
+                # A revalidated page is still a page view
+                BlogPostService.increment_post_views(Post(id=state["post_id"]))
+                return response
+
         instance = self.get_object()
 
         # Increment view count
@@ -72,12 +162,23 @@ class PostDetailView(generics.RetrieveAPIView):
         related_posts = BlogRecommendationService.get_related_posts(instance)
         data["related_posts"] = PostListSerializer(related_posts, many=True).data
 
-        return Response(data)
+        # Remaining comments are paged from the comments endpoint
+        data["comments_next"] = None
+        if instance.comments_count > len(instance.comment_page):
+            url = reverse("blog:comment-list", kwargs={"post_slug": instance.slug})
+            data["comments_next"] = CommentPagination().get_link_after(request, instance.comment_page[-1], url)
+
+        etag, last_modified = self.get_validators(
+            instance.id, instance.updated_at, instance.comments_count, instance.comments_updated_at
+        )
+        return set_validators(Response(data), etag, last_modified)
 
 
 class PostCreateView(generics.CreateAPIView):
     serializer_class = PostCreateUpdateSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # 20 measured with two new tags (see test_query_budgets), plus 2 of headroom
+    query_budget = 22
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
@@ -87,6 +188,8 @@ class PostUpdateView(generics.UpdateAPIView):
     serializer_class = PostCreateUpdateSerializer
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = "slug"
+    # 21 measured replacing one of two tags (see test_query_budgets), plus 2 of headroom
+    query_budget = 23
 
     def get_queryset(self):
         return Post.objects.filter(author=self.request.user)
@@ -95,58 +198,96 @@ class PostUpdateView(generics.UpdateAPIView):
 class PostDeleteView(generics.DestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = "slug"
+    query_budget = 11
 
     def get_queryset(self):
         return Post.objects.filter(author=self.request.user)
 
 
+@method_decorator(cache_response(Category, Post), name="get")
 class CategoryListView(generics.ListAPIView):
-    queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.AllowAny]
+    query_budget = 3
+
+    def get_queryset(self):
+        return BlogTaxonomyService.get_categories()
 
 
+@method_decorator(cache_response(Tag, Post), name="get")
 class TagListView(generics.ListAPIView):
-    queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = [permissions.AllowAny]
+    query_budget = 3
+
+    def get_queryset(self):
+        return BlogTaxonomyService.get_tags()
 
 
-class CommentCreateView(generics.CreateAPIView):
+class CommentListCreateView(generics.ListCreateAPIView):
     serializer_class = CommentSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    throttle_classes = [CommentRateThrottle]
+    pagination_class = CommentPagination
+    query_budget = 4
+
+    def get_post(self):
+        return get_object_or_404(Post, slug=self.kwargs.get("post_slug"), status="published")
+
+    def get_queryset(self):
+        return BlogCommentService.get_post_comments(self.get_post())
 
     def perform_create(self, serializer):
-        post_slug = self.kwargs.get("post_slug")
-        post = get_object_or_404(Post, slug=post_slug, status="published")
+        post = self.get_post()
 
         BlogCommentService.create_comment(post=post, author=self.request.user, content=serializer.validated_data["content"])
 
 
+@query_budget(3)
 @api_view(["GET"])
 @permission_classes([permissions.AllowAny])
+@cache_response(*POST_LIST_MODELS)
 def featured_posts_view(request):
-    posts = BlogPostService.get_featured_posts()
+    posts = BlogPostService.get_featured_posts().defer("content")
     serializer = PostListSerializer(posts, many=True)
     return Response(serializer.data)
 
 
+@query_budget(3)
 @api_view(["GET"])
 @permission_classes([permissions.AllowAny])
+@cache_response(*POST_LIST_MODELS)
 def popular_posts_view(request):
-    posts = BlogAnalyticsService.get_popular_posts()
+    paginator = PopularPostsPagination()
+    posts = paginator.paginate_queryset(BlogPostService.get_published_posts().defer("content"), request)
     serializer = PostListSerializer(posts, many=True)
-    return Response(serializer.data)
+    return paginator.get_paginated_response(serializer.data)
+
+
+@query_budget(3)
+@api_view(["GET"])
+@permission_classes([permissions.AllowAny])
+@cache_response(*POST_LIST_MODELS)
+def trending_posts_view(request):
+    # Recent views count most (see BlogTrendingService); served from the trending_score index
+    paginator = TrendingPostsPagination()
+    posts = paginator.paginate_queryset(BlogPostService.get_published_posts().defer("content"), request)
+    serializer = PostListSerializer(posts, many=True)
+    return paginator.get_paginated_response(serializer.data)
 
 
+@query_budget(3)
 @api_view(["GET"])
 @permission_classes([permissions.AllowAny])
+@cache_response(*POST_LIST_MODELS)
 def recent_posts_view(request):
-    posts = BlogAnalyticsService.get_recent_posts()
+    paginator = PublishedFeedPagination()
+    posts = paginator.paginate_queryset(BlogPostService.get_published_posts().defer("content"), request)
     serializer = PostListSerializer(posts, many=True)
-    return Response(serializer.data)
+    return paginator.get_paginated_response(serializer.data)
 
 
+@query_budget(2)
 @api_view(["GET"])
 @permission_classes([permissions.AllowAny])
 def blog_stats_view(request):
@@ -154,9 +295,36 @@ def blog_stats_view(request):
     return Response(stats)
 
 
+@query_budget(2)
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
 def my_posts_view(request):
-    posts = Post.objects.filter(author=request.user).order_by("-created_at")
+    paginator = AuthorPostsPagination()
+    posts = paginator.paginate_queryset(BlogPostService.get_author_posts(request.user).defer("content"), request)
     serializer = PostListSerializer(posts, many=True)
-    return Response(serializer.data)
+    return paginator.get_paginated_response(serializer.data)
+
+
+# Rows are read while the response streams, after the view (and its budget) has returned
+@query_budget(1)
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def export_view(request):
+    params = request.query_params
+    entities = params.getlist("entity") or list(export.ENTITIES)
+    output = params.get("output", "ndjson")
+    compress = params.get("gzip") in ("1", "true")
+    if output not in export.FORMATS or not set(entities) <= set(export.ENTITIES):
+        raise ValidationError({"detail": f"entity must be among {export.ENTITIES}, output among {export.FORMATS}"})
+
+    try:
+        updated_since = export.parse_updated_since(params.get("updated_since"))
+        chunks = export.render(entities, output, updated_since=updated_since)
+    except ValueError as exc:
+        raise ValidationError({"detail": str(exc)})
+
+    content_type = "application/gzip" if compress else EXPORT_CONTENT_TYPES[output]
+    response = StreamingHttpResponse(export.encode(chunks, compress=compress), content_type=content_type)
+    filename = f"blog-export.{output}{'.gz' if compress else ''}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,30 @@
+import re
+from typing import Dict, List, Optional
+
+SERVER_TIMING_QUERIES = re.compile(r'\bdb;[^,]*desc="(\d+) queries')
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(len(ordered) * fraction) - 1))]
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int) -> Dict[str, float]:
+    """Throughput and p50/p95/p99 latency (milliseconds) of one benchmark run."""
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "rps": len(ordered) / elapsed if elapsed else 0,
+        "p50": percentile(ordered, 0.50) * 1000,
+        "p95": percentile(ordered, 0.95) * 1000,
+        "p99": percentile(ordered, 0.99) * 1000,
+        "errors": errors,
+    }
+
+
+def queries_from_server_timing(header: Optional[str]) -> Optional[int]:
+    """Query count reported by ``RequestMetricsMiddleware``; ``None`` when the request wasn't sampled."""
+    match = SERVER_TIMING_QUERIES.search(header or "")
+    return int(match.group(1)) if match else None
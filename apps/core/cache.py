@@ -0,0 +1,157 @@
+import hashlib
+import time
+from functools import wraps
+from typing import Iterable, List
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+from .conditional import not_modified
+
+VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+
+
+def _get_cache():
+    return caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+
+
+def _model_label(model) -> str:
+    return model if isinstance(model, str) else model._meta.label_lower
+
+
+def _generation_key(label: str) -> str:
+    return f"response:gen:{label}"
+
+
+def get_generations(models: Iterable) -> List[int]:
+    """Current generation number of each model; part of every cached response key."""
+    cache = _get_cache()
+    keys = [_generation_key(_model_label(model)) for model in models]
+    values = cache.get_many(keys)
+    for key in keys:
+        if key not in values:
+            # Seed from the clock, not 0, so an evicted counter never revives old entries
+            cache.add(key, time.time_ns(), timeout=None)
+            values[key] = cache.get(key)
+    return [values[key] for key in keys]
+
+
+async def aget_generations(models: Iterable) -> List[int]:
+    """``get_generations`` for async views, without blocking the event loop."""
+    cache = _get_cache()
+    keys = [_generation_key(_model_label(model)) for model in models]
+    values = await cache.aget_many(keys)
+    for key in keys:
+        if key not in values:
+            await cache.aadd(key, time.time_ns(), timeout=None)
+            values[key] = await cache.aget(key)
+    return [values[key] for key in keys]
+
+
+def _bump(labels: List[str]) -> None:
+    cache = _get_cache()
+    for label in labels:
+        try:
+            cache.incr(_generation_key(label))
+        except ValueError:
+            cache.add(_generation_key(label), time.time_ns(), timeout=None)
+
+
+def bump_generation(*models) -> None:
+    """Invalidate every cached response that depends on ``models`` in O(1)."""
+    labels = [_model_label(model) for model in models]
+    _bump(labels)
+    if transaction.get_connection().in_atomic_block:
+        # A request that read the old rows before commit may have cached them under the new number
+        transaction.on_commit(lambda: _bump(labels))
+
+
+def response_cache_key(request, models: Iterable) -> str:
+    query = getattr(request, "query_params", request.GET)
+    params = sorted((key, value) for key in query for value in query.getlist(key))
+    # Host is part of the key because pagination links in the payload are absolute
+    digest = hashlib.md5(f"{request.get_host()}{request.path}?{urlencode(params)}".encode()).hexdigest()
+    generations = ".".join(str(generation) for generation in get_generations(models))
+    return f"response:{digest}:{generations}"
+
+
+def cache_response(*models, timeout: int = None):
+    """Cache anonymous GET responses of a DRF view until one of ``models`` changes.
+
+    Keys combine the URL path, the normalized query string and the generation number of each
+    model, so a save anywhere in those tables (see ``bump_generation``) makes older entries
+    unreachable instead of deleting them. Use below ``@api_view`` for function views, or
+    with ``method_decorator(..., name="get")`` on class-based views. Plain async views
+    (returning ``JsonResponse``) are supported too; their rendered body is cached.
+    """
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            return _cache_async_response(view_func, models, timeout)
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method != "GET" or request.user.is_authenticated:
+                return view_func(request, *args, **kwargs)
+
+            cache = _get_cache()
+            key = response_cache_key(request, models)
+            cached = cache.get(key)
+            if cached is not None:
+                data, validators = cached
+                etag, last_modified = validators.get("ETag"), validators.get("Last-Modified")
+                response = not_modified(request, etag, parse_http_date_safe(last_modified)) if etag else None
+                if response is None:
+                    response = Response(data)
+                    for header, value in validators.items():
+                        response[header] = value
+                response["X-Cache"] = "HIT"
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200:
+                # Keep the view's validators so revalidations can be answered from the cache too
+                validators = {header: response[header] for header in VALIDATOR_HEADERS if response.has_header(header)}
+                cache.set(key, (response.data, validators), timeout or getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300))
+                response["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _cache_async_response(view_func, models, timeout):
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != "GET" or (await request.auser()).is_authenticated:
+            return await view_func(request, *args, **kwargs)
+
+        cache = _get_cache()
+        key = await sync_to_async(response_cache_key)(request, models)
+        cached = await cache.aget(key)
+        if cached is not None:
+            content, validators = cached
+            etag, last_modified = validators.get("ETag"), validators.get("Last-Modified")
+            response = not_modified(request, etag, parse_http_date_safe(last_modified)) if etag else None
+            if response is None:
+                response = HttpResponse(content, content_type="application/json")
+                for header, value in validators.items():
+                    response[header] = value
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = await view_func(request, *args, **kwargs)
+        if response.status_code == 200:
+            validators = {header: response[header] for header in VALIDATOR_HEADERS if response.has_header(header)}
+            await cache.aset(key, (response.content, validators), timeout or getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300))
+            response["X-Cache"] = "MISS"
+        return response
+
+    return wrapper
@@ -0,0 +1,36 @@
+import hashlib
+from datetime import datetime
+from typing import Optional, Union
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def weak_etag(*parts) -> str:
+    """Weak validator over ``parts``: equal values mean a semantically equivalent representation."""
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def latest(*values: Optional[datetime]) -> Optional[datetime]:
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+def not_modified(request, etag: str, last_modified: Union[datetime, int, None] = None):
+    """Return a 304 response if the request's validators match, else ``None``."""
+    if isinstance(last_modified, datetime):
+        last_modified = int(last_modified.timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag: str, last_modified: Union[datetime, int, None] = None):
+    response["ETag"] = etag
+    if isinstance(last_modified, datetime):
+        last_modified = last_modified.timestamp()
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
@@ -0,0 +1,71 @@
+import random
+from contextlib import contextmanager
+from typing import List
+
+from asgiref.local import Local
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS_PREFIX = "replica_"
+
+# Per request (thread or async context): >0 while reads must see the primary
+_state = Local()
+
+
+def get_replicas() -> List[str]:
+    replicas = getattr(settings, "DATABASE_REPLICAS", None)
+    if replicas is None:
+        replicas = [alias for alias in settings.DATABASES if alias.startswith(REPLICA_ALIAS_PREFIX)]
+    return list(replicas)
+
+
+def primary_pinned() -> bool:
+    return getattr(_state, "primary", 0) > 0
+
+
+@contextmanager
+def use_primary():
+    """Send every read inside the block to the primary (read-your-writes).
+
+    Also a decorator: workers and commands that poll rows they or the web processes just
+    wrote (stale flags, outbox claims, view logs, import checkpoints) run under it.
+    """
+    _state.primary = getattr(_state, "primary", 0) + 1
+    try:
+        yield
+    finally:
+        _state.primary -= 1
+
+
+class PrimaryReplicaRouter:
+    """Writes go to ``default``; reads are spread over ``DATABASE_REPLICAS``.
+
+    Reads stay on the primary while pinned (``use_primary``, see ``ReplicaPinningMiddleware``
+    and the worker code paths) and inside a transaction on the primary, where a lagging replica could contradict the
+    rows just written. With no replicas configured the router steps aside.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+        if not replicas:
+            return None
+        if primary_pinned() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db in replicas:
+            # Related lookups from a replica row stay on that replica
+            return instance._state.db
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication
+        return db not in get_replicas()
@@ -0,0 +1,153 @@
+import re
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import Q
+from django.db.models.lookups import Lookup
+
+# Plan lines that read a whole table or sort rows outside an index
+SCAN_PATTERNS = {
+    "sqlite": re.compile(r"\bSCAN (\w+)\b(?! USING (?:COVERING )?INDEX)"),
+    "postgresql": re.compile(r"\bSeq Scan on (\w+)"),
+}
+SORT_PATTERNS = {
+    "sqlite": re.compile(r"USE TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY"),
+    "postgresql": re.compile(r"(?:^|->)\s*(?:Incremental )?Sort\s+\("),
+}
+
+EQUALITY_LOOKUPS = ("exact", "iexact", "in", "isnull")
+RANGE_LOOKUPS = ("gt", "gte", "lt", "lte", "range")
+
+
+class PlanIssue(NamedTuple):
+    kind: str  # "scan" or "sort"
+    table: Optional[str]
+    line: str
+
+
+def explain(queryset) -> str:
+    return queryset.explain()
+
+
+def find_issues(plan: str, vendor: str) -> List[PlanIssue]:
+    """Full-table scans and sorts in an ``EXPLAIN`` plan (SQLite or PostgreSQL)."""
+    scan, sort = SCAN_PATTERNS.get(vendor), SORT_PATTERNS.get(vendor)
+    if scan is None:
+        return []
+    issues = []
+    for line in plan.splitlines():
+        match = scan.search(line)
+        if match and match.group(1) != "CONSTANT":
+            issues.append(PlanIssue("scan", match.group(1), line.strip()))
+        if sort.search(line):
+            issues.append(PlanIssue("sort", None, line.strip()))
+    return issues
+
+
+def table_rows(table: str, using: str = "default", cache: Optional[Dict[str, int]] = None) -> Optional[int]:
+    """Row count of ``table`` (the planner's estimate on PostgreSQL); ``None`` for unknown names."""
+    if cache is not None and table in cache:
+        return cache[table]
+    connection = connections[using]
+    rows = None
+    if table in connection.introspection.table_names():
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+            else:
+                cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+            rows = max(0, cursor.fetchone()[0])
+    if cache is not None:
+        cache[table] = rows
+    return rows
+
+
+def analyze(using: str = "default") -> None:
+    """Refresh the planner's statistics; without them SQLite in particular picks poor plans."""
+    connection = connections[using]
+    if connection.vendor in SCAN_PATTERNS:
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+
+def _lookups(node) -> Iterator[Lookup]:
+    # Only conjunctive, non-negated conditions can be served by one composite index
+    if getattr(node, "negated", False) or getattr(node, "connector", "AND") != "AND":
+        return
+    for child in node.children:
+        if isinstance(child, Lookup):
+            yield child
+        elif hasattr(child, "children"):
+            yield from _lookups(child)
+
+
+class IndexSuggestion(NamedTuple):
+    fields: List[str]
+    condition: Dict[str, bool]
+
+    def __str__(self):
+        condition = ", ".join(f"{name}={value}" for name, value in self.condition.items())
+        return f"models.Index(fields={self.fields}" + (f", condition=Q({condition}))" if condition else ")")
+
+    def covered_by(self, model) -> bool:
+        """Whether one of ``model``'s ``Meta.indexes`` starts with these fields, under the same condition."""
+        condition = Q(**self.condition) if self.condition else None
+        return any(
+            list(index.fields[: len(self.fields)]) == self.fields and index.condition == condition
+            for index in model._meta.indexes
+        )
+
+
+def suggest_index(queryset) -> Optional[IndexSuggestion]:
+    """Index for the base table: equality filters, then the ordering, then range filters.
+
+    Boolean filters become the condition of a partial index, since they compile to a bare
+    column test that an ordinary index cannot seek on. Returns ``None`` when the query has
+    no filter or ordering on its own columns, or when ``Meta.indexes`` already has the index.
+    """
+    query = queryset.query
+    model = queryset.model
+    base = query.base_table
+    equality, ranges, condition = [], [], {}
+    for lookup in _lookups(query.where):
+        column = getattr(lookup.lhs, "target", None)
+        if column is None or getattr(lookup.lhs, "alias", None) != base or column.model is not model:
+            continue
+        if lookup.lookup_name == "exact" and isinstance(lookup.rhs, bool):
+            condition[column.name] = lookup.rhs
+        elif lookup.lookup_name in EQUALITY_LOOKUPS:
+            equality.append(column.name)
+        elif lookup.lookup_name in RANGE_LOOKUPS:
+            ranges.append(column.name)
+
+    ordering = []
+    for field_name in query.order_by or model._meta.ordering:
+        if not isinstance(field_name, str) or "__" in field_name.lstrip("-"):
+            continue
+        name = field_name.lstrip("-")
+        name = model._meta.pk.name if name == "pk" else name
+        try:
+            model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Ordered by an annotation: no index can help
+            continue
+        ordering.append(f"-{name}" if field_name.startswith("-") else name)
+
+    fields = _distinct(equality + ordering + ranges)
+    if not fields:
+        return None
+    # After an ordering, range columns only filter inside the index: an index that already
+    # seeks the equality columns in query order is as good
+    seek = _distinct(equality + ordering) if ordering else fields
+    if IndexSuggestion(seek, condition).covered_by(model):
+        return None
+    return IndexSuggestion(fields, condition)
+
+
+def _distinct(names: List[str]) -> List[str]:
+    fields = []
+    for name in names:
+        if name.lstrip("-") not in {field.lstrip("-") for field in fields}:
+            fields.append(name)
+    return fields
@@ -0,0 +1,213 @@
+"""Resized WebP/JPEG variants of uploaded images.
+
+Uploads are served as variants (``VARIANTS``) instead of originals. Rendering never happens
+in a request: saving a model with a new image only empties its manifest field (see
+``mark_stale``), and ``generate_image_variants`` renders rows with an empty manifest, in a
+process pool when asked to. Variant files are named after the SHA-256 of the original's
+bytes, so regenerating an unchanged image finds its files in place and writes nothing.
+
+A manifest, stored on the row next to the image, looks like::
+
+    {"source": "blog/images/cat.png", "hash": "9f86d0…",
+     "variants": {"thumbnail": {"width": 160, "height": 160,
+                                "webp": "variants/9f/9f86d0…/thumbnail.webp",
+                                "jpeg": "variants/9f/9f86d0…/thumbnail.jpg"}, …}}
+"""
+
+import hashlib
+import io
+from typing import Dict, List, NamedTuple, Tuple
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from .db import use_primary
+
+
+class Variant(NamedTuple):
+    width: int
+    height: int
+    crop: bool  # fill the box and cut the overflow, rather than fit inside it
+
+
+VARIANTS = {
+    "thumbnail": Variant(160, 160, crop=True),
+    "card": Variant(640, 360, crop=True),
+    "full": Variant(1600, 1600, crop=False),
+}
+FORMATS = {
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+VARIANT_ROOT = "variants"
+
+# (model, image field, manifest field) pairs that get variants
+IMAGE_FIELDS = [
+    ("blog.Post", "featured_image", "featured_image_variants"),
+    ("users.User", "avatar", "avatar_variants"),
+]
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def variant_path(digest: str, variant: str, extension: str) -> str:
+    return f"{VARIANT_ROOT}/{digest[:2]}/{digest}/{variant}.{extension}"
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    # JPEG has no alpha channel: composite transparent images on white
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def render_variants(data: bytes) -> List[Tuple[str, str, bytes, int, int]]:
+    """``(variant, format, encoded bytes, width, height)`` for every variant and format.
+
+    Pure function of the original's bytes, so it can run in a worker process.
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        source = _flatten(ImageOps.exif_transpose(original))
+
+    rendered = []
+    for name, variant in VARIANTS.items():
+        box = (variant.width, variant.height)
+        if variant.crop and source.width >= variant.width and source.height >= variant.height:
+            image = ImageOps.fit(source, box, Image.Resampling.LANCZOS)
+        else:
+            # Never upscale: small originals keep their size
+            image = source.copy()
+            image.thumbnail(box, Image.Resampling.LANCZOS)
+        for fmt, (pil_format, _, options) in FORMATS.items():
+            buffer = io.BytesIO()
+            image.save(buffer, pil_format, **options)
+            rendered.append((name, fmt, buffer.getvalue(), image.width, image.height))
+    return rendered
+
+
+def read_original(field_file) -> bytes:
+    with field_file.storage.open(field_file.name, "rb") as source:
+        return source.read()
+
+
+def store_variants(source: str, digest: str, rendered, storage=default_storage) -> dict:
+    """Save rendered variants that are not stored yet and return the manifest."""
+    variants: Dict[str, dict] = {}
+    for name, fmt, content, width, height in rendered:
+        path = variant_path(digest, name, FORMATS[fmt][1])
+        if not storage.exists(path):
+            storage.save(path, ContentFile(content))
+        variants.setdefault(name, {"width": width, "height": height})[fmt] = path
+    return {"source": source, "hash": digest, "variants": variants}
+
+
+def existing_manifest(source: str, digest: str, storage=default_storage):
+    """The manifest of an already rendered image, without decoding it, or ``None`` if files are missing.
+
+    Dimensions are only known from the files, so this needs one image header read per variant.
+    """
+    variants = {}
+    for name in VARIANTS:
+        paths = {fmt: variant_path(digest, name, extension) for fmt, (_, extension, _) in FORMATS.items()}
+        if not all(storage.exists(path) for path in paths.values()):
+            return None
+        with storage.open(paths["jpeg"], "rb") as stored, Image.open(stored) as image:
+            variants[name] = {"width": image.width, "height": image.height, **paths}
+    return {"source": source, "hash": digest, "variants": variants}
+
+
+def build_manifest(field_file, storage=default_storage) -> dict:
+    """Render (or find) the variants of ``field_file`` in this process."""
+    data = read_original(field_file)
+    digest = content_hash(data)
+    return existing_manifest(field_file.name, digest, storage) or store_variants(
+        field_file.name, digest, render_variants(data), storage
+    )
+
+
+def mark_stale(instance, image_field: str, manifest_field: str, update_fields=None) -> None:
+    """Empty the manifest when the image changed, so the next generator run picks the row up.
+
+    Called from ``pre_save`` with the save's ``update_fields``. When those save the image but
+    not the manifest, the emptied manifest is written with its own ``UPDATE``.
+    """
+    if update_fields is not None and image_field not in update_fields:
+        return
+    name = getattr(instance, image_field).name or ""
+    manifest = getattr(instance, manifest_field) or {}
+    if manifest.get("source", "") != name:
+        setattr(instance, manifest_field, {})
+        if update_fields is not None and manifest_field not in update_fields and instance.pk is not None:
+            type(instance)._default_manager.filter(pk=instance.pk).update(**{manifest_field: {}})
+
+
+def _render(data: bytes):
+    # Worker entry point: exceptions travel back to the parent as values, so one bad upload
+    # does not take the rest of the batch down with it
+    try:
+        return render_variants(data)
+    except Exception as error:
+        return error
+
+
+@use_primary()
+def generate_variants(
+    model, image_field: str, manifest_field: str, regenerate: bool = False, batch_size: int = 100, pool=None, log=None
+) -> Tuple[int, int]:
+    """Fill in the manifests of ``model`` rows that have an image; returns ``(generated, failed)``.
+
+    Only rows with an empty manifest are visited unless ``regenerate``. Originals are read and
+    variants stored in this process; decoding and encoding, the expensive part, goes through
+    ``pool.map`` when an executor is given. A manifest is only written if the row still has
+    the image it was made from. Unreadable images get a manifest with an ``error`` and no
+    variants, so they are not retried until a new image is uploaded.
+    """
+    log = log or (lambda message: None)
+    queryset = model.objects.exclude(**{f"{image_field}__isnull": True}).exclude(**{image_field: ""})
+    if not regenerate:
+        queryset = queryset.filter(**{manifest_field: {}})
+    generated = failed = 0
+    last_pk = None
+    while True:
+        batch = queryset.order_by("pk").only("pk", image_field)
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        rows = list(batch[:batch_size])
+        if not rows:
+            return generated, failed
+        last_pk = rows[-1].pk
+
+        manifests, pending = {}, []
+        for row in rows:
+            field_file = getattr(row, image_field)
+            try:
+                data = read_original(field_file)
+            except OSError as error:
+                manifests[row.pk] = {"source": field_file.name, "error": str(error)}
+                continue
+            digest = content_hash(data)
+            manifests[row.pk] = existing_manifest(field_file.name, digest)
+            if manifests[row.pk] is None:
+                pending.append((row.pk, field_file.name, digest, data))
+
+        results = (pool.map if pool is not None else map)(_render, [data for *_, data in pending])
+        for (pk, name, digest, _), rendered in zip(pending, results):
+            if isinstance(rendered, Exception):
+                manifests[pk] = {"source": name, "error": str(rendered)}
+            else:
+                manifests[pk] = store_variants(name, digest, rendered)
+
+        for row in rows:
+            manifest = manifests[row.pk]
+            model.objects.filter(pk=row.pk, **{image_field: manifest["source"]}).update(**{manifest_field: manifest})
+            if "error" in manifest:
+                failed += 1
+                log(f"{model._meta.label} {row.pk}: {manifest['error']}")
+            else:
+                generated += 1
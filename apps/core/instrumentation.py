@@ -0,0 +1,164 @@
+"""Per-request query and timing metrics for sampled requests.
+
+``RequestMetricsMiddleware`` samples ``REQUEST_METRICS_SAMPLE_RATE`` of the requests.
+For those it records every SQL query (through a database execute wrapper), the time
+spent turning objects into serializer data and the time spent in the view, then
+reports them in a ``Server-Timing`` header and one log line per request tagged with the
+URL name. Unsampled requests cost one random draw; queries outside a sampled request
+cost one attribute lookup. Serializers are only wrapped while a sampled request runs.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+from asgiref.local import Local
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+# Queries with the same fingerprint this many times in one request are reported as N+1 suspects
+SIMILAR_QUERY_THRESHOLD = 3
+
+_state = Local()
+
+# Sampled requests in flight, across threads; ``BaseSerializer.data`` is timed while above 0
+_serializer_timing = {"users": 0, "untimed": None}
+_serializer_timing_lock = threading.Lock()
+
+_IN_LIST = re.compile(r"\bIN \((?:%s, )*%s\)")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def fingerprint(sql: str) -> str:
+    """``sql`` with literals and ``IN`` lists of any length collapsed, so repeated lookups compare equal."""
+    return _LITERALS.sub("?", _IN_LIST.sub("IN (...)", sql))
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries: List[Tuple[str, object, float]] = []
+        self.durations = {"serialize": 0.0}
+        self.started = time.perf_counter()
+        self.depth = 0
+
+    @property
+    def sql_time(self) -> float:
+        return sum(duration for _, _, duration in self.queries)
+
+    def duplicates(self) -> int:
+        """Queries repeated with the very same parameters."""
+        return len(self.queries) - len({(sql, repr(params)) for sql, params, _ in self.queries})
+
+    def similar(self) -> List[Tuple[str, int]]:
+        """Fingerprints repeated at least ``SIMILAR_QUERY_THRESHOLD`` times, most frequent first."""
+        counts = Counter(fingerprint(sql) for sql, _, _ in self.queries)
+        return [(sql, count) for sql, count in counts.most_common() if count >= SIMILAR_QUERY_THRESHOLD]
+
+    def server_timing(self, view_time: float) -> str:
+        similar = self.similar()
+        db_desc = f"{len(self.queries)} queries"
+        if similar:
+            db_desc += f", {sum(count for _, count in similar)} similar"
+        return ", ".join(
+            [
+                f'db;dur={self.sql_time * 1000:.1f};desc="{db_desc}"',
+                f"serialize;dur={self.durations['serialize'] * 1000:.1f}",
+                f"view;dur={view_time * 1000:.1f}",
+            ]
+        )
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    return getattr(_state, "metrics", None)
+
+
+@contextmanager
+def collect_metrics():
+    """Record the queries and timings of the enclosed code into a fresh ``RequestMetrics``."""
+    previous = current_metrics()
+    metrics = _state.metrics = RequestMetrics()
+    _time_serializers()
+    try:
+        yield metrics
+    finally:
+        _untime_serializers()
+        _state.metrics = previous
+
+
+@contextmanager
+def timed(name: str):
+    """Add the time spent in the block to ``name`` on the current request; nested blocks count once."""
+    metrics = current_metrics()
+    if metrics is None or metrics.depth:
+        yield
+        return
+    metrics.depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.depth -= 1
+        metrics.durations[name] = metrics.durations.get(name, 0.0) + time.perf_counter() - start
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = current_metrics()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries.append((sql, params, time.perf_counter() - start))
+
+
+def _install_query_recorder(sender, connection, **kwargs):
+    # First in line, so execute_wrapper() blocks that pop their own wrapper keep working
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def _timed_data(data):
+    def wrapper(serializer):
+        with timed("serialize"):
+            return data.fget(serializer)
+
+    return property(wrapper)
+
+
+def _time_serializers():
+    """Wrap ``BaseSerializer.data`` (which ``Serializer`` and ``ListSerializer`` build on).
+
+    DRF has no extension point around serialization. The wrapper is installed by the first
+    sampled request in flight and removed by the last, so with sampling off, or between
+    sampled requests, serializers run DRF's own property.
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    with _serializer_timing_lock:
+        if not _serializer_timing["users"]:
+            _serializer_timing["untimed"] = BaseSerializer.data
+            BaseSerializer.data = _timed_data(BaseSerializer.data)
+        _serializer_timing["users"] += 1
+
+
+def _untime_serializers():
+    from rest_framework.serializers import BaseSerializer
+
+    with _serializer_timing_lock:
+        _serializer_timing["users"] -= 1
+        if not _serializer_timing["users"]:
+            BaseSerializer.data = _serializer_timing["untimed"]
+
+
+def install():
+    """Hook the query recorder into every connection."""
+    connection_created.connect(_install_query_recorder, dispatch_uid="apps.core.instrumentation")
+    for connection in connections.all(initialized_only=True):
+        _install_query_recorder(None, connection)
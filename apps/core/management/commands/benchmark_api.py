@@ -0,0 +1,190 @@
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from apps.blog.models import Comment, Post
+from apps.core.benchmark import queries_from_server_timing, summarize
+
+# name -> (URL name, needs a token)
+ENDPOINTS = {
+    "posts": ("blog:post-list", False),
+    "post-detail": ("blog:post-detail", False),
+    "stats": ("blog:blog-stats", False),
+    "users": ("users:list", True),
+}
+DETAIL_SAMPLE = 100
+
+
+class Command(BaseCommand):
+    help = "Measure latency percentiles, queries per request and throughput of the main API endpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--endpoint", choices=sorted(ENDPOINTS), nargs="+", default=sorted(ENDPOINTS))
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+        parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per endpoint")
+        parser.add_argument("--concurrency", type=int, default=1)
+        parser.add_argument("--url", help="Base URL of a running server (http://127.0.0.1:8000); default is in-process")
+        parser.add_argument("--host", default="localhost", help="Host header for in-process requests")
+        parser.add_argument("--cached", action="store_true", help="Let anonymous responses come from the response cache")
+        parser.add_argument("--output", help="Write the results to this JSON file")
+        parser.add_argument("--baseline", help="Compare against the JSON file of an earlier run")
+        parser.add_argument(
+            "--max-regression", type=float, help="Fail if any p95 is this many percent slower than the baseline"
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.token = self.get_token() if any(ENDPOINTS[name][1] for name in options["endpoint"]) else None
+        slugs = self.detail_slugs() if "post-detail" in options["endpoint"] else []
+
+        results = {}
+        # In-process requests run as in production (no query log, no debug toolbar) and are all
+        # sampled, so Server-Timing carries the query count
+        with override_settings(DEBUG=False, INTERNAL_IPS=[], REQUEST_METRICS_SAMPLE_RATE=1):
+            for name in options["endpoint"]:
+                url_name, authenticated = ENDPOINTS[name]
+                if name == "post-detail":
+                    paths = [reverse(url_name, kwargs={"slug": slug}) for slug in slugs]
+                else:
+                    paths = [reverse(url_name)]
+                results[name] = self.run(paths, authenticated)
+
+        report = {
+            "created_at": timezone.now().isoformat(),
+            "target": options["url"] or "in-process",
+            "database": connection.vendor,
+            "concurrency": options["concurrency"],
+            "rows": {
+                "posts": Post.objects.count(),
+                "comments": Comment.objects.count(),
+                "users": get_user_model().objects.count(),
+            },
+            "endpoints": results,
+        }
+        self.print_report(report)
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+        if options["baseline"]:
+            self.compare(report)
+
+    def get_token(self) -> str:
+        user = get_user_model().objects.filter(is_active=True).order_by("id").first()
+        if user is None:
+            raise CommandError("No users to authenticate as; run seed_blog first")
+        return Token.objects.get_or_create(user=user)[0].key
+
+    @staticmethod
+    def detail_slugs():
+        # Traffic concentrates on popular posts
+        slugs = list(
+            Post.objects.filter(status="published").order_by("-views_count").values_list("slug", flat=True)[:DETAIL_SAMPLE]
+        )
+        if not slugs:
+            raise CommandError("No published posts to request; run seed_blog first")
+        return slugs
+
+    def run(self, paths, authenticated):
+        options = self.options
+        headers = {"Authorization": f"Token {self.token}"} if authenticated else {}
+        fetch = self.fetcher(headers)
+        jobs = [(index, paths[index % len(paths)]) for index in range(options["warmup"] + options["requests"])]
+        for job in jobs[: options["warmup"]]:
+            fetch(*job)
+
+        jobs = jobs[options["warmup"] :]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            samples = list(pool.map(lambda job: fetch(*job), jobs))
+        elapsed = time.perf_counter() - started
+
+        result = summarize([latency for latency, _, _ in samples], elapsed, sum(status >= 400 for _, status, _ in samples))
+        queries = [count for _, _, count in samples if count is not None]
+        result["queries"] = statistics.mean(queries) if queries else None
+        return result
+
+    def fetcher(self, headers):
+        """``fetch(index, path) -> (seconds, status, queries)`` for the configured target."""
+        options = self.options
+        query = "" if options["cached"] else "?bench={}"
+
+        if options["url"]:
+            base = options["url"].rstrip("/")
+
+            def fetch(index, path):
+                request = urllib.request.Request(base + path + query.format(index), headers=headers)
+                started = time.perf_counter()
+                try:
+                    with urllib.request.urlopen(request) as response:
+                        response.read()
+                        status, timing = response.status, response.headers.get("Server-Timing")
+                except urllib.error.HTTPError as error:
+                    status, timing = error.code, error.headers.get("Server-Timing")
+                return time.perf_counter() - started, status, queries_from_server_timing(timing)
+
+            return fetch
+
+        local = threading.local()
+
+        def fetch(index, path):
+            if not hasattr(local, "client"):
+                local.client = Client(SERVER_NAME=options["host"], headers=headers)
+            started = time.perf_counter()
+            response = local.client.get(path + query.format(index))
+            return (
+                time.perf_counter() - started,
+                response.status_code,
+                queries_from_server_timing(response.get("Server-Timing")),
+            )
+
+        return fetch
+
+    def print_report(self, report):
+        rows = report["rows"]
+        self.stdout.write(
+            f"{report['target']} on {report['database']}: {rows['posts']} posts, {rows['comments']} comments, "
+            f"{rows['users']} users, concurrency {report['concurrency']}"
+        )
+        self.stdout.write(
+            f"{'endpoint':<12} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'errors':>7}"
+        )
+        for name, result in report["endpoints"].items():
+            queries = "-" if result["queries"] is None else f"{result['queries']:.1f}"
+            self.stdout.write(
+                f"{name:<12} {result['rps']:>9.1f} {result['p50']:>8.1f} {result['p95']:>8.1f} "
+                f"{result['p99']:>8.1f} {queries:>8} {result['errors']:>7}"
+            )
+
+    def compare(self, report):
+        with open(self.options["baseline"]) as source:
+            baseline = json.load(source)["endpoints"]
+
+        self.stdout.write(f"\nAgainst {self.options['baseline']}:")
+        regressions = []
+        for name, result in report["endpoints"].items():
+            before = baseline.get(name)
+            if not before:
+                continue
+            change = (result["p95"] - before["p95"]) / before["p95"] * 100 if before["p95"] else 0
+            self.stdout.write(
+                f"{name:<12} p95 {before['p95']:.1f} -> {result['p95']:.1f} ms ({change:+.0f}%), "
+                f"req/s {before['rps']:.1f} -> {result['rps']:.1f}, "
+                f"queries {before.get('queries')} -> {result['queries']}"
+            )
+            if self.options["max_regression"] is not None and change > self.options["max_regression"]:
+                regressions.append(name)
+        if regressions:
+            raise CommandError(f"p95 regressed by more than {self.options['max_regression']}%: {', '.join(regressions)}")
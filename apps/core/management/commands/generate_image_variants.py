@@ -0,0 +1,52 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from apps.core.cache import bump_generation
+from apps.core.images import IMAGE_FIELDS, generate_variants
+
+
+class Command(BaseCommand):
+    help = "Render resized WebP/JPEG variants of uploaded images that do not have them yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Revisit every image, not just new ones")
+        parser.add_argument("--workers", type=int, default=0, help="Render in this many processes (default: in this one)")
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new uploads instead of exiting")
+        parser.add_argument("--interval", type=float, default=10.0, help="Seconds between polls with --loop")
+
+    def handle(self, *args, **options):
+        pool = ProcessPoolExecutor(options["workers"]) if options["workers"] else None
+        try:
+            regenerate = options["all"]
+            while True:
+                self.generate(pool, regenerate, options["batch_size"], report=regenerate or not options["loop"])
+                if not options["loop"]:
+                    return
+                # --all applies to the first pass; later ones only pick up new uploads
+                regenerate = False
+                time.sleep(options["interval"])
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def generate(self, pool, regenerate, batch_size, report):
+        for label, image_field, manifest_field in IMAGE_FIELDS:
+            model = apps.get_model(label)
+            generated, failed = generate_variants(
+                model,
+                image_field,
+                manifest_field,
+                regenerate=regenerate,
+                batch_size=batch_size,
+                pool=pool,
+                log=lambda message: self.stderr.write(message),
+            )
+            if generated or failed:
+                # Cached responses still carry the old (empty) variants
+                bump_generation(model)
+            if generated or failed or report:
+                self.stdout.write(f"{label}.{image_field}: {generated} generated, {failed} failed")
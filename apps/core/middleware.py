@@ -0,0 +1,140 @@
+import hashlib
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+
+from .db import get_replicas, use_primary
+from .instrumentation import collect_metrics, logger
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+
+class ReplicaPinningMiddleware:
+    """Read-your-writes on top of ``PrimaryReplicaRouter``.
+
+    Unsafe requests read from the primary. After a successful one the client is pinned to
+    the primary for ``REPLICA_PIN_SECONDS``, long enough for replicas to catch up: browsers
+    through a cookie, token clients (which often drop cookies) through a cache marker keyed
+    by a digest of their ``Authorization`` header.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @property
+    def cookie_name(self) -> str:
+        return getattr(settings, "REPLICA_PIN_COOKIE", "primary_pin")
+
+    @property
+    def window(self) -> int:
+        return getattr(settings, "REPLICA_PIN_SECONDS", 5)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.needs_primary(request):
+            return self.get_response(request)
+        with use_primary():
+            response = self.get_response(request)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        if not self.needs_primary(request):
+            return await self.get_response(request)
+        with use_primary():
+            response = await self.get_response(request)
+        return self.pin(request, response)
+
+    @staticmethod
+    def marker_key(request):
+        authorization = request.headers.get("Authorization")
+        if not authorization:
+            return None
+        return f"db:pin:{hashlib.sha256(authorization.encode()).hexdigest()}"
+
+    def needs_primary(self, request) -> bool:
+        if not get_replicas():
+            return False
+        if request.method not in SAFE_METHODS or self.cookie_name in request.COOKIES:
+            return True
+        key = self.marker_key(request)
+        return key is not None and cache.get(key) is not None
+
+    def pin(self, request, response):
+        if request.method in SAFE_METHODS or response.status_code >= 400:
+            return response
+        response.set_cookie(self.cookie_name, "1", max_age=self.window, httponly=True, samesite="Lax")
+        key = self.marker_key(request)
+        if key is not None:
+            cache.set(key, 1, timeout=self.window)
+        return response
+
+
+class RequestMetricsMiddleware:
+    """Query count, SQL time, repeated queries and serializer/view time of sampled requests.
+
+    ``REQUEST_METRICS_SAMPLE_RATE`` (0 to 1) of the requests are measured; the numbers go to a
+    ``Server-Timing`` header, which browser dev tools display, and to one log line tagged with
+    the URL name (``blog:post-list``). See ``apps.core.instrumentation``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+        with collect_metrics() as metrics:
+            response = self.get_response(request)
+        return self.report(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+        with collect_metrics() as metrics:
+            response = await self.get_response(request)
+        return self.report(request, response, metrics)
+
+    @staticmethod
+    def sampled() -> bool:
+        rate = getattr(settings, "REQUEST_METRICS_SAMPLE_RATE", 0)
+        return rate > 0 and (rate >= 1 or random.random() < rate)
+
+    @staticmethod
+    def report(request, response, metrics):
+        view_time = time.perf_counter() - metrics.started
+        response["Server-Timing"] = metrics.server_timing(view_time)
+
+        match = request.resolver_match
+        url_name = match.view_name if match else "unresolved"
+        similar = metrics.similar()
+        fields = {
+            "url_name": url_name,
+            "method": request.method,
+            "status": response.status_code,
+            "queries": len(metrics.queries),
+            "duplicate_queries": metrics.duplicates(),
+            "similar_queries": sum(count for _, count in similar),
+            "sql_ms": round(metrics.sql_time * 1000, 1),
+            "serialize_ms": round(metrics.durations["serialize"] * 1000, 1),
+            "view_ms": round(view_time * 1000, 1),
+        }
+        logger.info(" ".join(f"{key}={value}" for key, value in fields.items()), extra=fields)
+        for sql, count in similar:
+            logger.warning("url_name=%s repeated %d times: %s", url_name, count, sql, extra={"url_name": url_name})
+        return response
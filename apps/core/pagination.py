@@ -0,0 +1,306 @@
+import hashlib
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+from typing import List, Optional, Sequence, Tuple
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import get_generations
+from .explain import table_rows
+
+
+class KeysetCursorPagination(BasePagination):
+    """Opaque cursor pagination that seeks on the full ordering tuple.
+
+    Unlike DRF's ``CursorPagination`` (which seeks on the first field and skips ties
+    with an OFFSET), every page is fetched with ``WHERE (a, id) < (:a, :id)`` so its
+    cost does not depend on how deep the client has paged. ``ordering`` must end with a
+    unique field and should be backed by a matching composite index.
+    """
+
+    ordering: Sequence[str] = ("-created_at", "-id")
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    # Links point at the current request URL unless another endpoint serves the pages
+    base_url: Optional[str] = None
+
+    def get_page_size(self, request) -> int:
+        if self.page_size_query_param:
+            try:
+                return _positive_int(request.query_params[self.page_size_query_param], strict=True, cutoff=self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None) -> Optional[List]:
+        if not self.start(request):
+            return None
+        return self.build_page(list(self.get_page_queryset(queryset)))
+
+    async def apaginate_queryset(self, queryset, request, view=None) -> Optional[List]:
+        """``paginate_queryset`` for async views: the page is fetched through the async ORM."""
+        if not self.start(request):
+            return None
+        return self.build_page([obj async for obj in self.get_page_queryset(queryset)])
+
+    def start(self, request) -> bool:
+        """Read page size and cursor from ``request``; False when pagination is turned off."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return False
+        self.cursor = self.decode_cursor(request)
+        return True
+
+    def get_page_queryset(self, queryset):
+        """Apply ordering and the seek condition; the slice fetches one extra row to detect another page."""
+        self.model = queryset.model
+        reverse = bool(self.cursor and self.cursor[1])
+        ordering = [self._invert(field) for field in self.ordering] if reverse else list(self.ordering)
+
+        queryset = queryset.order_by(*ordering)
+        if self.cursor:
+            queryset = queryset.filter(self._seek_filter(ordering, self._parse_values(self.cursor[0])))
+        return queryset[: self.page_size + 1]
+
+    def build_page(self, results: List) -> List:
+        reverse = bool(self.cursor and self.cursor[1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else self.cursor is not None
+        self.next_position = self._position(results[-1]) if results else None
+        self.previous_position = self._position(results[0]) if results else None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data) -> dict:
+        return {"next": self.get_next_link(), "previous": self.get_previous_link(), "results": data}
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous or self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_link_after(self, request, obj, url: Optional[str] = None) -> str:
+        """Link to the page that follows ``obj``, for first pages embedded in another payload."""
+        self.request = request
+        self.base_url = url
+        return self.encode_cursor(self._position(obj), reverse=False)
+
+    def encode_cursor(self, position: Tuple, reverse: bool) -> str:
+        payload = json.dumps({"p": position, "r": int(reverse)}, separators=(",", ":"))
+        token = urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+        url = self.request.build_absolute_uri(self.base_url)
+        return replace_query_param(remove_query_param(url, "page"), self.cursor_query_param, token)
+
+    def decode_cursor(self, request) -> Optional[Tuple[list, bool]]:
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            position, reverse = payload["p"], bool(payload["r"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _parse_values(self, position: list) -> list:
+        values = []
+        for field_name, raw in zip(self.ordering, position):
+            field = self.model._meta.get_field(field_name.lstrip("-"))
+            try:
+                values.append(None if raw is None else field.to_python(raw))
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def _position(self, obj) -> list:
+        position = []
+        for field_name in self.ordering:
+            value = getattr(obj, field_name.lstrip("-"))
+            # isoformat keeps microseconds, which the seek condition needs to be exact
+            position.append(value.isoformat() if isinstance(value, (datetime, date)) else value)
+        return position
+
+    @staticmethod
+    def _invert(field_name: str) -> str:
+        return field_name[1:] if field_name.startswith("-") else f"-{field_name}"
+
+    @staticmethod
+    def _seek_filter(ordering: Sequence[str], values: Sequence) -> Q:
+        # (a, b, c) after (x, y, z)  ==  a > x OR (a = x AND (b > y OR (b = y AND c > z)))
+        condition = None
+        for field_name, value in reversed(list(zip(ordering, values))):
+            name = field_name.lstrip("-")
+            lookup = "lt" if field_name.startswith("-") else "gt"
+            beyond = Q(**{f"{name}__{lookup}": value})
+            condition = beyond if condition is None else beyond | (Q(**{name: value}) & condition)
+        return condition
+
+
+def estimate_count(queryset) -> Optional[int]:
+    """The planner's row estimate for ``queryset`` on PostgreSQL; ``None`` elsewhere.
+
+    Unfiltered querysets read ``pg_class.reltuples``; filtered ones the top node of their plan.
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        return None
+    if not queryset.query.where:
+        return table_rows(queryset.model._meta.db_table, using=queryset.db)
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CachedCountPagination(PageNumberPagination):
+    """Numbered pages without a ``COUNT(*)`` on every request.
+
+    Totals are cached per normalized query (its SQL without ordering, plus the model's
+    response-cache generation) for ``count_cache_timeout`` seconds. On PostgreSQL, queries the
+    planner expects to match at least ``estimate_threshold`` rows are not counted at all: the
+    estimate is served with ``"count_estimated": true``. Links do not depend on the total:
+    the page is fetched with one extra row to tell whether another one follows, and the last
+    page makes the total exact again.
+    """
+
+    count_cache_timeout = 60
+    estimate_threshold = 10_000
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None) -> Optional[List]:
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.count = self.count_estimated = None
+        raw = request.query_params.get(self.page_query_param) or 1
+        if raw in self.last_page_strings:
+            self.count, self.count_estimated = self.get_count(queryset)
+            self.number = max(1, -(-self.count // page_size))
+        else:
+            try:
+                self.number = _positive_int(raw, strict=True)
+            except ValueError:
+                raise NotFound(self.invalid_page_message)
+
+        offset = (self.number - 1) * page_size
+        rows = list(queryset[offset : offset + page_size + 1])
+        if not rows and self.number > 1:
+            raise NotFound(self.invalid_page_message)
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+
+        if not self.has_next:
+            # The end is on this page: no need to count
+            self.count, self.count_estimated = offset + len(self.page), False
+        elif self.count is None:
+            self.count, self.count_estimated = self.get_count(queryset)
+        # A stale or estimated total must not contradict the rows just seen
+        self.count = max(self.count, offset + len(self.page) + int(self.has_next))
+        return self.page
+
+    def get_count(self, queryset) -> Tuple[int, bool]:
+        """``(total, estimated)``, from the cache when possible."""
+        key = self.count_cache_key(queryset)
+        cached = cache.get(key)
+        if cached is not None:
+            return tuple(cached)
+        estimate = estimate_count(queryset)
+        if estimate is not None and estimate >= self.estimate_threshold:
+            result = (estimate, True)
+        else:
+            result = (queryset.count(), False)
+        cache.set(key, result, self.count_cache_timeout)
+        return result
+
+    def count_cache_key(self, queryset) -> str:
+        # Filters and joins decide the total; ordering and selected columns do not
+        sql, params = queryset.order_by().values("pk").query.sql_with_params()
+        # "Published before now" filters carry a new timestamp on every request: within a
+        # cache period they are the same filter
+        params = [self._period(param) for param in params]
+        generation = get_generations([queryset.model])[0]
+        digest = hashlib.sha256(f"{queryset.db}:{sql}:{params!r}".encode()).hexdigest()
+        return f"pagination:count:{queryset.model._meta.label_lower}:{generation}:{digest}"
+
+    def _period(self, param):
+        if isinstance(param, str):
+            # Backends such as SQLite pass datetimes as strings
+            try:
+                param = datetime.fromisoformat(param)
+            except ValueError:
+                return param
+        if isinstance(param, datetime):
+            return int(param.timestamp() // self.count_cache_timeout)
+        return param
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.count,
+                "count_estimated": self.count_estimated,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_estimated"] = {"type": "boolean"}
+        return response_schema
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.page_query_param, self.number + 1)
+
+    def get_previous_link(self) -> Optional[str]:
+        if self.number <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.number - 1)
+
+    def get_html_context(self):
+        # Page controls need the number of pages, which an estimate cannot give
+        return {"previous_url": self.get_previous_link(), "next_url": self.get_next_link(), "page_links": []}
@@ -0,0 +1,49 @@
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(max_queries: int):
+    """Declare the maximum number of queries a function-based view may run.
+
+    Apply it above ``@api_view`` so the attribute lands on the final view callable.
+    Class-based views declare a ``query_budget`` class attribute instead.
+    """
+
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+
+    return decorator
+
+
+def get_query_budget(view_func: Callable) -> Optional[int]:
+    budget = getattr(view_func, "query_budget", None)
+    if budget is None:
+        budget = getattr(getattr(view_func, "view_class", None), "query_budget", None)
+    return budget
+
+
+@contextmanager
+def assert_query_budget(path: str, using: str = "default"):
+    """Fail if the queries executed inside the block exceed the budget of the view serving ``path``."""
+    match = resolve(path.split("?", 1)[0])
+    budget = get_query_budget(match.func)
+    if budget is None:
+        raise QueryBudgetExceeded(f"View {match.view_name} does not declare a query budget")
+
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+
+    if len(context.captured_queries) > budget:
+        queries = "\n".join(query["sql"] for query in context.captured_queries)
+        raise QueryBudgetExceeded(
+            f"{match.view_name} ran {len(context.captured_queries)} queries, budget is {budget}:\n{queries}"
+        )
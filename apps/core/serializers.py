@@ -0,0 +1,30 @@
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+
+
+class ImageVariantsField(serializers.Field):
+    """Variant URLs and sizes from an image manifest (``apps.core.images``); ``None`` until generated.
+
+    ``{"thumbnail": {"width": 160, "height": 160, "webp": url, "jpeg": url}, "card": …, "full": …}``
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, manifest):
+        variants = (manifest or {}).get("variants")
+        if not variants:
+            return None
+        request = self.context.get("request")
+        representation = {}
+        for name, variant in variants.items():
+            entry = {}
+            for key, value in variant.items():
+                if key in ("width", "height"):
+                    entry[key] = value
+                else:
+                    url = default_storage.url(value)
+                    entry[key] = request.build_absolute_uri(url) if request is not None else url
+            representation[name] = entry
+        return representation
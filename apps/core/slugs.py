@@ -0,0 +1,103 @@
+from typing import Dict, Iterable, List, Set
+
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+# Longest suffix a truncated base leaves room for ("-" plus up to eight digits)
+SUFFIX_RESERVE = 9
+SAVE_ATTEMPTS = 5
+# Distinct bases per prefix query; SQLite rejects much deeper OR chains
+LOOKUP_CHUNK = 250
+
+
+def _stem(base: str, max_length: int) -> str:
+    """Part of ``base`` that every candidate (``base``, ``base-2``…) is guaranteed to start with."""
+    if len(base) + SUFFIX_RESERVE <= max_length:
+        return base
+    return base[: max_length - SUFFIX_RESERVE]
+
+
+def _candidate(base: str, number: int, max_length: int) -> str:
+    if number == 1:
+        return base[:max_length]
+    suffix = f"-{number}"
+    return base[: max_length - len(suffix)].rstrip("-") + suffix
+
+
+def allocate_slugs(model, texts: Iterable[str], field: str = "slug") -> List[str]:
+    """Unique ``field`` values for ``texts``: the slugified text, then ``-2``, ``-3``… on collision.
+
+    Every existing value that could clash with any candidate is read in one prefix query per
+    ``LOOKUP_CHUNK`` distinct bases (served by the ``varchar_pattern_ops`` index Django adds
+    to slug fields on PostgreSQL);
+    suffixes are then assigned in memory, so duplicates within the batch get distinct slugs too.
+    Rows committed concurrently can still take a slug first: callers rely on the unique
+    constraint and allocate again (see ``UniqueSlugMixin``).
+    """
+    max_length = model._meta.get_field(field).max_length
+    fallback = model._meta.model_name
+    bases = [(slugify(text) or fallback)[:max_length] for text in texts]
+    if not bases:
+        return []
+
+    taken: Set[str] = set()
+    distinct = sorted(set(bases))
+    for start in range(0, len(distinct), LOOKUP_CHUNK):
+        lookup = Q()
+        for base in distinct[start : start + LOOKUP_CHUNK]:
+            stem = _stem(base, max_length)
+            if stem == base:
+                lookup |= Q(**{field: base}) | Q(**{f"{field}__startswith": f"{base}-"})
+            else:
+                lookup |= Q(**{f"{field}__startswith": stem})
+        taken.update(model._default_manager.filter(lookup).values_list(field, flat=True))
+
+    next_number: Dict[str, int] = {}
+    slugs = []
+    for base in bases:
+        number = next_number.get(base, 1)
+        candidate = _candidate(base, number, max_length)
+        while candidate in taken:
+            number += 1
+            candidate = _candidate(base, number, max_length)
+        taken.add(candidate)
+        next_number[base] = number + 1
+        slugs.append(candidate)
+    return slugs
+
+
+def assign_slugs(objs, source: str, field: str = "slug") -> None:
+    """Fill in blank ``field`` values on unsaved ``objs`` before a ``bulk_create``."""
+    pending = [obj for obj in objs if not getattr(obj, field)]
+    if not pending:
+        return
+    model = type(pending[0])
+    for obj, slug in zip(pending, allocate_slugs(model, [getattr(obj, source) for obj in pending], field=field)):
+        setattr(obj, field, slug)
+
+
+class UniqueSlugMixin:
+    """Derive a blank ``slug`` from ``SLUG_SOURCE`` on save, re-allocating if a concurrent insert took it."""
+
+    SLUG_SOURCE = "name"
+
+    def save(self, *args, **kwargs):
+        if self.slug:
+            return super().save(*args, **kwargs)
+
+        model = type(self)
+        using = kwargs.get("using") or router.db_for_write(model, instance=self)
+        for attempt in range(SAVE_ATTEMPTS):
+            self.slug = allocate_slugs(model, [getattr(self, self.SLUG_SOURCE)])[0]
+            try:
+                if connections[using].in_atomic_block:
+                    # Keep the caller's transaction usable if the insert fails
+                    with transaction.atomic(using=using):
+                        return super().save(*args, **kwargs)
+                return super().save(*args, **kwargs)
+            except IntegrityError:
+                clashed = model._default_manager.using(using).filter(slug=self.slug).exists()
+                if not clashed or attempt == SAVE_ATTEMPTS - 1:
+                    self.slug = ""
+                    raise
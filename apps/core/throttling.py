@@ -0,0 +1,184 @@
+"""Sliding-window rate limits kept in the cache.
+
+DRF's ``SimpleRateThrottle`` stores every request timestamp of a client in one cache entry
+and rewrites it on each request, which is racy and grows with the rate. These throttles
+use the sliding-window counter approximation instead: one atomic counter per client and
+fixed window, with the previous window's count weighted by how much of it still overlaps
+the sliding window. Two reads and one increment per request, whatever the rate.
+
+Rates come from ``REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]`` under each class's ``scope``
+(``"5/min"``, ``"100/hour"``…). If the cache is unreachable, counting falls back to a
+per-process table so limits still apply, just per worker.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+logger = logging.getLogger(__name__)
+
+# While the cache is down every request would log; once a minute is enough
+OUTAGE_LOG_INTERVAL = 60
+_last_outage_log = 0.0
+
+
+class LocalCounters:
+    """In-process stand-in for the cache counters while the cache is down."""
+
+    MAX_KEYS = 10_000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts: Dict[str, Tuple[float, int]] = {}
+
+    def get_many(self, keys: List[str]) -> Dict[str, int]:
+        now = time.monotonic()
+        with self.lock:
+            return {key: self.counts[key][1] for key in keys if key in self.counts and self.counts[key][0] > now}
+
+    def incr(self, key: str, timeout: int) -> None:
+        now = time.monotonic()
+        with self.lock:
+            if len(self.counts) >= self.MAX_KEYS:
+                self.counts = {key: entry for key, entry in self.counts.items() if entry[0] > now}
+            expires, count = self.counts.get(key, (0, 0))
+            if expires <= now:
+                expires, count = now + timeout, 0
+            self.counts[key] = (expires, count + 1)
+
+
+local_counters = LocalCounters()
+
+
+def _log_outage():
+    global _last_outage_log
+    if time.monotonic() - _last_outage_log > OUTAGE_LOG_INTERVAL:
+        _last_outage_log = time.monotonic()
+        logger.warning("Throttle cache unavailable, counting in process", exc_info=True)
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Base class: subclasses set ``scope`` and may override ``get_ident_for``."""
+
+    cache_format = "throttle:{scope}:{ident}"
+
+    def get_rate(self):
+        # Read the rates at request time so settings overrides apply
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_ident_for(self, request, view) -> Optional[str]:
+        """Who is being limited: the user when authenticated, the client IP otherwise."""
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_for(request, view)
+        if ident is None:
+            return None
+        return self.cache_format.format(scope=self.scope, ident=ident)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        window = self.duration
+        current = int(now // window)
+        elapsed = now - current * window
+        keys = [f"{self.key}:{current - 1}", f"{self.key}:{current}"]
+        counts = self.read(keys)
+        self.previous, self.current = counts.get(keys[0], 0), counts.get(keys[1], 0)
+        self.elapsed = elapsed
+
+        if self.previous * (window - elapsed) / window + self.current >= self.num_requests:
+            return False
+        self.increment(keys[1])
+        return True
+
+    def read(self, keys: List[str]) -> Dict[str, int]:
+        try:
+            return cache.get_many(keys)
+        except Exception:
+            _log_outage()
+            return local_counters.get_many(keys)
+
+    def increment(self, key: str) -> None:
+        # Counters outlive their window by one more, while they weigh on the next one
+        timeout = 2 * self.duration
+        try:
+            cache.add(key, 0, timeout)
+            cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.add(key, 1, timeout)
+        except Exception:
+            _log_outage()
+            local_counters.incr(key, timeout)
+
+    def wait(self):
+        """Seconds until the weighted count drops below the limit again (for ``Retry-After``)."""
+        window, allowed = self.duration, self.num_requests - 1
+        if self.current <= allowed:
+            # The previous window's weight has to fade enough within this window
+            until = window * (1 - (allowed - self.current) / self.previous) if self.previous else 0
+            return max(0.0, until - self.elapsed)
+        # This window alone is over the limit: wait for the next one, where it weighs in as "previous"
+        return window - self.elapsed + window * (1 - allowed / self.current)
+
+
+class LoginRateThrottle(SlidingWindowThrottle):
+    """Login attempts per client IP; each attempt runs a deliberately slow password hash."""
+
+    scope = "login"
+
+    def get_ident_for(self, request, view):
+        return f"ip:{self.get_ident(request)}"
+
+
+class LoginAccountRateThrottle(SlidingWindowThrottle):
+    """Login attempts per target account, whatever IPs they come from."""
+
+    scope = "login_account"
+
+    def get_ident_for(self, request, view):
+        data = request.data if hasattr(request.data, "get") else {}
+        email = str(data.get("email") or "").strip().lower()
+        if not email:
+            return None
+        return f"account:{hashlib.sha256(email.encode()).hexdigest()}"
+
+
+class RegisterRateThrottle(LoginRateThrottle):
+    scope = "register"
+
+
+class SearchRateThrottle(SlidingWindowThrottle):
+    """Full-text searches per user or IP; plain feed requests are not counted."""
+
+    scope = "search"
+
+    def get_ident_for(self, request, view):
+        if not request.query_params.get("search"):
+            return None
+        return super().get_ident_for(request, view)
+
+
+class CommentRateThrottle(SlidingWindowThrottle):
+    """Comment submissions per user; reading comments is not limited."""
+
+    scope = "comments"
+
+    def get_ident_for(self, request, view):
+        if request.method != "POST":
+            return None
+        return super().get_ident_for(request, view)
@@ -0,0 +1,95 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from .models import User
+
+# The password hash never goes to the cache; it is loaded on demand if a view needs it
+SNAPSHOT_FIELDS = [field.attname for field in User._meta.concrete_fields if field.attname != "password"]
+
+# Bumped by every invalidation; a miss that saw it change while reading the database drops its snapshot
+VERSION_KEY = "auth:version"
+
+
+def token_cache_key(key: str) -> str:
+    # Keys are credentials: only a digest appears in the cache
+    return f"auth:token:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def user_cache_key(user_id) -> str:
+    return f"auth:user:{user_id}"
+
+
+def _bump_version() -> None:
+    cache.add(VERSION_KEY, 0, timeout=None)
+    cache.incr(VERSION_KEY)
+
+
+def invalidate_token(key: str) -> None:
+    _bump_version()
+    cache.delete(token_cache_key(key))
+
+
+def invalidate_user(user_id) -> None:
+    """Drop the cached token of ``user_id``, found through the user → token key pointer."""
+    _bump_version()
+    token_key = cache.get(user_cache_key(user_id))
+    cache.delete_many([user_cache_key(user_id)] + ([token_key] if token_key else []))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """``TokenAuthentication`` that keeps a token → user snapshot in the cache.
+
+    A hit authenticates without touching the database; a miss falls back to the usual
+    token/user query and stores the result for ``TOKEN_CACHE_TIMEOUT`` seconds. Signals in
+    ``apps.users.signals`` drop the snapshot when the token is deleted (logout) or the user
+    is saved (deactivation, password or profile changes). Queryset ``update()`` calls send no
+    signals, so the timeout bounds how long such changes go unnoticed.
+
+    An invalidation can land between a miss's database read and its ``set_many``, after
+    the signal found nothing to delete. The user is unknown before that read, so a miss
+    compares the global ``VERSION_KEY`` from before the read with its value after storing.
+    If they differ, it deletes the snapshot it just stored.
+    """
+
+    @property
+    def timeout(self) -> int:
+        return getattr(settings, "TOKEN_CACHE_TIMEOUT", 300)
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        snapshot = cache.get(cache_key)
+        if snapshot is None:
+            version = cache.get(VERSION_KEY)
+            user, token = super().authenticate_credentials(key)
+            cache.set_many({cache_key: self.snapshot(token), user_cache_key(user.pk): cache_key}, self.timeout)
+            if cache.get(VERSION_KEY) != version:
+                cache.delete(cache_key)
+            return user, token
+
+        user, token = self.restore(key, snapshot)
+        if not user.is_active:
+            raise AuthenticationFailed(_("User inactive or deleted."))
+        return user, token
+
+    @staticmethod
+    def snapshot(token) -> dict:
+        return {
+            "created": token.created,
+            "user": {name: getattr(token.user, name) for name in SNAPSHOT_FIELDS},
+        }
+
+    @staticmethod
+    def restore(key, snapshot):
+        fields = snapshot["user"]
+        # from_db marks both as loaded rows, and anything missing (password) as deferred
+        user = User.from_db(DEFAULT_DB_ALIAS, list(fields), list(fields.values()))
+        token = Token.from_db(DEFAULT_DB_ALIAS, ["key", "user_id", "created"], [key, user.pk, snapshot["created"]])
+        user.auth_token = token
+        return user, token
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.users.services import EmailOutboxService
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails from the outbox in batches over one mail connection per batch"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Emails claimed and sent per connection")
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of exiting when the outbox is empty")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls with --loop")
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = EmailOutboxService.send_pending(batch_size=options["batch_size"])
+            if sent or failed or not options["loop"]:
+                self.stdout.write(f"Sent {sent} emails, {failed} failed and rescheduled")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
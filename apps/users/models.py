@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -9,6 +10,7 @@ class User(AbstractUser):
     bio = models.TextField(max_length=500, blank=True)
     date_of_birth = models.DateField(null=True, blank=True)
     avatar = models.ImageField(upload_to="avatars/", null=True, blank=True)
+    avatar_variants = models.JSONField(default=dict, blank=True, editable=False)
     is_verified = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -29,3 +31,39 @@ class User(AbstractUser):
 
     def get_short_name(self):
         return self.first_name
+
+
+class EmailOutbox(models.Model):
+    """An email waiting for ``send_outbox``; written in the same transaction as the change that triggers it."""
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sending", "Sending"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    # Set while a worker holds the row; a worker that dies releases it when the lease ends
+    claimed_by = models.UUIDField(null=True, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "users_email_outbox"
+        verbose_name_plural = "Email outbox"
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="users_outbox_due_idx"),
+            models.Index(fields=["claimed_by"], name="users_outbox_claim_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.to)} ({self.status})"
@@ -1,6 +1,8 @@
 from django.contrib.auth import authenticate
 from rest_framework import serializers
 
+from apps.core.serializers import ImageVariantsField
+
 from .models import User
 
 
@@ -45,6 +47,7 @@ class UserLoginSerializer(serializers.Serializer):
 
 class UserProfileSerializer(serializers.ModelSerializer):
     full_name = serializers.ReadOnlyField()
+    avatar_variants = ImageVariantsField()
 
     class Meta:
         model = User
@@ -58,6 +61,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
             "bio",
             "date_of_birth",
             "avatar",
+            "avatar_variants",
             "is_verified",
             "created_at",
             "updated_at",
@@ -67,7 +71,8 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
 class UserListSerializer(serializers.ModelSerializer):
     full_name = serializers.ReadOnlyField()
+    avatar_variants = ImageVariantsField()
 
     class Meta:
         model = User
-        fields = ("id", "username", "full_name", "avatar", "is_verified")
+        fields = ("id", "username", "full_name", "avatar", "avatar_variants", "is_verified")
@@ -1,20 +1,29 @@
-from typing import Optional
+import random
+import uuid
+from datetime import timedelta
+from typing import List, Optional, Tuple
 
 from django.conf import settings
 from django.contrib.auth import login, logout
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
 
-from .models import User
+from apps.core.db import use_primary
+
+from .models import EmailOutbox, User
 
 
 class UserAuthService:
     @staticmethod
+    @transaction.atomic
     def register_user(email: str, username: str, first_name: str, last_name: str, password: str) -> User:
         user = User.objects.create_user(
             email=email, username=username, first_name=first_name, last_name=last_name, password=password
         )
 
-        # Send welcome email (implement as needed)
+        # Queued with the user: no SMTP round trip in the request, and no email for a rolled-back signup
         UserEmailService.send_welcome_email(user)
 
         return user
@@ -49,34 +58,150 @@ class UserProfileService:
 
 
 class UserEmailService:
+    """Account emails. They are queued in the outbox and delivered by ``send_outbox``, never inline."""
+
     @staticmethod
-    def send_welcome_email(user: User) -> bool:
-        try:
-            send_mail(
-                subject="Welcome to Our Platform!",
-                message=f"Hello {user.first_name}, welcome to our platform!",
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                fail_silently=False,
+    def send_welcome_email(user: User) -> EmailOutbox:
+        return EmailOutboxService.enqueue(
+            subject="Welcome to Our Platform!",
+            body=f"Hello {user.first_name}, welcome to our platform!",
+            to=[user.email],
+        )
+
+    @staticmethod
+    def send_password_reset_email(user: User, reset_token: str) -> EmailOutbox:
+        reset_url = f"{settings.FRONTEND_URL}/reset-password/{reset_token}"
+        return EmailOutboxService.enqueue(
+            subject="Password Reset Request",
+            body=f"Click here to reset your password: {reset_url}",
+            to=[user.email],
+        )
+
+
+class EmailOutboxService:
+    """Transactional outbox: rows are claimed in batches, sent over one connection and retried with backoff."""
+
+    MAX_ATTEMPTS = 6
+    RETRY_DELAY = 60  # seconds before the first retry; doubles on each attempt
+    MAX_RETRY_DELAY = 6 * 3600
+    LEASE = 300  # seconds a claim lasts before another worker may take the rows over
+
+    @staticmethod
+    def enqueue(subject: str, body: str, to: List[str], from_email: Optional[str] = None) -> EmailOutbox:
+        return EmailOutbox.objects.create(
+            subject=subject, body=body, to=list(to), from_email=from_email or settings.DEFAULT_FROM_EMAIL
+        )
+
+    @staticmethod
+    def due(now):
+        # Pending rows whose time has come, plus rows a dead worker left half-sent with attempts to spare
+        return EmailOutbox.objects.filter(
+            Q(status="pending", next_attempt_at__lte=now)
+            | Q(status="sending", locked_until__lt=now, attempts__lt=EmailOutboxService.MAX_ATTEMPTS)
+        )
+
+    @staticmethod
+    def fail_abandoned(now) -> int:
+        """Give up on rows whose last allowed attempt died with its worker, e.g. a message that crashes it."""
+        return EmailOutbox.objects.filter(
+            status="sending", locked_until__lt=now, attempts__gte=EmailOutboxService.MAX_ATTEMPTS
+        ).update(status="failed", claimed_by=None, locked_until=None, last_error="Lease expired on the last attempt")
+
+    @staticmethod
+    @use_primary()
+    def claim(batch_size: int) -> List[EmailOutbox]:
+        """Take up to ``batch_size`` due rows for this worker.
+
+        Where the database supports it, ``SELECT ... FOR UPDATE SKIP LOCKED`` lets concurrent
+        workers pick disjoint rows without waiting. Everywhere else (SQLite) the conditional
+        ``UPDATE`` is the guard: it only claims rows that are still due, so a row picked by two
+        workers is claimed by whichever writes first.
+
+        Claiming counts as an attempt, so a message whose worker keeps dying before
+        ``deliver`` reports back still runs out of attempts.
+        """
+        now = timezone.now()
+        token = uuid.uuid4()
+        EmailOutboxService.fail_abandoned(now)
+        due = EmailOutboxService.due(now)
+        with transaction.atomic():
+            candidates = due.order_by("next_attempt_at", "id")
+            if connection.features.has_select_for_update_skip_locked:
+                candidates = candidates.select_for_update(skip_locked=True)
+            ids = list(candidates.values_list("id", flat=True)[:batch_size])
+            if not ids:
+                return []
+            due.filter(id__in=ids).update(
+                status="sending",
+                attempts=F("attempts") + 1,
+                claimed_by=token,
+                locked_until=now + timedelta(seconds=EmailOutboxService.LEASE),
             )
-            return True
-        except Exception as e:
-            # Log the error in production
-            print(f"Failed to send welcome email: {e}")
-            return False
+        return list(EmailOutbox.objects.filter(claimed_by=token).order_by("id"))
 
     @staticmethod
-    def send_password_reset_email(user: User, reset_token: str) -> bool:
+    def deliver(rows: List[EmailOutbox]) -> Tuple[int, int]:
+        """Send claimed rows over a single backend connection; returns ``(sent, failed)``."""
+        if not rows:
+            return 0, 0
+        sent, failed = [], []
+        backend = get_connection(fail_silently=False)
         try:
-            reset_url = f"{settings.FRONTEND_URL}/reset-password/{reset_token}"
-            send_mail(
-                subject="Password Reset Request",
-                message=f"Click here to reset your password: {reset_url}",
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                fail_silently=False,
+            backend.open()
+        except Exception as error:
+            failed = [(row, error) for row in rows]
+        else:
+            try:
+                for row in rows:
+                    message = EmailMessage(row.subject, row.body, row.from_email, row.to, connection=backend)
+                    # One message per call so a rejected recipient doesn't fail the rest of the batch
+                    try:
+                        backend.send_messages([message])
+                        sent.append(row)
+                    except Exception as error:
+                        failed.append((row, error))
+            finally:
+                backend.close()
+
+        now = timezone.now()
+        if sent:
+            EmailOutbox.objects.filter(id__in=[row.id for row in sent]).update(
+                status="sent", sent_at=now, claimed_by=None, locked_until=None, last_error=""
             )
-            return True
-        except Exception as e:
-            print(f"Failed to send password reset email: {e}")
-            return False
+        for row, error in failed:
+            EmailOutboxService.schedule_retry(row, error, now)
+        if failed:
+            EmailOutbox.objects.bulk_update(
+                [row for row, _ in failed],
+                ["status", "next_attempt_at", "claimed_by", "locked_until", "last_error"],
+            )
+        return len(sent), len(failed)
+
+    @staticmethod
+    def schedule_retry(row: EmailOutbox, error: Exception, now) -> None:
+        # ``claim`` already counted this attempt
+        row.last_error = f"{type(error).__name__}: {error}"[:1000]
+        row.claimed_by = row.locked_until = None
+        if row.attempts >= EmailOutboxService.MAX_ATTEMPTS:
+            row.status = "failed"
+            return
+        delay = min(EmailOutboxService.RETRY_DELAY * 2 ** (row.attempts - 1), EmailOutboxService.MAX_RETRY_DELAY)
+        # Jitter keeps retries of a batch that failed together from arriving together
+        row.status = "pending"
+        row.next_attempt_at = now + timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+    @staticmethod
+    @use_primary()
+    def send_pending(batch_size: int = 100, max_batches: Optional[int] = None) -> Tuple[int, int]:
+        """Deliver batches until nothing is due (or ``max_batches`` ran); returns total ``(sent, failed)``."""
+        totals = [0, 0]
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            rows = EmailOutboxService.claim(batch_size)
+            if not rows:
+                break
+            sent, failed = EmailOutboxService.deliver(rows)
+            totals[0] += sent
+            totals[1] += failed
+            batches += 1
+        return totals[0], totals[1]
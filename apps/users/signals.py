@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from apps.core.images import mark_stale
+
+from .authentication import invalidate_token, invalidate_user
+from .models import User
+
+
+@receiver(pre_save, sender=User)
+def mark_avatar_variants_stale(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw:
+        mark_stale(instance, "avatar", "avatar_variants", update_fields)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Deactivation, password and profile changes all go through save()
+    invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
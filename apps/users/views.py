@@ -4,6 +4,10 @@ from rest_framework.authtoken.models import Token
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 
+from apps.core.pagination import CachedCountPagination
+from apps.core.query_budget import query_budget
+from apps.core.throttling import LoginAccountRateThrottle, LoginRateThrottle, RegisterRateThrottle
+
 from .models import User
 from .serializers import UserListSerializer, UserLoginSerializer, UserProfileSerializer, UserRegistrationSerializer
 from .services import UserAuthService, UserProfileService
@@ -12,6 +16,8 @@ from .services import UserAuthService, UserProfileService
 class UserRegistrationView(generics.CreateAPIView):
     serializer_class = UserRegistrationSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [RegisterRateThrottle]
+    query_budget = 10
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -30,6 +36,8 @@ class UserRegistrationView(generics.CreateAPIView):
 class UserLoginView(generics.GenericAPIView):
     serializer_class = UserLoginSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [LoginRateThrottle, LoginAccountRateThrottle]
+    query_budget = 13
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -43,6 +51,7 @@ class UserLoginView(generics.GenericAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@query_budget(2)
 @api_view(["POST"])
 @permission_classes([permissions.IsAuthenticated])
 def logout_view(request):
@@ -58,6 +67,7 @@ def logout_view(request):
 class UserProfileView(generics.RetrieveUpdateAPIView):
     serializer_class = UserProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 2
 
     def get_object(self):
         return self.request.user
@@ -73,6 +83,7 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@query_budget(2)
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
 def user_stats_view(request):
@@ -81,6 +92,8 @@ def user_stats_view(request):
 
 
 class UserListView(generics.ListAPIView):
-    queryset = User.objects.filter(is_active=True)
+    queryset = User.objects.filter(is_active=True).order_by("id")
     serializer_class = UserListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CachedCountPagination
+    query_budget = 3
@@ -33,6 +33,7 @@ THIRD_PARTY_APPS = [
 ]
 
 LOCAL_APPS = [
+    "apps.core",
     "apps.users",
     "apps.blog",
 ]
@@ -40,8 +41,10 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    "apps.core.middleware.RequestMetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "apps.core.middleware.ReplicaPinningMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -74,6 +77,24 @@ ASGI_APPLICATION = "config.asgi.application"
 # Database
 DATABASES = {"default": env.db(default="sqlite:///db.sqlite3")}
 
+# Read replicas: REPLICA_DATABASE_URLS=url1,url2 adds aliases replica_1, replica_2… that safe
+# reads are balanced across. Settings modules that replace DATABASES add them back with
+# replica_databases(). Clients that just wrote read from the primary for REPLICA_PIN_SECONDS.
+REPLICA_DATABASE_URLS = env.list("REPLICA_DATABASE_URLS", default=[])
+
+
+def replica_databases(urls):
+    # Replicas mirror default under the test runner, so tests see a single database
+    return {
+        f"replica_{index}": {**env.db_url_config(url), "TEST": {"MIRROR": "default"}}
+        for index, url in enumerate(urls, start=1)
+    }
+
+
+DATABASES.update(replica_databases(REPLICA_DATABASE_URLS))
+DATABASE_ROUTERS = ["apps.core.db.PrimaryReplicaRouter"]
+REPLICA_PIN_SECONDS = env.int("REPLICA_PIN_SECONDS", default=5)
+
 # Custom User Model
 AUTH_USER_MODEL = "users.User"
 
@@ -117,7 +138,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
+        "apps.users.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -127,8 +148,42 @@ REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": [
         "rest_framework.renderers.JSONRenderer",
     ],
+    # Scopes of the sliding-window throttles in apps.core.throttling, applied per view
+    "DEFAULT_THROTTLE_RATES": {
+        "login": env("THROTTLE_LOGIN", default="10/min"),
+        "login_account": env("THROTTLE_LOGIN_ACCOUNT", default="5/min"),
+        "register": env("THROTTLE_REGISTER", default="5/hour"),
+        "search": env("THROTTLE_SEARCH", default="30/min"),
+        "comments": env("THROTTLE_COMMENTS", default="10/min"),
+    },
 }
 
+# Blog search backend (dotted path). Unset picks PostgreSQL full-text search on
+# PostgreSQL and the portable inverted index everywhere else.
+BLOG_SEARCH_BACKEND = env("BLOG_SEARCH_BACKEND", default=None)
+
+# Anonymous GET responses of the blog list endpoints are cached until a model they
+# render changes (generation numbers bumped by signals); the timeout is a safety net.
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", default=300)
+
+# Post views are buffered in this cache and written by the flush_post_views process, so it
+# should be shared by all processes (Redis, Memcached, database). The flusher refuses a
+# per-process cache (LocMemCache, DummyCache); each web process then writes its own views
+# every PostViewCounter.local_flush_interval seconds instead, one UPDATE per flush.
+BLOG_VIEW_COUNTER_CACHE = env("BLOG_VIEW_COUNTER_CACHE", default="default")
+
+# Share of requests whose queries and timings are measured and reported in a Server-Timing
+# header and a log line (apps.core.instrumentation); 0 disables it.
+REQUEST_METRICS_SAMPLE_RATE = env.float("REQUEST_METRICS_SAMPLE_RATE", default=0.0)
+
+# Token authentication caches a token -> user snapshot for this long (invalidated by signals
+# on logout, deactivation and password changes)
+TOKEN_CACHE_TIMEOUT = env.int("TOKEN_CACHE_TIMEOUT", default=300)
+
+# Views on the trending feed lose half their weight every this many hours
+BLOG_TRENDING_HALF_LIFE_HOURS = env.float("BLOG_TRENDING_HALF_LIFE_HOURS", default=24)
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = env.list("CORS_ALLOWED_ORIGINS", default=[])
 
@@ -13,7 +13,7 @@ DEBUG = True
 ALLOWED_HOSTS = ["localhost", "127.0.0.1", "0.0.0.0"]
 
 # Database for development
-DATABASES = {"default": env.db(default="sqlite:///db.sqlite3")}
+DATABASES = {"default": env.db(default="sqlite:///db.sqlite3"), **replica_databases(REPLICA_DATABASE_URLS)}
 
 # CORS settings for development
 CORS_ALLOW_ALL_ORIGINS = True
@@ -38,6 +38,9 @@ if DEBUG:
     except ImportError:
         pass
 
+# Measure every request in development
+REQUEST_METRICS_SAMPLE_RATE = env.float("REQUEST_METRICS_SAMPLE_RATE", default=1.0)
+
 # Email backend for development
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
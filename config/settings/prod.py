@@ -15,7 +15,7 @@ SESSION_COOKIE_SECURE = True
 CSRF_COOKIE_SECURE = True
 
 # Database configuration for production
-DATABASES = {"default": env.db()}
+DATABASES = {"default": env.db(), **replica_databases(REPLICA_DATABASE_URLS)}
 
 # Static files configuration for production
 STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncClient
+from django.urls import reverse
+from django.utils import timezone
+from apps.blog.models import Comment, Post
+from apps.blog.services import BlogAnalyticsService
+from apps.blog.counters import post_view_counter
+
+
+@pytest.fixture
+def published(post, user, category, tag):
+    post.tags.add(tag)
+    Comment.objects.create(post=post, author=user, content='Nice')
+    other = Post.objects.create(
+        title='Other Post', content='More content', author=user, category=category,
+        status='published', is_featured=True, published_at=timezone.now()
+    )
+    other.tags.add(tag)
+    return [post, other]
+
+
+def without_views(payload):
+    payload = dict(payload)
+    payload.pop('views_count', None)
+    for key in ('results', 'related_posts'):
+        if key in payload:
+            payload[key] = [without_views(item) for item in payload[key]]
+    return payload
+
+
+@pytest.mark.django_db
+class TestAsyncViews:
+    @pytest.mark.parametrize('sync_name, async_name', [
+        ('blog:post-list', 'blog:async-post-list'),
+        ('blog:popular-posts', 'blog:async-popular-posts'),
+        ('blog:recent-posts', 'blog:async-recent-posts'),
+        ('blog:category-list', 'blog:async-category-list'),
+        ('blog:tag-list', 'blog:async-tag-list'),
+    ])
+    def test_list_payloads_match_the_sync_views(self, api_client, published, sync_name, async_name):
+        expected = api_client.get(reverse(sync_name), {'page_size': 1}).json()
+        response = api_client.get(reverse(async_name), {'page_size': 1})
+
+        assert response.status_code == 200
+        payload = response.json()
+        assert payload['results'] == expected['results']
+        assert (payload['next'] is None) == (expected['next'] is None)
+
+    def test_featured_and_stats_match(self, api_client, published):
+        BlogAnalyticsService.reconcile_blog_stats()
+
+        assert api_client.get(reverse('blog:async-featured-posts')).json() == api_client.get(reverse('blog:featured-posts')).json()
+        assert api_client.get(reverse('blog:async-blog-stats')).json() == api_client.get(reverse('blog:blog-stats')).json()
+
+    def test_search_is_delegated_to_the_sync_view(self, api_client, published):
+        response = api_client.get(reverse('blog:async-post-list'), {'search': 'Other'})
+
+        assert response.status_code == 200
+        assert [item['title'] for item in response.json()['results']] == ['Other Post']
+
+    def test_detail_under_asgi(self, published):
+        post = published[0]
+        client = AsyncClient()
+
+        response = async_to_sync(client.get)(reverse('blog:async-post-detail', kwargs={'slug': post.slug}))
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['title'] == 'Test Post'
+        assert [comment['content'] for comment in data['comments']] == ['Nice']
+        assert [related['slug'] for related in data['related_posts']] == ['other-post']
+        assert post_view_counter.pending([post.id]) == {post.id: 1}
+
+        revalidated = async_to_sync(client.get)(
+            reverse('blog:async-post-detail', kwargs={'slug': post.slug}), headers={'If-None-Match': response['ETag']}
+        )
+        assert revalidated.status_code == 304
+        assert post_view_counter.pending([post.id]) == {post.id: 2}
+
+    def test_cache_is_not_called_synchronously_on_the_event_loop(self, published, monkeypatch):
+        for name in ('get', 'get_many', 'add', 'set'):
+            def blocking(*args, _method=getattr(cache, name), **kwargs):
+                try:
+                    asyncio.get_running_loop()
+                except RuntimeError:
+                    return _method(*args, **kwargs)
+                raise AssertionError('synchronous cache call on the event loop')
+            monkeypatch.setattr(cache, name, blocking)
+        post_view_counter.record(published[1].id, 3)
+        client = AsyncClient()
+
+        for name in ('blog:async-post-list', 'blog:async-featured-posts', 'blog:async-recent-posts'):
+            response = async_to_sync(client.get)(reverse(name))
+            assert response.status_code == 200
+            results = response.json()
+            results = results if isinstance(results, list) else results['results']
+            assert {item['slug']: item['views_count'] for item in results}['other-post'] == 3
+        url = reverse('blog:async-post-detail', kwargs={'slug': published[0].slug})
+        response = async_to_sync(client.get)(url)
+        assert response.json()['related_posts'][0]['views_count'] == 3
+        assert async_to_sync(client.get)(url, headers={'If-None-Match': response['ETag']}).status_code == 304
+
+    def test_detail_matches_the_sync_view(self, api_client, published):
+        slug = published[0].slug
+        expected = api_client.get(reverse('blog:post-detail', kwargs={'slug': slug}))
+        response = api_client.get(reverse('blog:async-post-detail', kwargs={'slug': slug}))
+
+        assert without_views(response.json()) == without_views(expected.json())
+        assert response['ETag'] == expected['ETag']
+
+    def test_anonymous_lists_are_cached(self, api_client, published, django_assert_num_queries):
+        url = reverse('blog:async-recent-posts')
+        first = api_client.get(url)
+
+        with django_assert_num_queries(0):
+            second = api_client.get(url)
+
+        assert (first['X-Cache'], second['X-Cache']) == ('MISS', 'HIT')
+        assert second.json() == first.json()
+
+    def test_missing_post_and_bad_cursor_return_json_404(self, api_client, published):
+        assert api_client.get(reverse('blog:async-post-detail', kwargs={'slug': 'nope'})).json() == {'detail': 'Not found.'}
+        response = api_client.get(reverse('blog:async-recent-posts'), {'cursor': 'garbage'})
+        assert response.status_code == 404
+        assert response.json() == {'detail': 'Invalid cursor'}
+
+    def test_read_only(self, api_client):
+        assert api_client.post(reverse('blog:async-post-list')).status_code == 405
@@ -0,0 +1,128 @@
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from apps.blog.models import Post
+
+
+@pytest.mark.django_db
+class TestBackfillReadingStatsCommand:
+    def test_backfills_rows_in_batches(self, user):
+        posts = [Post.objects.create(title=f'Post {i}', content='word ' * 400, author=user) for i in range(3)]
+        Post.objects.update(word_count=0, reading_time=1)
+
+        out = StringIO()
+        call_command('backfill_reading_stats', batch_size=2, stdout=out)
+
+        for post in posts:
+            post.refresh_from_db()
+            assert post.word_count == 400
+            assert post.reading_time == 2
+        assert 'Backfilled reading stats for 3 posts' in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestRebuildRelatedPostsCommand:
+    def test_rebuilds_lists_from_scratch(self, user, category):
+        from django.utils import timezone
+        from apps.blog.models import RelatedPost
+        posts = [
+            Post.objects.create(
+                title=f'Post {i}', content='Content', author=user, category=category,
+                status='published', published_at=timezone.now()
+            )
+            for i in range(3)
+        ]
+        RelatedPost.objects.all().delete()
+
+        out = StringIO()
+        call_command('rebuild_related_posts', batch_size=2, stdout=out)
+
+        assert RelatedPost.objects.filter(post=posts[0]).count() == 2
+        assert RelatedPost.objects.get(post=posts[0], related=posts[1]).score == 4
+        assert 'Rebuilt related posts for 3 posts' in out.getvalue()
+
+    def test_stale_refreshes_flagged_posts_only(self, user, category):
+        from django.utils import timezone
+        from apps.blog.models import RelatedPost
+        first = Post.objects.create(
+            title='First', content='Content', author=user, category=category,
+            status='published', published_at=timezone.now()
+        )
+        second = Post.objects.create(
+            title='Second', content='Content', author=user, category=category,
+            status='published', published_at=timezone.now()
+        )
+        assert not RelatedPost.objects.exists()
+
+        out = StringIO()
+        call_command('rebuild_related_posts', stale=True, stdout=out)
+
+        assert RelatedPost.objects.get(post=first, related=second).score == 4
+        assert not Post.objects.filter(related_stale=True).exists()
+        assert 'Refreshed related posts for 2 stale posts' in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestReconcileBlogStatsCommand:
+    def test_recomputes_snapshot(self, post):
+        from apps.blog.models import BlogStats
+        BlogStats.objects.update_or_create(pk=BlogStats.SINGLETON_ID, defaults={'total_posts': 42})
+
+        out = StringIO()
+        call_command('reconcile_blog_stats', stdout=out)
+
+        assert BlogStats.objects.get().total_posts == 1
+        assert 'total_posts=1' in out.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBenchmarkAsyncViewsCommand:
+    def test_reports_both_servers_per_concurrency(self, post):
+        out = StringIO()
+        call_command('benchmark_async_views', endpoint='detail', requests=4, concurrency=[1, 2], stdout=out)
+
+        rows = [line.split() for line in out.getvalue().splitlines()[1:]]
+        assert [(row[0], row[1]) for row in rows] == [('wsgi', '1'), ('asgi', '1'), ('wsgi', '2'), ('asgi', '2')]
+        assert all(row[-1] == '0' for row in rows)
+
+
+@pytest.mark.django_db
+class TestAuditQueriesCommand:
+    def test_explains_every_service_queryset(self, post):
+        from apps.blog.audit import audited_querysets
+        out = StringIO()
+        call_command('audit_queries', min_rows=0, plans=True, analyze=True, stdout=out)
+
+        output = out.getvalue()
+        for name, _ in audited_querysets():
+            assert f'{name}:' in output
+        assert 'Audited querysets' in output
+
+
+@pytest.mark.django_db
+class TestSeedBlogCommand:
+    def test_seeds_related_rows_with_past_timestamps(self):
+        from django.utils import timezone
+        from apps.blog.models import BlogStats, Comment, PostSearchTerm
+        from apps.users.models import User
+        out = StringIO()
+        call_command('seed_blog', users=5, posts=30, comments=60, batch_size=25, stdout=out)
+
+        assert User.objects.count() == 5
+        assert Post.objects.count() == 30
+        assert Comment.objects.count() == 60
+        assert Post.objects.filter(created_at__lt=timezone.now() - timezone.timedelta(minutes=1)).exists()
+        assert not Comment.objects.exclude(post__status='published').exists()
+        assert PostSearchTerm.objects.exists()
+        assert BlogStats.objects.get().total_comments == Comment.objects.filter(is_approved=True).count()
+        assert 'Seeded 5 users, 30 posts and 60 comments' in out.getvalue()
+
+    def test_same_seed_same_data(self):
+        call_command('seed_blog', users=3, posts=10, comments=0, skip_search_index=True, stdout=StringIO())
+        from apps.users.models import User
+        first = list(Post.objects.order_by('id').values_list('title', 'status', 'views_count'))
+        User.objects.all().delete()
+
+        call_command('seed_blog', users=3, posts=10, comments=0, skip_search_index=True, stdout=StringIO())
+
+        assert list(Post.objects.order_by('id').values_list('title', 'status', 'views_count')) == first
@@ -0,0 +1,144 @@
+import pytest
+from io import StringIO
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.urls import reverse
+from apps.blog import counters
+from apps.blog.counters import PostViewCounter, post_view_counter, views_flushed
+from apps.blog.models import Post
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    # The test cache is per-process, which is fine when flushing in the same process
+    monkeypatch.setattr(PostViewCounter, 'shared', True)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('shared_cache')
+class TestPostViewCounter:
+    def test_flush_applies_buffered_views_in_batches(self, user, post):
+        other = Post.objects.create(title='Other', content='Content', author=user, views_count=10)
+        for _ in range(3):
+            post_view_counter.record(post.id)
+        post_view_counter.record(other.id, count=2)
+
+        deltas = post_view_counter.flush(batch_size=1)
+
+        assert deltas == {post.id: 3, other.id: 2}
+        post.refresh_from_db()
+        other.refresh_from_db()
+        assert post.views_count == 3
+        assert other.views_count == 12
+        assert post_view_counter.pending([post.id, other.id]) == {post.id: 0, other.id: 0}
+        assert post_view_counter.flush() == {}
+
+    def test_views_recorded_during_flush_are_kept(self, post, monkeypatch):
+        original = counters.apply_view_deltas
+
+        def apply_and_record(deltas, batch_size=500):
+            original(deltas, batch_size)
+            post_view_counter.record(post.id)
+
+        post_view_counter.record(post.id)
+        monkeypatch.setattr(counters, 'apply_view_deltas', apply_and_record)
+        post_view_counter.flush()
+        monkeypatch.setattr(counters, 'apply_view_deltas', original)
+
+        assert post_view_counter.flush() == {post.id: 1}
+        post.refresh_from_db()
+        assert post.views_count == 2
+
+    def test_flush_waits_for_a_log_entry_being_registered(self, user, post):
+        other = Post.objects.create(title='Other', content='Content', author=user)
+        post_view_counter.record(other.id)
+        # record() for post, stopped inside _register: sequence taken, log entry not written yet
+        post_view_counter._incr(post_view_counter._pending_key(post.id))
+        seq = post_view_counter._incr(post_view_counter._seq_key)
+
+        assert post_view_counter.flush() == {other.id: 1}
+
+        post_view_counter.cache.set(post_view_counter._log_key(seq), post.id, timeout=None)
+        post_view_counter.record(post.id)
+        assert post_view_counter.flush() == {post.id: 2}
+
+    def test_log_entry_missing_for_two_flushes_is_skipped(self, user, post):
+        # A writer that died between the two steps of _register
+        post_view_counter._incr(post_view_counter._seq_key)
+        post_view_counter.record(post.id)
+
+        assert post_view_counter.flush() == {}
+        assert post_view_counter.flush() == {post.id: 1}
+
+    def test_falls_back_to_process_buffer_when_cache_fails(self, post, monkeypatch):
+        counter = PostViewCounter()
+
+        def broken(*args, **kwargs):
+            raise ConnectionError('cache down')
+
+        monkeypatch.setattr(counter.cache, 'add', broken)
+        counter.record(post.id)
+        counter.record(post.id)
+
+        assert counter.pending([post.id]) == {post.id: 2}
+        assert counter.flush_local(force=True) == {post.id: 2}
+        post.refresh_from_db()
+        assert post.views_count == 2
+
+    def test_flush_sends_signal(self, post):
+        received = []
+
+        def receiver(sender, deltas, **kwargs):
+            received.append(deltas)
+
+        views_flushed.connect(receiver)
+        try:
+            post_view_counter.record(post.id)
+            post_view_counter.flush()
+        finally:
+            views_flushed.disconnect(receiver)
+
+        assert received == [{post.id: 1}]
+
+    def test_list_reports_stored_plus_pending(self, api_client, post):
+        Post.objects.filter(id=post.id).update(views_count=5)
+        post_view_counter.record(post.id, count=2)
+
+        response = api_client.get(reverse('blog:post-list'))
+
+        assert response.data['results'][0]['views_count'] == 7
+
+    def test_flush_command(self, post):
+        post_view_counter.record(post.id)
+        out = StringIO()
+
+        call_command('flush_post_views', stdout=out)
+
+        assert 'Flushed 1 views across 1 posts' in out.getvalue()
+
+
+
+@pytest.mark.django_db
+class TestPerProcessCache:
+    def test_views_are_written_by_the_process_itself(self, post, monkeypatch):
+        counter = PostViewCounter()
+        counter.record(post.id)
+        assert counter.pending([post.id]) == {post.id: 1}
+
+        monkeypatch.setattr(PostViewCounter, 'local_flush_interval', 0)
+        counter.record(post.id)
+
+        post.refresh_from_db()
+        assert post.views_count == 2
+        assert counter.pending([post.id]) == {}
+
+    def test_flush_writes_the_process_buffer(self, post):
+        post_view_counter.record(post.id, 3)
+
+        assert post_view_counter.flush() == {post.id: 3}
+        post.refresh_from_db()
+        assert post.views_count == 3
+
+    def test_flush_command_refuses_a_per_process_cache(self, post):
+        with pytest.raises(ImproperlyConfigured, match='BLOG_VIEW_COUNTER_CACHE'):
+            call_command('flush_post_views')
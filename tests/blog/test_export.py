@@ -0,0 +1,97 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from apps.blog.export import export_posts
+from apps.blog.models import Comment, Post
+
+
+@pytest.fixture
+def staff_client(api_client, user):
+    user.is_staff = True
+    user.save()
+    api_client.force_authenticate(user=user)
+    return api_client
+
+
+@pytest.mark.django_db
+class TestExportCommand:
+    def test_ndjson_includes_every_entity_and_drafts(self, post, user, tag):
+        post.tags.add(tag)
+        Post.objects.create(title='Draft', content='Draft body', author=user)
+        Comment.objects.create(post=post, author=user, content='Hi', is_approved=False)
+
+        out = StringIO()
+        call_command('export_blog', stdout=out)
+
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        posts = [record for record in records if record['type'] == 'posts']
+        assert [record['title'] for record in posts] == ['Test Post', 'Draft']
+        assert posts[0]['tags'] == ['Python']
+        assert posts[0]['category']['slug'] == 'technology'
+        assert [record['type'] for record in records].count('comments') == 1
+        users = [record for record in records if record['type'] == 'users']
+        assert users[0]['email'] == 'test@example.com'
+        assert 'password' not in users[0]
+
+    def test_gzipped_csv_to_file(self, post, tmp_path):
+        path = tmp_path / 'posts.csv.gz'
+
+        call_command('export_blog', entity=['posts'], output_format='csv', output=str(path), gzip=True, stderr=StringIO())
+
+        rows = list(csv.DictReader(io.StringIO(gzip.decompress(path.read_bytes()).decode())))
+        assert len(rows) == 1
+        assert rows[0]['slug'] == 'test-post'
+        assert json.loads(rows[0]['author'])['username'] == 'testuser'
+
+    def test_updated_since_filters_rows(self, post, user):
+        Post.objects.filter(pk=post.pk).update(updated_at=timezone.now() - timedelta(days=3))
+        Post.objects.create(title='Fresh', content='Body', author=user)
+
+        out = StringIO()
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        call_command('export_blog', entity=['posts'], updated_since=since, stdout=out)
+
+        assert [json.loads(line)['title'] for line in out.getvalue().splitlines()] == ['Fresh']
+
+    def test_posts_are_read_in_chunks(self, user, django_assert_num_queries):
+        for i in range(5):
+            Post.objects.create(title=f'Post {i}', content='Body', author=user)
+
+        # One streamed query for the posts, plus one tags query per chunk of two
+        with django_assert_num_queries(4):
+            assert len(list(export_posts(chunk_size=2))) == 5
+
+
+@pytest.mark.django_db
+class TestExportView:
+    def test_requires_staff(self, authenticated_client):
+        response = authenticated_client.get(reverse('blog:blog-export'))
+
+        assert response.status_code == 403
+
+    def test_streams_ndjson(self, staff_client, post):
+        response = staff_client.get(reverse('blog:blog-export'), {'entity': 'posts'})
+
+        assert response.streaming
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert [json.loads(line)['slug'] for line in lines] == ['test-post']
+
+    def test_streams_gzip(self, staff_client, post):
+        response = staff_client.get(reverse('blog:blog-export'), {'entity': 'comments', 'output': 'csv', 'gzip': '1'})
+
+        assert response['Content-Disposition'] == 'attachment; filename="blog-export.csv.gz"'
+        content = gzip.decompress(b''.join(response.streaming_content)).decode()
+        assert content.splitlines()[0] == 'id,post_id,author_id,content,is_approved,created_at,updated_at'
+
+    def test_rejects_bad_parameters(self, staff_client):
+        assert staff_client.get(reverse('blog:blog-export'), {'entity': 'secrets'}).status_code == 400
+        assert staff_client.get(reverse('blog:blog-export'), {'output': 'csv'}).status_code == 400
+        assert staff_client.get(reverse('blog:blog-export'), {'updated_since': 'yesterday'}).status_code == 400
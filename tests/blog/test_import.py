@@ -0,0 +1,122 @@
+import json
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from apps.blog.importer import BlogImporter
+from apps.blog.models import BlogStats, Comment, ImportCheckpoint, Post, PostViewBucket, Tag
+from apps.blog.services import BlogRecommendationService
+
+
+def write_ndjson(path, records):
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records))
+    return str(path)
+
+
+def post_record(user, title, **extra):
+    return {'type': 'posts', 'title': title, 'author': {'id': user.id, 'username': user.username}, **extra}
+
+
+@pytest.mark.django_db
+class TestImportCommand:
+    def test_round_trips_an_export(self, post, user, tag, tmp_path):
+        post.tags.add(tag)
+        Comment.objects.create(post=post, author=user, content='Nice')
+        created_at = Post.objects.values_list('created_at', flat=True).get(pk=post.pk)
+        dump = tmp_path / 'dump.ndjson'
+        call_command('export_blog', entity=['posts', 'comments'], output=str(dump), stderr=StringIO())
+        Post.objects.all().delete()
+
+        call_command('import_blog', str(dump), stdout=StringIO())
+
+        imported = Post.objects.get(pk=post.pk)
+        assert imported.slug == 'test-post'
+        # DjangoJSONEncoder writes timestamps at millisecond precision
+        assert imported.created_at == created_at.replace(microsecond=created_at.microsecond // 1000 * 1000)
+        assert list(imported.tags.values_list('name', flat=True)) == ['Python']
+        assert imported.comments.get().content == 'Nice'
+        assert BlogStats.objects.get().total_comments == 1
+
+    def test_allocates_unique_slugs(self, post, user, tmp_path):
+        path = write_ndjson(tmp_path / 'posts.ndjson', [post_record(user, 'Test Post'), post_record(user, 'Test Post')])
+
+        BlogImporter().run(path)
+
+        assert set(Post.objects.values_list('slug', flat=True)) == {'test-post', 'test-post-2', 'test-post-3'}
+
+    def test_creates_missing_categories_and_tags_once(self, user, tmp_path):
+        records = [
+            post_record(user, f'Post {i}', category={'name': 'Science', 'slug': 'science'}, tags=['Django', 'New'])
+            for i in range(3)
+        ]
+        path = write_ndjson(tmp_path / 'posts.ndjson', records)
+
+        counts = BlogImporter(batch_size=2).run(path)
+
+        assert counts == {'posts': 3, 'comments': 0, 'skipped': 0}
+        assert Tag.objects.count() == 2
+        assert set(Post.objects.values_list('category__slug', flat=True)) == {'science'}
+        assert Post.tags.through.objects.count() == 6
+
+    def test_skips_unknown_authors_and_posts(self, user, tmp_path):
+        records = [
+            post_record(user, 'Kept'),
+            {'type': 'posts', 'title': 'Orphan', 'author': {'id': 999, 'username': 'ghost'}},
+            {'type': 'comments', 'post_id': 999, 'author_id': user.id, 'content': 'Lost'},
+            {'type': 'users', 'id': user.id},
+        ]
+        path = write_ndjson(tmp_path / 'mixed.ndjson', records)
+
+        counts = BlogImporter().run(path)
+
+        assert counts == {'posts': 1, 'comments': 0, 'skipped': 3}
+
+    def test_queues_related_posts_and_rescores_trending(self, post, user, tmp_path):
+        path = write_ndjson(tmp_path / 'posts.ndjson', [
+            post_record(user, 'Imported', status='published', published_at='2024-01-01T00:00:00Z'),
+            post_record(user, 'Draft'),
+        ])
+        # Only the imported posts are queued and rescored
+        Post.objects.filter(pk=post.pk).update(related_stale=False, trending_score=5)
+
+        BlogImporter().run(path)
+
+        imported = Post.objects.get(title='Imported')
+        assert list(Post.objects.filter(related_stale=True)) == [imported]
+        assert BlogRecommendationService.refresh_stale() == 1
+        assert [related.id for related in BlogRecommendationService.get_stored_related_posts(post)] == [imported.id]
+        assert [related.id for related in BlogRecommendationService.get_stored_related_posts(imported)] == [post.id]
+        assert Post.objects.get(pk=post.pk).trending_score == 5
+        assert not PostViewBucket.objects.exists() and imported.trending_score == 0
+
+    def test_finish_runs_again_after_a_crash(self, user, tmp_path, monkeypatch):
+        path = write_ndjson(tmp_path / 'posts.ndjson', [post_record(user, 'Imported', status='published')])
+
+        def killed(self):
+            raise RuntimeError('killed')
+
+        monkeypatch.setattr(BlogImporter, 'finish', killed)
+        with pytest.raises(RuntimeError):
+            BlogImporter().run(path)
+        assert not ImportCheckpoint.objects.get(source=path).completed
+        monkeypatch.undo()
+
+        assert BlogImporter().run(path)['posts'] == 0
+
+        assert ImportCheckpoint.objects.get(source=path).completed
+        assert BlogStats.objects.get().total_posts == 1
+
+    def test_resumes_from_checkpoint(self, user, tmp_path):
+        path = write_ndjson(tmp_path / 'posts.ndjson', [post_record(user, f'Post {i}') for i in range(4)])
+        first_two = len(''.join(json.dumps(post_record(user, f'Post {i}')) + '\n' for i in range(2)))
+        ImportCheckpoint.objects.create(source=path, position=first_two, rows=2)
+
+        counts = BlogImporter(batch_size=1).run(path)
+
+        assert counts['posts'] == 2
+        assert list(Post.objects.order_by('title').values_list('title', flat=True)) == ['Post 2', 'Post 3']
+        checkpoint = ImportCheckpoint.objects.get(source=path)
+        assert checkpoint.completed
+        assert checkpoint.rows == 4
+
+        assert BlogImporter().run(path)['posts'] == 0
+        assert BlogImporter().run(path, restart=True)['posts'] == 4
@@ -94,6 +94,26 @@ class TestPostModel:
         assert len(post.excerpt) == 500
         assert post.excerpt.endswith('...')
 
+    def test_reading_stats_computed_on_save(self, user):
+        post = Post.objects.create(
+            title='Long Read',
+            content='word ' * 450,
+            author=user
+        )
+
+        assert post.word_count == 450
+        assert post.reading_time == 2
+
+    def test_reading_stats_follow_content_update_fields(self, user):
+        post = Post.objects.create(title='Short', content='one two', author=user)
+
+        post.content = 'word ' * 1000
+        post.save(update_fields=['content'])
+        post.refresh_from_db()
+
+        assert post.word_count == 1000
+        assert post.reading_time == 5
+
     def test_increment_views(self, user):
         post = Post.objects.create(
             title='Test Post',
@@ -0,0 +1,141 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from apps.blog.models import Comment, Post, Tag
+from apps.blog.services import BlogAnalyticsService
+from apps.core.query_budget import assert_query_budget
+
+User = get_user_model()
+
+
+@pytest.fixture
+def blog_corpus(user, category):
+    # Start from an empty snapshot so signal deltas keep it current, as in production
+    BlogAnalyticsService.reconcile_blog_stats()
+    commenters = [
+        User.objects.create_user(email=f'reader{i}@example.com', username=f'reader{i}', password='testpass123')
+        for i in range(3)
+    ]
+    tags = [Tag.objects.create(name=f'Tag {i}') for i in range(3)]
+    posts = []
+    for i in range(6):
+        post = Post.objects.create(
+            title=f'Budget Post {i}',
+            content='word ' * 300,
+            author=user,
+            category=category,
+            status='published',
+            is_featured=True,
+            published_at=timezone.now()
+        )
+        post.tags.add(*tags)
+        for commenter in commenters:
+            Comment.objects.create(post=post, author=commenter, content='Nice post')
+        posts.append(post)
+    return posts
+
+
+@pytest.mark.django_db
+class TestBlogQueryBudgets:
+    @pytest.mark.parametrize('url_name', [
+        'blog:post-list',
+        'blog:featured-posts',
+        'blog:popular-posts',
+        'blog:trending-posts',
+        'blog:recent-posts',
+        'blog:blog-stats',
+        'blog:my-posts',
+        'blog:category-list',
+        'blog:tag-list',
+        'blog:async-post-list',
+        'blog:async-featured-posts',
+        'blog:async-popular-posts',
+        'blog:async-trending-posts',
+        'blog:async-recent-posts',
+        'blog:async-blog-stats',
+        'blog:async-category-list',
+        'blog:async-tag-list',
+    ])
+    def test_list_endpoints_within_budget(self, token_client, blog_corpus, url_name):
+        url = reverse(url_name)
+
+        with assert_query_budget(url):
+            response = token_client.get(url)
+
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize('url_name', ['blog:post-detail', 'blog:async-post-detail'])
+    def test_post_detail_within_budget(self, token_client, blog_corpus, url_name):
+        url = reverse(url_name, kwargs={'slug': blog_corpus[0].slug})
+
+        with assert_query_budget(url):
+            response = token_client.get(url)
+
+        assert response.status_code == 200
+        assert len(response.json()['comments']) == 3
+
+    def test_post_create_and_update_within_budget(self, token_client, category, django_assert_num_queries):
+        # Exact counts, so a regression shows up before it eats the budgets' headroom
+        url = reverse('blog:post-create')
+        with assert_query_budget(url), django_assert_num_queries(20):
+            response = token_client.post(
+                url, {'title': 'Budget', 'content': 'Content', 'tags': ['a', 'b'], 'status': 'published'}, format='json'
+            )
+        assert response.status_code == 201
+
+        url = reverse('blog:post-update', kwargs={'slug': 'budget'})
+        with assert_query_budget(url), django_assert_num_queries(21):
+            response = token_client.patch(url, {'title': 'Budget 2', 'tags': ['a', 'c']}, format='json')
+        assert response.status_code == 200
+
+        url = reverse('blog:post-delete', kwargs={'slug': 'budget'})
+        with assert_query_budget(url):
+            response = token_client.delete(url)
+        assert response.status_code == 204
+
+    def test_comment_list_within_budget(self, token_client, blog_corpus):
+        url = reverse('blog:comment-list', kwargs={'post_slug': blog_corpus[0].slug})
+
+        with assert_query_budget(url):
+            response = token_client.get(url)
+
+        assert response.status_code == 200
+        assert len(response.data['results']) == 3
+
+    def test_comment_create_within_budget(self, token_client, post):
+        url = reverse('blog:comment-list', kwargs={'post_slug': post.slug})
+
+        with assert_query_budget(url):
+            response = token_client.post(url, {'content': 'Budgeted comment'})
+
+        assert response.status_code == 201
+
+
+@pytest.mark.django_db
+class TestAnnotatedCounts:
+    def test_post_list_comments_count_excludes_unapproved(self, api_client, post, user):
+        Comment.objects.create(post=post, author=user, content='Approved')
+        Comment.objects.create(post=post, author=user, content='Pending', is_approved=False)
+
+        response = api_client.get(reverse('blog:post-list'))
+
+        assert response.data['results'][0]['comments_count'] == 1
+
+    def test_comments_count_not_multiplied_by_tag_filter(self, api_client, post, user, tag):
+        post.tags.add(tag, Tag.objects.create(name='Django'))
+        Comment.objects.create(post=post, author=user, content='Approved')
+
+        response = api_client.get(reverse('blog:post-list'), {'tag': tag.slug})
+
+        assert response.data['results'][0]['comments_count'] == 1
+
+    def test_category_and_tag_posts_count(self, api_client, post, category, tag, user):
+        post.tags.add(tag)
+        Post.objects.create(title='Draft', content='Draft', author=user, category=category, status='draft')
+
+        categories = api_client.get(reverse('blog:category-list')).data['results']
+        tags = api_client.get(reverse('blog:tag-list')).data['results']
+
+        assert categories[0]['posts_count'] == 1
+        assert tags[0]['posts_count'] == 1
@@ -0,0 +1,95 @@
+import pytest
+from django.utils import timezone
+from apps.blog.models import Post, PostSearchTerm
+from apps.blog.search import BaseSearchBackend, InvertedIndexSearchBackend, parse_query, tokenize
+from apps.blog.services import BlogPostService
+
+
+def make_post(user, title, content, **kwargs):
+    kwargs.setdefault('status', 'published')
+    kwargs.setdefault('published_at', timezone.now())
+    return Post.objects.create(title=title, content=content, author=user, **kwargs)
+
+
+class TestQueryParsing:
+    def test_tokenize_lowercases_and_drops_stop_words(self):
+        assert tokenize('The Django ORM and Python') == ['django', 'orm', 'python']
+
+    def test_last_term_is_prefix(self):
+        assert parse_query('django orm') == (['django'], 'orm')
+
+    def test_trailing_space_disables_prefix(self):
+        assert parse_query('django orm ') == (['django', 'orm'], None)
+
+
+class TestBaseSearchBackend:
+    def test_backend_without_search_cannot_be_instantiated(self):
+        class IndexOnlyBackend(BaseSearchBackend):
+            pass
+
+        with pytest.raises(TypeError, match='search'):
+            IndexOnlyBackend()
+
+
+@pytest.mark.django_db
+class TestInvertedIndexSearchBackend:
+    def test_title_matches_rank_above_body_matches(self, user):
+        body_match = make_post(user, 'Weekly notes', 'We talked about django a lot.')
+        title_match = make_post(user, 'Django tips', 'Assorted advice.')
+
+        results = list(BlogPostService.search_posts('django '))
+
+        assert results == [title_match, body_match]
+        assert results[0].search_rank > results[1].search_rank
+
+    def test_prefix_matching(self, user):
+        post = make_post(user, 'Async views', 'Concurrency in Django.')
+
+        assert list(BlogPostService.search_posts('concurr')) == [post]
+
+    def test_all_terms_must_match(self, user):
+        make_post(user, 'Python only', 'Nothing else here.')
+        both = make_post(user, 'Python and Django', 'Both frameworks.')
+
+        assert list(BlogPostService.search_posts('python django')) == [both]
+
+    def test_respects_published_rules(self, user):
+        make_post(user, 'Draft django', 'Hidden', status='draft', published_at=None)
+        make_post(user, 'Scheduled django', 'Later', published_at=timezone.now() + timezone.timedelta(days=1))
+
+        assert list(BlogPostService.search_posts('django')) == []
+
+    def test_index_is_updated_incrementally_on_save(self, user):
+        post = make_post(user, 'Original title', 'Body text.')
+
+        post.title = 'Renamed headline'
+        post.save()
+
+        terms = set(PostSearchTerm.objects.filter(post=post).values_list('term', flat=True))
+        assert 'renamed' in terms
+        assert 'original' not in terms
+        assert list(BlogPostService.search_posts('original ')) == []
+
+    def test_index_rows_removed_with_post(self, user):
+        post = make_post(user, 'Short lived', 'Gone soon.')
+
+        post.delete()
+
+        assert not PostSearchTerm.objects.exists()
+
+    def test_rebuild(self, user):
+        post = make_post(user, 'Rebuilt post', 'Content.')
+        PostSearchTerm.objects.all().delete()
+
+        indexed = InvertedIndexSearchBackend().rebuild()
+
+        assert indexed == 1
+        assert list(BlogPostService.search_posts('rebuilt')) == [post]
+
+    def test_snippet_highlights_matches(self, user):
+        post = make_post(user, 'Snippets', 'Start ' + 'filler ' * 40 + 'the <Django> ORM ' + 'tail ' * 40)
+
+        snippet = InvertedIndexSearchBackend().snippet(post, 'django orm ')
+
+        assert '<mark>&lt;Django&gt;</mark> <mark>ORM</mark>' in snippet
+        assert snippet.startswith('… ') and snippet.endswith(' …')
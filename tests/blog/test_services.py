@@ -1,12 +1,13 @@
 import pytest
 from datetime import datetime
 from django.utils import timezone
-from apps.blog.models import Post, Category, Tag, Comment
+from apps.blog.models import BlogStats, Post, Category, Tag, Comment, RelatedPost
 from apps.blog.services import (
     BlogPostService, 
     BlogAnalyticsService, 
     BlogCommentService,
-    BlogRecommendationService
+    BlogRecommendationService,
+    BlogTagService
 )
 
 
@@ -123,6 +124,99 @@ class TestBlogAnalyticsService:
         assert stats['total_categories'] == 1
         assert stats['total_views'] == 0
 
+    def test_blog_stats_snapshot_follows_deltas(self, post, user, category, tag):
+        from apps.blog.counters import post_view_counter
+        BlogAnalyticsService.reconcile_blog_stats()
+
+        post.tags.add(tag)
+        other_category = Category.objects.create(name='Other')
+        draft = Post.objects.create(title='Draft', content='Content', author=user, category=other_category)
+        draft.tags.add(tag)
+        comment = Comment.objects.create(post=post, author=user, content='Nice')
+        Comment.objects.create(post=draft, author=user, content='Early')
+        draft.status = 'published'
+        draft.save()
+        post_view_counter.record(post.id, 3)
+        post_view_counter.flush()
+        post.refresh_from_db()
+        comment.is_approved = False
+        comment.save()
+        BlogCommentService.set_approval(Comment.objects.all(), True)
+        post.category = None
+        post.save()
+        post.tags.clear()
+        draft.delete()
+
+        assert BlogAnalyticsService.get_blog_stats() == BlogAnalyticsService.compute_blog_stats()
+        assert BlogAnalyticsService.get_blog_stats() == {
+            'total_posts': 1,
+            'total_categories': 0,
+            'total_tags': 0,
+            'total_views': 3,
+            'total_comments': 1,
+        }
+
+    def test_blog_stats_follow_deleted_categories_and_tags(self, post, user, category, tag):
+        post.tags.add(tag)
+        unused = Tag.objects.create(name='Unused')
+        BlogAnalyticsService.reconcile_blog_stats()
+
+        category.delete()
+        tag.delete()
+        unused.delete()
+
+        stats = BlogAnalyticsService.get_blog_stats()
+        assert stats == BlogAnalyticsService.compute_blog_stats()
+        assert (stats['total_categories'], stats['total_tags']) == (0, 0)
+
+    def test_blog_stats_rebuilt_when_snapshot_missing(self, post):
+        BlogStats.objects.all().delete()
+
+        stats = BlogAnalyticsService.get_blog_stats()
+
+        assert stats['total_posts'] == 1
+        assert BlogStats.objects.get().total_posts == 1
+
+
+@pytest.mark.django_db
+class TestBlogTagService:
+    def test_normalize_names_collapses_whitespace_and_duplicates(self):
+        names = BlogTagService.normalize_names(['  Django  REST ', 'django rest', 'Python', '   ', '!!'])
+
+        assert names == ['Django REST', 'Python']
+
+    def test_get_or_create_tags_reuses_existing_tags(self, tag):
+        tags = BlogTagService.get_or_create_tags(['python', 'Django'])
+
+        assert tags[0] == tag
+        assert tags[1].name == 'Django'
+        assert Tag.objects.count() == 2
+
+    def test_set_post_tags_only_touches_changed_rows(self, post, tag):
+        post.tags.add(tag)
+        through_id = Post.tags.through.objects.get(post=post, tag=tag).id
+
+        BlogTagService.set_post_tags(post, ['Python', 'Django'])
+
+        assert sorted(post.tags.values_list('name', flat=True)) == ['Django', 'Python']
+        assert Post.tags.through.objects.get(post=post, tag=tag).id == through_id
+
+        BlogTagService.set_post_tags(post, [])
+
+        assert not post.tags.exists()
+
+    def test_set_post_tags_query_count_does_not_grow_with_tags(self, post, category, user):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        other = Post.objects.create(title='Other', content='Content', author=user, category=category, status='published')
+
+        with CaptureQueriesContext(connection) as few:
+            BlogTagService.set_post_tags(other, ['one', 'two'])
+        with CaptureQueriesContext(connection) as many:
+            BlogTagService.set_post_tags(post, [f'tag {i}' for i in range(15)])
+
+        assert len(many.captured_queries) == len(few.captured_queries)
+
 
 @pytest.mark.django_db
 class TestBlogCommentService:
@@ -208,4 +302,123 @@ class TestBlogRecommendationService:
         
         related_posts = BlogRecommendationService.get_related_posts(post1)
         
-        assert post2 in related_posts
\ No newline at end of file
+        assert post2 in related_posts
+
+    def _publish(self, user, title, **kwargs):
+        return Post.objects.create(
+            title=title, content='Content', author=user, status='published', published_at=timezone.now(), **kwargs
+        )
+
+    def test_related_posts_ranked_by_stored_score(self, user, category, tag):
+        from django.contrib.auth import get_user_model
+        other = get_user_model().objects.create_user(email='other@example.com', username='other', password='pass12345')
+        post = self._publish(user, 'Post', category=category)
+        post.tags.add(tag)
+        same_author = self._publish(user, 'Same author')
+        same_category = self._publish(other, 'Same category', category=category)
+        everything = self._publish(user, 'Everything', category=category)
+        everything.tags.add(tag)
+        self._publish(other, 'Unrelated')
+        BlogRecommendationService.refresh_stale()
+
+        related_posts = list(BlogRecommendationService.get_related_posts(post))
+
+        assert related_posts == [everything, same_category, same_author]
+        assert RelatedPost.objects.get(post=post, related=everything).score == 6
+        # Scores are symmetric, so older posts pick up newer ones without a full rebuild
+        assert RelatedPost.objects.get(post=same_author, related=everything).score == 1
+
+    def test_unpublishing_removes_post_from_other_lists(self, user, category):
+        post = self._publish(user, 'Post', category=category)
+        other = self._publish(user, 'Other', category=category)
+        BlogRecommendationService.refresh_stale()
+        assert RelatedPost.objects.filter(post=post, related=other).exists()
+
+        other.status = 'draft'
+        other.save()
+
+        # Dropped from other lists within the request; its own list goes with the worker
+        assert not RelatedPost.objects.filter(related=other).exists()
+        assert Post.objects.filter(id__in=[post.id, other.id], related_stale=True).count() == 2
+        BlogRecommendationService.refresh_stale()
+        assert not RelatedPost.objects.filter(post=other).exists()
+
+    def test_removing_tag_rebuilds_lists_of_related_posts(self, user, tag):
+        from django.contrib.auth import get_user_model
+        other = get_user_model().objects.create_user(email='other@example.com', username='other', password='pass12345')
+        post = self._publish(other, 'Post')
+        post.tags.add(tag)
+        tagged = self._publish(user, 'Tagged')
+        tagged.tags.add(tag)
+        BlogRecommendationService.refresh_stale()
+        assert RelatedPost.objects.filter(post=post, related=tagged).exists()
+
+        tag.posts.remove(tagged)
+        BlogRecommendationService.refresh_stale()
+
+        assert not RelatedPost.objects.filter(post=post).exists()
+
+    def test_deleting_post_rebuilds_lists_that_referenced_it(self, user, category):
+        post = self._publish(user, 'Post', category=category)
+        other = self._publish(user, 'Other', category=category)
+        third = self._publish(user, 'Third', category=category)
+        BlogRecommendationService.refresh_stale()
+        RelatedPost.objects.filter(post=post, related=third).delete()
+
+        other.delete()
+
+        assert not RelatedPost.objects.filter(post=post).exists()
+        BlogRecommendationService.refresh_stale()
+        # The list that referenced the deleted post is refilled by the worker
+        assert list(RelatedPost.objects.filter(post=post).values_list('related', flat=True)) == [third.id]
+
+    def test_edits_only_flag_posts_within_the_request(self, user, category, django_assert_max_num_queries):
+        posts = [self._publish(user, f'Post {i}', category=category) for i in range(5)]
+        BlogRecommendationService.refresh_stale()
+        post = posts[0]
+        post.category = None
+
+        # One flag UPDATE whatever the number of lists the post is in
+        with django_assert_max_num_queries(3):
+            post.save(update_fields=['category'])
+
+        assert list(Post.objects.filter(related_stale=True)) == [post]
+        assert RelatedPost.objects.filter(related=post).count() == 4
+        assert BlogRecommendationService.refresh_stale() == 1
+        # Only the shared author is left
+        assert set(RelatedPost.objects.filter(related=post).values_list('score', flat=True)) == {1}
+
+    def test_failed_refresh_keeps_the_rest_queued(self, user, category, monkeypatch):
+        posts = [self._publish(user, f'Post {index}', category=category) for index in range(3)]
+        refresh = BlogRecommendationService.refresh_related_posts
+
+        def fail_on_second(post, created=False):
+            if post.id == posts[1].id:
+                raise RuntimeError('worker died')
+            refresh(post, created)
+
+        monkeypatch.setattr(BlogRecommendationService, 'refresh_related_posts', staticmethod(fail_on_second))
+        with pytest.raises(RuntimeError):
+            BlogRecommendationService.refresh_stale()
+
+        assert set(Post.objects.filter(related_stale=True)) == {posts[1], posts[2]}
+
+    def test_rebuild_all_only_clears_the_flags_it_handles(self, user, category):
+        self._publish(user, 'Published', category=category)
+        draft = Post.objects.create(title='Draft', content='Content', author=user, category=category)
+        Post.objects.filter(id=draft.id).update(related_stale=True)
+
+        assert BlogRecommendationService.rebuild_all(batch_size=1) == 1
+
+        # Drafts are not rebuilt: their lists are still for refresh_stale to drop
+        assert list(Post.objects.filter(related_stale=True)) == [draft]
+
+    def test_fallback_to_recent_posts_excludes_post(self, user):
+        from django.contrib.auth import get_user_model
+        other = get_user_model().objects.create_user(email='other@example.com', username='other', password='pass12345')
+        post = self._publish(user, 'Post')
+        recent = self._publish(other, 'Recent')
+
+        related_posts = list(BlogRecommendationService.get_related_posts(post))
+
+        assert related_posts == [recent]
@@ -0,0 +1,108 @@
+import pytest
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from apps.blog.counters import post_view_counter
+from apps.blog.models import Post, PostViewBucket
+from apps.blog.services import BlogAnalyticsService, BlogTrendingService
+
+
+@pytest.fixture
+def old_post(user):
+    return Post.objects.create(
+        title='Old Hit', content='Content', author=user, status='published', published_at=timezone.now() - timedelta(days=900)
+    )
+
+
+class TestTrendingScore:
+    def test_views_decay_by_half_life(self):
+        now = timezone.now()
+        score = BlogTrendingService.add_views(0, 100, now - timedelta(hours=24))
+
+        assert BlogTrendingService.decayed_views(score, now) == pytest.approx(50)
+
+    def test_scores_add_up_in_log_space(self):
+        now = timezone.now()
+        score = BlogTrendingService.add_views(0, 30, now)
+        score = BlogTrendingService.add_views(score, 10, now)
+
+        assert BlogTrendingService.decayed_views(score, now) == pytest.approx(40)
+        assert BlogTrendingService.add_views(score, 0, now) == score
+
+
+@pytest.mark.django_db
+class TestBlogTrendingService:
+    def test_flush_fills_hourly_buckets_and_scores(self, post):
+        post_view_counter.record(post.id, count=3)
+        post_view_counter.flush()
+        post_view_counter.record(post.id, count=2)
+        post_view_counter.flush()
+
+        bucket = PostViewBucket.objects.get(post=post)
+        assert bucket.views == 5
+        assert bucket.hour == BlogTrendingService.truncate_to_hour(timezone.now())
+        post.refresh_from_db()
+        assert BlogTrendingService.decayed_views(post.trending_score) == pytest.approx(5, rel=0.05)
+
+    def test_recent_views_beat_a_larger_old_total(self, post, old_post):
+        now = timezone.now()
+        BlogTrendingService.record_views({old_post.id: 1000}, moment=now - timedelta(days=30))
+        BlogTrendingService.record_views({post.id: 10}, moment=now)
+
+        assert [trending.id for trending in BlogAnalyticsService.get_trending_posts()] == [post.id, old_post.id]
+
+    def test_rebuild_matches_incremental_scores(self, post, old_post):
+        now = timezone.now()
+        BlogTrendingService.record_views({post.id: 4, old_post.id: 9}, moment=now - timedelta(hours=5))
+        BlogTrendingService.record_views({post.id: 6}, moment=now)
+        scores = dict(Post.objects.values_list('id', 'trending_score'))
+        Post.objects.update(trending_score=0)
+
+        out = StringIO()
+        call_command('rebuild_trending', stdout=out)
+
+        assert 'Rebuilt trending scores for 2 posts' in out.getvalue()
+        for post_id, score in Post.objects.values_list('id', 'trending_score'):
+            assert score == pytest.approx(scores[post_id])
+
+    def test_rebuild_can_be_limited_to_some_posts(self, post, old_post):
+        BlogTrendingService.record_views({post.id: 4, old_post.id: 9})
+        Post.objects.update(trending_score=0)
+
+        assert BlogTrendingService.rebuild_scores(post_ids=[post.id]) == 1
+
+        assert Post.objects.get(pk=post.pk).trending_score > 0
+        assert Post.objects.get(pk=old_post.pk).trending_score == 0
+
+    def test_prune_drops_old_buckets(self, post):
+        BlogTrendingService.record_views({post.id: 1}, moment=timezone.now() - timedelta(days=60))
+        BlogTrendingService.record_views({post.id: 1})
+
+        assert BlogTrendingService.prune_buckets(24 * 30) == 1
+        assert PostViewBucket.objects.count() == 1
+
+
+@pytest.mark.django_db
+class TestTrendingPostsView:
+    @pytest.mark.parametrize('url_name', ['blog:trending-posts', 'blog:async-trending-posts'])
+    def test_orders_by_trending_score(self, api_client, post, old_post, url_name):
+        old_post.views_count = 100_000
+        old_post.save()
+        BlogTrendingService.record_views({post.id: 5})
+
+        response = api_client.get(reverse(url_name))
+
+        assert [item['slug'] for item in response.json()['results']] == [post.slug, old_post.slug]
+
+    def test_flush_refreshes_cached_feed(self, api_client, post, old_post):
+        url = reverse('blog:trending-posts')
+        BlogTrendingService.record_views({post.id: 1})
+        api_client.get(url)
+
+        post_view_counter.record(old_post.id, count=50)
+        post_view_counter.flush()
+        response = api_client.get(url)
+
+        assert response.data['results'][0]['slug'] == old_post.slug
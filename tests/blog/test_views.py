@@ -1,6 +1,7 @@
 import pytest
 from django.urls import reverse
 from rest_framework import status
+from apps.blog.counters import post_view_counter
 from apps.blog.models import Post, Category
 
 
@@ -23,6 +24,14 @@ class TestPostListView:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['results']) == 1
 
+    def test_reading_time_uses_stored_value(self, api_client, post):
+        Post.objects.filter(id=post.id).update(reading_time=7)
+        url = reverse('blog:post-list')
+
+        response = api_client.get(url)
+
+        assert response.data['results'][0]['reading_time'] == 7
+
     def test_search_posts(self, api_client, post):
         url = reverse('blog:post-list')
         
@@ -31,6 +40,14 @@ class TestPostListView:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['results']) == 1
 
+    def test_search_results_include_snippet(self, api_client, post):
+        url = reverse('blog:post-list')
+
+        response = api_client.get(url, {'search': 'content'})
+
+        assert response.data['results'][0]['search_snippet'] == 'This is a test post <mark>content.</mark>'
+        assert 'search_snippet' not in api_client.get(url).data['results'][0]
+
     def test_featured_posts_only(self, api_client, user, category):
         from django.utils import timezone
         # Create a featured post
@@ -75,12 +92,113 @@ class TestPostDetailView:
         initial_views = post.views_count
         url = reverse('blog:post-detail', kwargs={'slug': post.slug})
         
-        api_client.get(url)
-        
+        response = api_client.get(url)
+
+        # Views are buffered and only reach the database when the counter is flushed
+        assert response.data['views_count'] == initial_views + 1
+        post.refresh_from_db()
+        assert post.views_count == initial_views
+        post_view_counter.flush()
         post.refresh_from_db()
         assert post.views_count == initial_views + 1
 
 
+@pytest.mark.django_db
+class TestPostComments:
+    @pytest.fixture
+    def comments(self, post, user):
+        from apps.blog.models import Comment
+        comments = [Comment.objects.create(post=post, author=user, content=f'Comment {i}') for i in range(25)]
+        Comment.objects.create(post=post, author=user, content='Hidden', is_approved=False)
+        return comments
+
+    def test_detail_embeds_first_page_of_approved_comments(self, api_client, post, comments):
+        response = api_client.get(reverse('blog:post-detail', kwargs={'slug': post.slug}))
+
+        assert [comment['content'] for comment in response.data['comments']] == [f'Comment {i}' for i in range(24, 4, -1)]
+        assert response.data['comments_count'] == 25
+        assert response.data['comments_next'].startswith('http://testserver/api/blog/posts/test-post/comments/?cursor=')
+
+    def test_comments_next_continues_after_embedded_page(self, api_client, post, comments):
+        detail = api_client.get(reverse('blog:post-detail', kwargs={'slug': post.slug}))
+
+        response = api_client.get(detail.data['comments_next'])
+
+        assert [comment['content'] for comment in response.data['results']] == [f'Comment {i}' for i in range(4, -1, -1)]
+        assert response.data['next'] is None
+
+    def test_comment_list_pages_without_per_author_queries(self, api_client, post, comments, django_assert_num_queries):
+        url = reverse('blog:comment-list', kwargs={'post_slug': post.slug})
+
+        with django_assert_num_queries(2):
+            response = api_client.get(url, {'page_size': 10})
+
+        assert len(response.data['results']) == 10
+        assert response.data['next'] is not None
+
+    def test_comment_list_unknown_post(self, api_client):
+        response = api_client.get(reverse('blog:comment-list', kwargs={'post_slug': 'missing'}))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_comment_create_name_is_kept(self, post):
+        kwargs = {'post_slug': post.slug}
+        assert reverse('blog:comment-create', kwargs=kwargs) == reverse('blog:comment-list', kwargs=kwargs)
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def test_detail_revalidation_returns_304_and_counts_view(self, api_client, post, django_assert_max_num_queries):
+        url = reverse('blog:post-detail', kwargs={'slug': post.slug})
+        etag = api_client.get(url)['ETag']
+
+        with django_assert_max_num_queries(1):
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert post_view_counter.pending([post.id]) == {post.id: 2}
+
+    def test_detail_etag_changes_with_comments(self, api_client, post, user):
+        url = reverse('blog:post-detail', kwargs={'slug': post.slug})
+        etag = api_client.get(url)['ETag']
+
+        post.comments.create(author=user, content='New comment')
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+    def test_detail_if_modified_since(self, api_client, post):
+        url = reverse('blog:post-detail', kwargs={'slug': post.slug})
+        last_modified = api_client.get(url)['Last-Modified']
+
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_list_revalidation_returns_304_until_post_changes(self, authenticated_client, post):
+        url = reverse('blog:post-list')
+        etag = authenticated_client.get(url)['ETag']
+
+        assert authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+        post.title = 'Edited'
+        post.save()
+
+        assert authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+    def test_cached_list_answers_revalidation(self, api_client, post, django_assert_num_queries):
+        url = reverse('blog:post-list')
+        etag = api_client.get(url)['ETag']
+
+        with django_assert_num_queries(0):
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['X-Cache'] == 'HIT'
+
+
 @pytest.mark.django_db
 class TestPostCreateView:
     def test_create_post_authenticated(self, authenticated_client, category):
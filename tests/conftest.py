@@ -1,4 +1,5 @@
 import os
+import time
 import django
 from django.conf import settings
 
@@ -15,6 +16,19 @@ from apps.blog.models import Category, Post, Tag
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+    from apps.blog.counters import post_view_counter
+    cache.clear()
+    # The dev cache is per-process, so views are buffered in the counter itself
+    post_view_counter._local.clear()
+    post_view_counter._local_flushed_at = time.monotonic()
+    yield
+    cache.clear()
+    post_view_counter._local.clear()
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -60,4 +74,12 @@ def post(user, category):
         category=category,
         status='published',
         published_at=timezone.now()
-    )
\ No newline at end of file
+    )
+
+
+@pytest.fixture
+def token_client(api_client, user):
+    from rest_framework.authtoken.models import Token
+    token = Token.objects.create(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return api_client
@@ -0,0 +1,40 @@
+import json
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from apps.core.benchmark import queries_from_server_timing, summarize
+
+
+class TestSummarize:
+    def test_percentiles_and_throughput(self):
+        result = summarize([index / 1000 for index in range(1, 101)], elapsed=2, errors=1)
+
+        assert result['requests'] == 100
+        assert result['rps'] == 50
+        assert (result['p50'], result['p95'], result['p99']) == (50, 95, 99)
+        assert result['errors'] == 1
+
+    def test_query_count_from_server_timing(self):
+        assert queries_from_server_timing('db;dur=1.2;desc="7 queries, 3 similar", view;dur=9.0') == 7
+        assert queries_from_server_timing(None) is None
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBenchmarkApiCommand:
+    def test_reports_every_endpoint_and_compares_to_a_baseline(self, post, user, tmp_path):
+        output = tmp_path / 'run.json'
+        call_command('benchmark_api', requests=3, warmup=1, output=str(output), stdout=StringIO())
+
+        report = json.loads(output.read_text())
+        assert set(report['endpoints']) == {'posts', 'post-detail', 'stats', 'users'}
+        assert all(result['errors'] == 0 and result['queries'] >= 1 for result in report['endpoints'].values())
+        assert report['rows']['posts'] == 1
+
+        for result in report['endpoints'].values():
+            result['p95'] = 1e-6
+        output.write_text(json.dumps(report))
+        with pytest.raises(CommandError, match='p95 regressed'):
+            call_command(
+                'benchmark_api', endpoint=['stats'], requests=3, baseline=str(output), max_regression=10, stdout=StringIO()
+            )
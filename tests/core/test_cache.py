@@ -0,0 +1,84 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from apps.blog.models import Post
+from apps.core.cache import _generation_key, bump_generation, get_generations
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    def test_anonymous_list_is_served_from_cache(self, api_client, post, django_assert_num_queries):
+        url = reverse('blog:post-list')
+
+        first = api_client.get(url)
+        with django_assert_num_queries(0):
+            second = api_client.get(url)
+
+        assert first['X-Cache'] == 'MISS'
+        assert second['X-Cache'] == 'HIT'
+        assert second.json() == first.json()
+
+    def test_query_params_are_normalized(self, api_client, post):
+        url = reverse('blog:post-list')
+
+        api_client.get(url, {'page': 1, 'category': post.category.slug})
+        response = api_client.get(f'{url}?category={post.category.slug}&page=1')
+
+        assert response['X-Cache'] == 'HIT'
+
+    def test_publishing_a_post_invalidates_lists(self, api_client, post, user):
+        url = reverse('blog:recent-posts')
+        api_client.get(url)
+
+        Post.objects.create(
+            title='Fresh', content='Content', author=user, status='published', published_at=timezone.now()
+        )
+        response = api_client.get(url)
+
+        assert response['X-Cache'] == 'MISS'
+        assert [item['title'] for item in response.json()['results']] == ['Fresh', post.title]
+
+    def test_comment_changes_invalidate_post_lists(self, api_client, post, user):
+        url = reverse('blog:featured-posts')
+        api_client.get(url)
+
+        post.comments.create(author=user, content='Hello')
+
+        assert api_client.get(url)['X-Cache'] == 'MISS'
+
+    def test_authenticated_requests_bypass_cache(self, authenticated_client, post):
+        url = reverse('blog:category-list')
+
+        authenticated_client.get(url)
+        response = authenticated_client.get(url)
+
+        assert 'X-Cache' not in response
+
+
+class TestGenerations:
+    def test_bump_increments_generation(self):
+        before, = get_generations([Post])
+
+        bump_generation(Post)
+
+        assert get_generations([Post]) == [before + 1]
+
+    def test_evicted_generation_never_goes_back(self):
+        before, = get_generations([Post])
+
+        cache.delete(_generation_key('blog.post'))
+
+        assert get_generations([Post])[0] > before
+
+    @pytest.mark.django_db(transaction=True)
+    def test_bump_repeats_after_commit(self, django_capture_on_commit_callbacks):
+        from django.db import transaction
+        before, = get_generations([Post])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                bump_generation(Post)
+                assert get_generations([Post]) == [before + 1]
+
+        assert get_generations([Post]) == [before + 2]
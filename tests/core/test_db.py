@@ -0,0 +1,150 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory
+from apps.blog.counters import PostViewCounter, post_view_counter
+from apps.blog.importer import BlogImporter
+from apps.blog.models import Post
+from apps.blog.services import BlogRecommendationService
+from apps.core.images import generate_variants
+from apps.users.services import EmailOutboxService
+from apps.core.db import PrimaryReplicaRouter, primary_pinned, use_primary
+from apps.core.middleware import ReplicaPinningMiddleware
+
+REPLICAS = ['replica_1', 'replica_2']
+
+
+@pytest.fixture(autouse=True)
+def replicas(request, settings):
+    # Tests that need database fixtures enable the replicas once those are written
+    marker = request.node.get_closest_marker('django_db')
+    settings.DATABASE_REPLICAS = [] if marker and marker.kwargs.get('transaction') else REPLICAS
+    settings.REPLICA_PIN_SECONDS = 7
+
+
+class TestPrimaryReplicaRouter:
+    def test_reads_are_spread_over_replicas(self):
+        router = PrimaryReplicaRouter()
+
+        assert {router.db_for_read(Post) for _ in range(50)} == set(REPLICAS)
+        assert router.db_for_write(Post) == 'default'
+
+    def test_pinned_reads_use_the_primary(self):
+        router = PrimaryReplicaRouter()
+
+        with use_primary():
+            with use_primary():
+                assert router.db_for_read(Post) == 'default'
+            assert router.db_for_read(Post) == 'default'
+        assert router.db_for_read(Post) in REPLICAS
+
+    def test_related_lookups_stay_on_the_instance_replica(self):
+        post = Post()
+        post._state.db = 'replica_2'
+
+        assert PrimaryReplicaRouter().db_for_read(Post, instance=post) == 'replica_2'
+
+    def test_migrations_only_run_on_the_primary(self):
+        router = PrimaryReplicaRouter()
+
+        assert router.allow_migrate('default', 'blog')
+        assert not router.allow_migrate('replica_1', 'blog')
+
+    def test_steps_aside_without_replicas(self, settings):
+        settings.DATABASE_REPLICAS = []
+
+        assert PrimaryReplicaRouter().db_for_read(Post) is None
+
+    @pytest.mark.django_db
+    def test_reads_inside_a_transaction_use_the_primary(self):
+        # The test itself runs inside a transaction on the primary
+        assert PrimaryReplicaRouter().db_for_read(Post) == 'default'
+
+
+@pytest.mark.django_db(transaction=True)
+class TestWorkersReadFromThePrimary:
+    """The replica aliases have no connection here: a read routed to one raises."""
+
+    def test_worker_code_paths(self, settings, post, user, tmp_path, monkeypatch):
+        monkeypatch.setattr(PostViewCounter, 'shared', True)
+        post_view_counter.record(post.id)
+        EmailOutboxService.enqueue('Subject', 'Body', ['user@example.com'])
+        dump = tmp_path / 'posts.ndjson'
+        dump.write_text('{"title": "Imported", "author": {"id": %d}}\n' % user.id)
+        settings.DATABASE_REPLICAS = REPLICAS
+
+        assert BlogRecommendationService.refresh_stale() == 1
+        assert BlogRecommendationService.rebuild_all() == 1
+        assert post_view_counter.flush() == {post.id: 1}
+        assert BlogImporter().run(str(dump))['posts'] == 1
+        assert EmailOutboxService.send_pending() == (1, 0)
+        assert generate_variants(Post, 'featured_image', 'featured_image_variants') == (0, 0)
+
+
+def record_pinning(seen, status=200):
+    def get_response(request):
+        seen.append(primary_pinned())
+        return HttpResponse(status=status)
+
+    return get_response
+
+
+class TestReplicaPinningMiddleware:
+    def setup_method(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def test_writes_pin_the_client_with_a_cookie(self):
+        seen = []
+        middleware = ReplicaPinningMiddleware(record_pinning(seen))
+
+        response = middleware(self.factory.post('/api/blog/posts/create/'))
+        middleware(self.factory.get('/api/blog/posts/'))
+        request = self.factory.get('/api/blog/posts/')
+        request.COOKIES['primary_pin'] = '1'
+        middleware(request)
+
+        assert seen == [True, False, True]
+        assert response.cookies['primary_pin']['max-age'] == 7
+        assert not primary_pinned()
+
+    def test_token_clients_are_pinned_through_the_cache(self):
+        seen = []
+        middleware = ReplicaPinningMiddleware(record_pinning(seen))
+
+        middleware(self.factory.post('/api/blog/posts/create/', HTTP_AUTHORIZATION='Token abc'))
+        middleware(self.factory.get('/api/blog/posts/', HTTP_AUTHORIZATION='Token abc'))
+        middleware(self.factory.get('/api/blog/posts/', HTTP_AUTHORIZATION='Token other'))
+
+        assert seen == [True, True, False]
+
+    def test_failed_writes_do_not_pin(self):
+        middleware = ReplicaPinningMiddleware(record_pinning([], status=400))
+
+        response = middleware(self.factory.post('/api/blog/posts/create/', HTTP_AUTHORIZATION='Token abc'))
+
+        assert 'primary_pin' not in response.cookies
+        assert cache.get(ReplicaPinningMiddleware.marker_key(self.factory.get('/', HTTP_AUTHORIZATION='Token abc'))) is None
+
+    def test_async_requests(self):
+        seen = []
+
+        async def get_response(request):
+            seen.append(primary_pinned())
+            return HttpResponse()
+
+        middleware = ReplicaPinningMiddleware(get_response)
+        response = async_to_sync(middleware)(self.factory.delete('/api/blog/posts/x/delete/'))
+
+        assert seen == [True]
+        assert 'primary_pin' in response.cookies
+
+    def test_inactive_without_replicas(self, settings):
+        settings.DATABASE_REPLICAS = []
+        seen = []
+
+        response = ReplicaPinningMiddleware(record_pinning(seen))(self.factory.post('/api/blog/posts/create/'))
+
+        assert seen == [False]
+        assert 'primary_pin' not in response.cookies
@@ -0,0 +1,73 @@
+import pytest
+from apps.blog.models import Comment, Post
+from apps.core.explain import PlanIssue, find_issues, suggest_index, table_rows
+
+SQLITE_PLAN = '''2 0 0 SCAN blog_posts
+5 0 0 SEARCH blog_comments USING INDEX blog_comments_post_id (post_id=?)
+9 0 0 SCAN users_user USING COVERING INDEX users_user_email
+40 0 0 USE TEMP B-TREE FOR ORDER BY'''
+
+POSTGRES_PLAN = '''Limit  (cost=1.0..2.0 rows=10 width=8)
+  ->  Sort  (cost=1.0..1.5 rows=100 width=8)
+        ->  Seq Scan on blog_posts  (cost=0.0..1.0 rows=100 width=8)
+              Filter: is_featured
+  ->  Index Scan using blog_comments_pkey on blog_comments  (cost=0.0..1.0 rows=1 width=8)'''
+
+
+class TestFindIssues:
+    def test_sqlite_scans_and_sorts(self):
+        assert find_issues(SQLITE_PLAN, 'sqlite') == [
+            PlanIssue('scan', 'blog_posts', '2 0 0 SCAN blog_posts'),
+            PlanIssue('sort', None, '40 0 0 USE TEMP B-TREE FOR ORDER BY'),
+        ]
+
+    def test_postgresql_scans_and_sorts(self):
+        issues = find_issues(POSTGRES_PLAN, 'postgresql')
+
+        assert [(issue.kind, issue.table) for issue in issues] == [('sort', None), ('scan', 'blog_posts')]
+
+    def test_unknown_vendor(self):
+        assert find_issues(SQLITE_PLAN, 'oracle') == []
+
+
+class TestSuggestIndex:
+    def test_equality_then_ordering_then_range(self):
+        queryset = Post.objects.filter(category_id=1, views_count__gte=10).order_by('-published_at', '-id')
+
+        assert suggest_index(queryset).fields == ['category', '-published_at', '-id', 'views_count']
+
+    def test_boolean_filters_become_a_partial_index(self):
+        suggestion = suggest_index(Comment.objects.filter(author_id=1, is_approved=True).order_by('-created_at'))
+
+        assert suggestion.fields == ['author', '-created_at']
+        assert str(suggestion) == "models.Index(fields=['author', '-created_at'], condition=Q(is_approved=True))"
+
+    def test_skips_indexes_that_exist(self):
+        # blog_posts_status_pub_idx and blog_comments_post_appr_idx
+        posts = Post.objects.filter(status='published', views_count__gte=10).order_by('-published_at', '-id')
+        comments = Comment.objects.filter(post_id=1, is_approved=True).order_by('-created_at')
+
+        assert suggest_index(posts) is None
+        assert suggest_index(comments) is None
+        # Same fields without the partial index's condition are not covered
+        assert suggest_index(Comment.objects.filter(post_id=1).order_by('-created_at')).fields == ['post', '-created_at']
+
+    def test_skips_joins_annotations_and_alternatives(self):
+        from django.db.models import Count, Q
+        queryset = (
+            Post.objects.filter(Q(author_id=1) | Q(category_id=1), category__slug='x')
+            .annotate(total=Count('comments'))
+            .order_by('-total')
+        )
+
+        assert suggest_index(queryset) is None
+
+
+@pytest.mark.django_db
+class TestTableRows:
+    def test_counts_known_tables_only(self, post):
+        cache = {}
+
+        assert table_rows('blog_posts', cache=cache) == 1
+        assert table_rows('subquery_alias', cache=cache) is None
+        assert cache == {'blog_posts': 1, 'subquery_alias': None}
@@ -0,0 +1,147 @@
+import io
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.urls import reverse
+from PIL import Image
+from apps.blog.models import Post
+from apps.core.images import generate_variants, render_variants
+
+
+def png(width=800, height=600, color='red', mode='RGB'):
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def with_image(post, data=None, name='cover.png'):
+    post.featured_image.save(name, ContentFile(data or png()))
+    post.refresh_from_db()
+    return post
+
+
+class TestRenderVariants:
+    def test_sizes_and_formats(self):
+        rendered = {(name, fmt): (width, height) for name, fmt, _, width, height in render_variants(png(2000, 1000))}
+
+        assert rendered[('thumbnail', 'webp')] == (160, 160)
+        assert rendered[('card', 'jpeg')] == (640, 360)
+        # Fitted, not cropped
+        assert rendered[('full', 'webp')] == (1600, 800)
+
+    def test_small_images_are_not_upscaled(self):
+        rendered = {name: (width, height) for name, _, _, width, height in render_variants(png(100, 50))}
+
+        assert rendered == {'thumbnail': (100, 50), 'card': (100, 50), 'full': (100, 50)}
+
+    def test_transparent_images_become_jpeg(self):
+        rendered = render_variants(png(200, 200, color=(0, 0, 0, 0), mode='RGBA'))
+        jpeg = next(content for name, fmt, content, _, _ in rendered if fmt == 'jpeg')
+
+        assert Image.open(io.BytesIO(jpeg)).getpixel((0, 0)) == (255, 255, 255)
+
+
+@pytest.mark.django_db
+class TestGenerateVariants:
+    def test_new_image_empties_manifest(self, media, post):
+        with_image(post)
+        generate_variants(Post, 'featured_image', 'featured_image_variants')
+        post.refresh_from_db()
+        assert post.featured_image_variants['variants']
+
+        with_image(post, png(color='blue'), name='other.png')
+
+        assert post.featured_image_variants == {}
+
+    @pytest.mark.parametrize('fixture, image_field, manifest_field', [
+        ('post', 'featured_image', 'featured_image_variants'),
+        ('user', 'avatar', 'avatar_variants'),
+    ])
+    def test_update_fields_save_empties_manifest(self, request, media, fixture, image_field, manifest_field):
+        instance = request.getfixturevalue(fixture)
+        getattr(instance, image_field).save('cover.png', ContentFile(png()))
+        generate_variants(type(instance), image_field, manifest_field)
+        instance.refresh_from_db()
+
+        getattr(instance, image_field).save('other.png', ContentFile(png(color='blue')), save=False)
+        instance.save(update_fields=[image_field])
+
+        instance.refresh_from_db()
+        assert getattr(instance, manifest_field) == {}
+
+    def test_generates_and_stores_variants(self, media, post):
+        with_image(post)
+
+        assert generate_variants(Post, 'featured_image', 'featured_image_variants') == (1, 0)
+        post.refresh_from_db()
+        manifest = post.featured_image_variants
+        assert manifest['source'] == post.featured_image.name
+        assert manifest['variants']['card']['width'] == 640
+        assert all(
+            default_storage.exists(variant[fmt]) for variant in manifest['variants'].values() for fmt in ('webp', 'jpeg')
+        )
+
+    def test_same_bytes_reuse_stored_files(self, media, post, user, category):
+        with_image(post)
+        generate_variants(Post, 'featured_image', 'featured_image_variants')
+        other = with_image(Post.objects.create(title='Other', author=user, category=category, content='x'))
+
+        generate_variants(Post, 'featured_image', 'featured_image_variants')
+
+        other.refresh_from_db()
+        post.refresh_from_db()
+        assert other.featured_image_variants['variants'] == post.featured_image_variants['variants']
+        assert len(list(media.glob('variants/*/*/*'))) == 6
+
+    def test_only_empty_manifests_are_visited(self, media, post, django_assert_num_queries):
+        with_image(post)
+        generate_variants(Post, 'featured_image', 'featured_image_variants')
+
+        with django_assert_num_queries(1):
+            assert generate_variants(Post, 'featured_image', 'featured_image_variants') == (0, 0)
+
+    def test_broken_image_is_recorded_not_retried(self, media, post):
+        with_image(post, b'not an image')
+
+        assert generate_variants(Post, 'featured_image', 'featured_image_variants') == (0, 1)
+        post.refresh_from_db()
+        assert 'error' in post.featured_image_variants
+        assert generate_variants(Post, 'featured_image', 'featured_image_variants') == (0, 0)
+
+    def test_command(self, media, post, user):
+        with_image(post)
+        user.avatar.save('me.png', ContentFile(png(300, 300)))
+        out = io.StringIO()
+
+        call_command('generate_image_variants', stdout=out)
+
+        assert 'blog.Post.featured_image: 1 generated, 0 failed' in out.getvalue()
+        assert 'users.User.avatar: 1 generated, 0 failed' in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestVariantsInResponses:
+    def test_post_detail(self, api_client, media, post):
+        with_image(post)
+        generate_variants(Post, 'featured_image', 'featured_image_variants')
+
+        response = api_client.get(reverse('blog:post-detail', kwargs={'slug': post.slug}))
+
+        thumbnail = response.data['featured_image_variants']['thumbnail']
+        assert thumbnail['width'] == 160
+        assert thumbnail['webp'].startswith('http://testserver/media/variants/')
+        assert response.data['author_avatar_variants'] is None
+
+    def test_pending_variants_are_null(self, api_client, media, post):
+        with_image(post)
+
+        response = api_client.get(reverse('blog:post-list'))
+
+        assert response.data['results'][0]['featured_image_variants'] is None
@@ -0,0 +1,91 @@
+import logging
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.serializers import BaseSerializer
+from apps.blog.models import Post
+from apps.core.instrumentation import collect_metrics, fingerprint, timed
+
+
+class TestFingerprint:
+    def test_collapses_literals_and_in_lists(self):
+        first = fingerprint("SELECT * FROM blog_posts WHERE id IN (%s, %s) AND status = 'published' LIMIT 21")
+        second = fingerprint("SELECT * FROM blog_posts WHERE id IN (%s) AND status = 'draft' LIMIT 5")
+
+        assert first == second == 'SELECT * FROM blog_posts WHERE id IN (...) AND status = ? LIMIT ?'
+
+
+@pytest.mark.django_db
+class TestCollectMetrics:
+    def test_records_queries_and_repeats(self, post):
+        with collect_metrics() as metrics:
+            for _ in range(3):
+                Post.objects.get(pk=post.pk)
+            Post.objects.filter(pk=post.pk + 1).first()
+
+        assert len(metrics.queries) == 4
+        assert metrics.duplicates() == 2
+        assert [count for _, count in metrics.similar()] == [3]
+
+    def test_nested_timings_count_once(self):
+        with collect_metrics() as metrics:
+            with timed('serialize'):
+                with timed('serialize'):
+                    pass
+
+        assert metrics.durations['serialize'] > 0
+        assert metrics.depth == 0
+
+    def test_serializers_are_only_wrapped_while_collecting(self):
+        untimed = BaseSerializer.__dict__['data']
+
+        with collect_metrics():
+            timed_data = BaseSerializer.__dict__['data']
+            with collect_metrics():
+                assert BaseSerializer.__dict__['data'] is timed_data
+            assert BaseSerializer.__dict__['data'] is timed_data
+
+        assert timed_data is not untimed
+        assert BaseSerializer.__dict__['data'] is untimed
+
+    def test_queries_outside_a_request_are_not_kept(self, post):
+        with collect_metrics() as metrics:
+            pass
+        Post.objects.count()
+
+        assert metrics.queries == []
+
+
+@pytest.mark.django_db
+class TestRequestMetricsMiddleware:
+    def test_reports_server_timing_and_logs_the_url_name(self, api_client, post, settings, caplog):
+        settings.REQUEST_METRICS_SAMPLE_RATE = 1
+
+        with CaptureQueriesContext(connection) as queries:
+            with caplog.at_level(logging.INFO, logger='apps.core.instrumentation'):
+                response = api_client.get(reverse('blog:post-list'))
+
+        metrics = dict(part.strip().split(';', 1) for part in response['Server-Timing'].split(','))
+        assert set(metrics) == {'db', 'serialize', 'view'}
+        assert f'"{len(queries)} queries"' in metrics['db']
+        record = caplog.records[0]
+        assert record.url_name == 'blog:post-list'
+        assert record.queries == len(queries)
+        assert record.serialize_ms > 0
+
+    def test_async_views(self, async_client, post, settings):
+        settings.REQUEST_METRICS_SAMPLE_RATE = 1
+        from asgiref.sync import async_to_sync
+
+        response = async_to_sync(async_client.get)(reverse('blog:async-post-detail', kwargs={'slug': post.slug}))
+
+        assert 'db;dur=' in response['Server-Timing']
+        assert '0 queries' not in response['Server-Timing']
+
+    def test_sampling_off(self, api_client, post, settings):
+        settings.REQUEST_METRICS_SAMPLE_RATE = 0
+
+        response = api_client.get(reverse('blog:post-list'))
+
+        assert 'Server-Timing' not in response
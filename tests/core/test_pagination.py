@@ -0,0 +1,163 @@
+import pytest
+from datetime import timedelta
+from unittest import mock
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from apps.blog.models import Post
+from apps.core import pagination
+
+
+@pytest.fixture
+def feed(user):
+    now = timezone.now()
+    posts = []
+    for i in range(7):
+        posts.append(Post.objects.create(
+            title=f'Feed Post {i}',
+            content='Content',
+            author=user,
+            status='published',
+            # Pairs of posts share a timestamp so the id tie-breaker is exercised
+            published_at=now - timedelta(hours=i // 2),
+            views_count=i % 3,
+        ))
+    return posts
+
+
+def walk(client, url, params):
+    titles, pages = [], 0
+    response = client.get(url, params)
+    while True:
+        pages += 1
+        titles += [item['title'] for item in response.data['results']]
+        if not response.data['next']:
+            return titles, pages, response
+        response = client.get(response.data['next'])
+
+
+@pytest.mark.django_db
+class TestKeysetCursorPagination:
+    def test_walks_feed_without_gaps_or_duplicates(self, api_client, feed):
+        expected = [p.title for p in sorted(feed, key=lambda p: (p.published_at, p.id), reverse=True)]
+
+        titles, pages, _ = walk(api_client, reverse('blog:post-list'), {'page_size': 2})
+
+        assert titles == expected
+        assert pages == 4
+
+    def test_previous_link_returns_prior_page(self, api_client, feed):
+        url = reverse('blog:post-list')
+        first = api_client.get(url, {'page_size': 3})
+        second = api_client.get(first.data['next'])
+
+        back = api_client.get(second.data['previous'])
+
+        assert first.data['previous'] is None
+        assert [item['id'] for item in back.data['results']] == [item['id'] for item in first.data['results']]
+        assert back.data['previous'] is None
+
+    def test_popular_orders_by_views_then_id(self, api_client, feed):
+        expected = [p.title for p in sorted(feed, key=lambda p: (p.views_count, p.id), reverse=True)]
+
+        titles, _, _ = walk(api_client, reverse('blog:popular-posts'), {'page_size': 3})
+
+        assert titles == expected
+
+    def test_deep_page_uses_seek_not_offset_or_count(self, api_client, feed):
+        url = reverse('blog:recent-posts')
+        response = api_client.get(url, {'page_size': 2})
+        response = api_client.get(response.data['next'])
+
+        with CaptureQueriesContext(connection) as context:
+            api_client.get(response.data['next'])
+
+        # One page query plus the tags prefetch: no COUNT(*), no OFFSET
+        assert len(context.captured_queries) == 2
+        assert 'OFFSET' not in context.captured_queries[0]['sql']
+
+    def test_invalid_cursor_is_not_found(self, api_client, feed):
+        response = api_client.get(reverse('blog:post-list'), {'cursor': 'garbage'})
+
+        assert response.status_code == 404
+
+    def test_page_param_keeps_numbered_pagination(self, api_client, feed):
+        response = api_client.get(reverse('blog:post-list'), {'page': 1})
+
+        assert response.data['count'] == 7
+
+
+@pytest.mark.django_db
+class TestMyPostsPagination:
+    def test_my_posts_is_paginated(self, authenticated_client, user):
+        for i in range(3):
+            Post.objects.create(title=f'Mine {i}', content='Content', author=user)
+
+        titles, pages, _ = walk(authenticated_client, reverse('blog:my-posts'), {'page_size': 2})
+
+        assert titles == ['Mine 2', 'Mine 1', 'Mine 0']
+        assert pages == 2
+
+
+def count_queries(context):
+    return [query['sql'] for query in context.captured_queries if query['sql'].startswith('SELECT COUNT(*)')]
+
+
+@pytest.mark.django_db
+class TestCachedCountPagination:
+    def test_walks_numbered_pages(self, api_client, feed):
+        titles, pages, response = walk(api_client, reverse('blog:post-list'), {'page': 1, 'page_size': 2})
+
+        assert sorted(titles) == sorted(post.title for post in feed)
+        assert pages == 4
+        assert response.data['count'] == 7
+        assert response.data['count_estimated'] is False
+        assert response.data['previous'].endswith('page=3&page_size=2')
+
+    def test_count_is_cached_per_query(self, api_client, feed):
+        url = reverse('blog:post-list')
+        api_client.get(url, {'page': 1, 'page_size': 2})
+
+        # Another page size is another response, but the same total
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(url, {'page': 1, 'page_size': 3})
+
+        assert count_queries(context) == []
+        assert response.data['count'] == 7
+
+    def test_writes_refresh_the_count(self, api_client, feed, user):
+        url = reverse('blog:post-list')
+        api_client.get(url, {'page': 1, 'page_size': 2})
+        Post.objects.create(title='New', content='Content', author=user, status='published', published_at=timezone.now())
+
+        response = api_client.get(url, {'page': 1, 'page_size': 3})
+
+        assert response.data['count'] == 8
+
+    def test_last_page_is_not_counted(self, api_client, feed):
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(reverse('blog:post-list'), {'page': 4, 'page_size': 2})
+
+        assert count_queries(context) == []
+        assert response.data['count'] == 7
+        assert response.data['next'] is None
+
+    def test_large_totals_are_estimated(self, api_client, feed):
+        with mock.patch.object(pagination, 'estimate_count', return_value=50_000):
+            response = api_client.get(reverse('blog:post-list'), {'page': 1, 'page_size': 2})
+
+        assert response.data['count'] == 50_000
+        assert response.data['count_estimated'] is True
+        assert 'page=2' in response.data['next']
+
+    def test_page_past_the_end_is_not_found(self, api_client, feed):
+        response = api_client.get(reverse('blog:post-list'), {'page': 5, 'page_size': 2})
+
+        assert response.status_code == 404
+
+    def test_user_list(self, token_client, user):
+        response = token_client.get(reverse('users:list'))
+
+        assert response.data['count'] == 1
+        assert response.data['count_estimated'] is False
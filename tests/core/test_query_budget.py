@@ -0,0 +1,45 @@
+import pytest
+from django.urls import URLResolver, get_resolver
+from apps.core.query_budget import QueryBudgetExceeded, assert_query_budget, get_query_budget, query_budget
+from apps.blog.models import Category
+
+
+def iter_patterns(patterns, namespace=None):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_patterns(pattern.url_patterns, pattern.namespace or namespace)
+        else:
+            yield namespace, pattern
+
+
+class TestQueryBudgetDeclarations:
+    def test_every_api_view_declares_a_budget(self):
+        missing = [
+            f'{namespace}:{pattern.name}'
+            for namespace, pattern in iter_patterns(get_resolver().url_patterns)
+            if namespace in ('blog', 'users') and get_query_budget(pattern.callback) is None
+        ]
+
+        assert missing == []
+
+    def test_decorator_sets_budget(self):
+        @query_budget(4)
+        def view(request):
+            return None
+
+        assert get_query_budget(view) == 4
+
+
+@pytest.mark.django_db
+class TestAssertQueryBudget:
+    def test_raises_when_budget_exceeded(self):
+        with pytest.raises(QueryBudgetExceeded):
+            with assert_query_budget('/api/blog/categories/'):
+                for _ in range(4):
+                    list(Category.objects.all())
+
+    def test_passes_within_budget(self):
+        with assert_query_budget('/api/blog/categories/') as context:
+            list(Category.objects.all())
+
+        assert len(context.captured_queries) == 1
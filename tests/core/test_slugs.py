@@ -0,0 +1,75 @@
+import pytest
+from django.db import IntegrityError
+from apps.blog.models import Category, Post, Tag
+from apps.core import slugs
+from apps.core.slugs import allocate_slugs, assign_slugs
+
+
+@pytest.mark.django_db
+class TestAllocateSlugs:
+    def test_suffixes_existing_and_batch_duplicates(self, post, django_assert_num_queries):
+        Post.objects.create(title='Test Post', content='Body', author=post.author)
+
+        with django_assert_num_queries(1):
+            result = allocate_slugs(Post, ['Test Post', 'Test Post', 'Other'])
+
+        assert result == ['test-post-3', 'test-post-4', 'other']
+
+    def test_ignores_slugs_that_only_share_a_prefix(self, user):
+        Post.objects.create(title='Weekly Update Roundup', content='Body', author=user)
+        Post.objects.create(title='Weekly Update', slug='weekly-update-notes', content='Body', author=user)
+
+        assert allocate_slugs(Post, ['Weekly Update']) == ['weekly-update']
+
+    def test_long_bases_are_trimmed_to_fit_the_suffix(self):
+        name = 'x' * 60
+        Tag.objects.create(name=name)
+
+        slug = allocate_slugs(Tag, [name + ' again'])[0]
+
+        assert slug == 'x' * 48 + '-2'
+        assert len(slug) <= Tag._meta.get_field('slug').max_length
+
+    def test_empty_slugs_fall_back_to_the_model_name(self):
+        assert allocate_slugs(Category, ['!!!', '???']) == ['category', 'category-2']
+
+    def test_assign_slugs_for_bulk_create(self, category):
+        categories = [Category(name='Technology (old)'), Category(name='Science', slug='sci')]
+
+        assign_slugs(categories, source='name')
+        Category.objects.bulk_create(categories)
+
+        assert [c.slug for c in categories] == ['technology-old', 'sci']
+
+
+@pytest.mark.django_db
+class TestUniqueSlugSave:
+    def test_same_title_gets_a_suffix(self, post):
+        second = Post.objects.create(title='Test Post', content='Body', author=post.author)
+
+        assert second.slug == 'test-post-2'
+
+    def test_explicit_slug_is_kept(self, user):
+        post = Post.objects.create(title='Anything', slug='custom', content='Body', author=user)
+
+        assert post.slug == 'custom'
+
+    def test_retries_when_a_concurrent_insert_takes_the_slug(self, tag, monkeypatch):
+        real = slugs.allocate_slugs
+        calls = []
+
+        def stale_allocate(model, texts, field='slug'):
+            # The first allocation misses a row another transaction has just committed
+            calls.append(texts)
+            return ['python'] if len(calls) == 1 else real(model, texts, field)
+
+        monkeypatch.setattr(slugs, 'allocate_slugs', stale_allocate)
+
+        created = Tag.objects.create(name='Python!')
+
+        assert created.slug == 'python-2'
+        assert len(calls) == 2
+
+    def test_other_integrity_errors_are_raised(self, tag):
+        with pytest.raises(IntegrityError):
+            Tag.objects.create(name='Python')
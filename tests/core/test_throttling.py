@@ -0,0 +1,107 @@
+import pytest
+from unittest import mock
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+from apps.core import throttling
+from apps.core.throttling import SlidingWindowThrottle
+
+
+class ScopedThrottle(SlidingWindowThrottle):
+    scope = 'test'
+
+
+class ThrottledView(APIView):
+    authentication_classes = []
+    permission_classes = []
+    throttle_classes = [ScopedThrottle]
+
+    def get(self, request):
+        return Response({})
+
+
+@pytest.fixture
+def rates(settings):
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {
+            **settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'],
+            'test': '3/min',
+            'login': '2/min',
+            'login_account': '2/min',
+            'search': '2/min',
+        },
+    }
+
+
+def throttle_at(now, **kwargs):
+    throttle = ScopedThrottle()
+    throttle.timer = lambda: now
+    request = APIRequestFactory().get('/', **kwargs)
+    request.user = None
+    return throttle, throttle.allow_request(request, None)
+
+
+@pytest.mark.usefixtures('rates')
+class TestSlidingWindowThrottle:
+    def test_limits_within_the_window_and_sets_retry_after(self):
+        view = ThrottledView.as_view()
+
+        # Mid-window, so a minute boundary can't fall between the requests
+        with mock.patch.object(ScopedThrottle, 'timer', lambda self: 30.0):
+            statuses = [view(APIRequestFactory().get('/')).status_code for _ in range(4)]
+            response = view(APIRequestFactory().get('/'))
+
+        assert statuses == [200, 200, 200, 429]
+        assert 0 < int(response['Retry-After']) <= 60
+
+    def test_previous_window_weighs_in_proportionally(self):
+        for _ in range(3):
+            throttle_at(59.0)
+
+        # Half of the previous window still overlaps, so it counts as 1.5 requests
+        assert [throttle_at(90.0)[1] for _ in range(2)] == [True, True]
+        throttle, allowed = throttle_at(90.0)
+        assert allowed is False
+        # 3 * (60 - t) / 60 + 2 falls below 3 once the previous window is gone
+        assert throttle.wait() == pytest.approx(30.0)
+
+    def test_clients_are_counted_separately(self):
+        for _ in range(3):
+            throttle_at(10.0, REMOTE_ADDR='10.0.0.1')
+
+        assert throttle_at(10.0, REMOTE_ADDR='10.0.0.1')[1] is False
+        assert throttle_at(10.0, REMOTE_ADDR='10.0.0.2')[1] is True
+
+    def test_counts_in_process_when_the_cache_is_down(self):
+        throttling.local_counters.counts.clear()
+
+        with mock.patch.object(cache, 'get_many', side_effect=ConnectionError), \
+                mock.patch.object(cache, 'add', side_effect=ConnectionError):
+            results = [throttle_at(10.0, REMOTE_ADDR='10.0.0.9')[1] for _ in range(4)]
+
+        assert results == [True, True, True, False]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('rates')
+class TestEndpointThrottles:
+    def test_login_is_limited_per_account_across_ips(self, api_client, user):
+        url = reverse('users:login')
+        statuses = [
+            api_client.post(url, {'email': user.email, 'password': 'wrong'}, REMOTE_ADDR=f'10.0.0.{index}').status_code
+            for index in range(3)
+        ]
+
+        assert statuses == [400, 400, 429]
+
+    def test_only_searches_count_against_the_search_scope(self, api_client, post):
+        url = reverse('blog:post-list')
+        for _ in range(3):
+            assert api_client.get(url).status_code == 200
+
+        statuses = [api_client.get(url, {'search': 'test'}).status_code for _ in range(3)]
+
+        assert statuses == [200, 200, 429]
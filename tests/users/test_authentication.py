@@ -0,0 +1,84 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from apps.users.authentication import CachedTokenAuthentication, token_cache_key
+
+
+@pytest.fixture
+def token(user):
+    return Token.objects.create(user=user)
+
+
+def authenticate(token):
+    request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Token {token.key}')
+    return CachedTokenAuthentication().authenticate(request)
+
+
+@pytest.mark.django_db
+class TestCachedTokenAuthentication:
+    def test_second_request_skips_the_database(self, token, user, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            authenticate(token)
+
+        with django_assert_num_queries(0):
+            cached_user, cached_token = authenticate(token)
+
+        assert (cached_user.pk, cached_user.email, cached_user.is_active) == (user.pk, user.email, True)
+        assert cached_token.key == token.key
+        assert cached_user.auth_token is cached_token
+
+    def test_password_is_not_cached_but_loads_on_demand(self, token):
+        authenticate(token)
+        assert 'password' not in cache.get(token_cache_key(token.key))['user']
+
+        cached_user, _ = authenticate(token)
+
+        assert cached_user.check_password('testpass123')
+
+    def test_deactivation_invalidates(self, token, user):
+        authenticate(token)
+
+        user.is_active = False
+        user.save()
+
+        with pytest.raises(AuthenticationFailed):
+            authenticate(token)
+
+    def test_password_change_invalidates(self, token, user):
+        authenticate(token)
+
+        user.set_password('new-password-456')
+        user.save()
+
+        assert cache.get(token_cache_key(token.key)) is None
+
+    def test_deactivation_during_a_miss_is_not_cached(self, token, user, monkeypatch):
+        read_from_database = TokenAuthentication.authenticate_credentials
+
+        def read_then_deactivate(self, key):
+            # The user row is read first; the deactivation commits before the snapshot is stored
+            result = read_from_database(self, key)
+            user.is_active = False
+            user.save()
+            return result
+
+        monkeypatch.setattr(TokenAuthentication, 'authenticate_credentials', read_then_deactivate)
+        authenticate(token)
+        monkeypatch.undo()
+
+        assert cache.get(token_cache_key(token.key)) is None
+        with pytest.raises(AuthenticationFailed):
+            authenticate(token)
+
+    def test_logout_deletes_the_token_and_its_snapshot(self, token_client):
+        assert token_client.get(reverse('users:profile')).status_code == 200
+
+        token_client.post(reverse('users:logout'))
+
+        response = token_client.get(reverse('users:profile'))
+        assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
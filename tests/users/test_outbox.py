@@ -0,0 +1,99 @@
+import pytest
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from apps.users.models import EmailOutbox
+from apps.users.services import EmailOutboxService, UserAuthService
+
+
+def enqueue(count=1):
+    return [EmailOutboxService.enqueue(f'Subject {index}', 'Body', [f'user{index}@example.com']) for index in range(count)]
+
+
+@pytest.mark.django_db
+class TestEmailOutbox:
+    def test_registration_writes_the_email_with_the_user(self, mailoutbox):
+        user = UserAuthService.register_user(
+            email='new@example.com', username='new', first_name='New', last_name='User', password='pass12345!'
+        )
+
+        assert EmailOutbox.objects.get().to == [user.email]
+        assert mailoutbox == []
+
+    def test_rolled_back_registration_leaves_no_email(self, user):
+        with pytest.raises(IntegrityError), transaction.atomic():
+            UserAuthService.register_user(
+                email=user.email, username='other', first_name='A', last_name='B', password='pass12345!'
+            )
+
+        assert not EmailOutbox.objects.exists()
+
+    def test_batches_share_one_connection(self, mailoutbox):
+        enqueue(5)
+
+        with patch('django.core.mail.backends.locmem.EmailBackend.open') as opened:
+            assert EmailOutboxService.send_pending(batch_size=2) == (5, 0)
+
+        assert opened.call_count == 3
+        assert sorted(message.subject for message in mailoutbox) == [f'Subject {index}' for index in range(5)]
+        assert set(EmailOutbox.objects.values_list('status', flat=True)) == {'sent'}
+
+    def test_claimed_rows_are_not_claimed_twice(self):
+        enqueue(3)
+
+        first = EmailOutboxService.claim(2)
+        second = EmailOutboxService.claim(2)
+
+        assert len(first) == 2 and len(second) == 1
+        assert {row.id for row in first}.isdisjoint(row.id for row in second)
+        assert EmailOutboxService.claim(2) == []
+
+    def test_expired_claims_are_taken_over(self):
+        row, = enqueue()
+        EmailOutboxService.claim(1)
+        EmailOutbox.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        assert [claimed.id for claimed in EmailOutboxService.claim(1)] == [row.id]
+
+    def test_expired_leases_use_up_attempts(self):
+        row, = enqueue()
+
+        for attempt in range(1, EmailOutboxService.MAX_ATTEMPTS + 1):
+            assert [claimed.attempts for claimed in EmailOutboxService.claim(1)] == [attempt]
+            # The worker dies before reporting back
+            EmailOutbox.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        assert EmailOutboxService.claim(1) == []
+        row.refresh_from_db()
+        assert (row.status, row.attempts, row.claimed_by) == ('failed', EmailOutboxService.MAX_ATTEMPTS, None)
+
+    def test_failures_back_off_and_give_up(self, mailoutbox):
+        row, = enqueue()
+
+        with patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('refused')):
+            assert EmailOutboxService.send_pending() == (0, 1)
+            row.refresh_from_db()
+            assert (row.status, row.attempts, row.last_error) == ('pending', 1, 'OSError: refused')
+            assert row.next_attempt_at > timezone.now() + timedelta(seconds=40)
+
+            # Not due yet
+            assert EmailOutboxService.send_pending() == (0, 0)
+
+            EmailOutbox.objects.update(attempts=EmailOutboxService.MAX_ATTEMPTS - 1, next_attempt_at=timezone.now())
+            EmailOutboxService.send_pending()
+
+        row.refresh_from_db()
+        assert row.status == 'failed'
+        assert mailoutbox == []
+
+    def test_send_outbox_command(self, mailoutbox):
+        enqueue(3)
+        out = StringIO()
+
+        call_command('send_outbox', batch_size=2, stdout=out)
+
+        assert len(mailoutbox) == 3
+        assert 'Sent 3 emails, 0 failed' in out.getvalue()
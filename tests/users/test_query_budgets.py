@@ -0,0 +1,50 @@
+import pytest
+from django.urls import reverse
+from apps.core.query_budget import assert_query_budget
+
+
+@pytest.mark.django_db
+class TestUserQueryBudgets:
+    @pytest.mark.parametrize('url_name', ['users:profile', 'users:stats', 'users:list'])
+    def test_read_endpoints_within_budget(self, token_client, post, url_name):
+        url = reverse(url_name)
+
+        with assert_query_budget(url):
+            response = token_client.get(url)
+
+        assert response.status_code == 200
+
+    def test_profile_update_within_budget(self, token_client):
+        url = reverse('users:profile')
+
+        with assert_query_budget(url):
+            response = token_client.patch(url, {'bio': 'Budgeted bio'})
+
+        assert response.status_code == 200
+
+    def test_logout_within_budget(self, token_client):
+        url = reverse('users:logout')
+
+        with assert_query_budget(url):
+            response = token_client.post(url)
+
+        assert response.status_code == 200
+
+    def test_register_and_login_within_budget(self, api_client):
+        url = reverse('users:register')
+        data = {
+            'email': 'budget@example.com',
+            'username': 'budget',
+            'first_name': 'Budget',
+            'last_name': 'User',
+            'password': 'budgetpass123',
+            'password_confirm': 'budgetpass123'
+        }
+        with assert_query_budget(url):
+            response = api_client.post(url, data)
+        assert response.status_code == 201
+
+        url = reverse('users:login')
+        with assert_query_budget(url):
+            response = api_client.post(url, {'email': 'budget@example.com', 'password': 'budgetpass123'})
+        assert response.status_code == 200
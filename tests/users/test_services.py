@@ -70,36 +70,16 @@ class TestUserProfileService:
 
 @pytest.mark.django_db
 class TestUserEmailService:
-    @patch('apps.users.services.send_mail')
-    def test_send_welcome_email_success(self, mock_send_mail, user):
-        mock_send_mail.return_value = True
-        
-        result = UserEmailService.send_welcome_email(user)
-        
-        assert result is True
-        mock_send_mail.assert_called_once()
-        # Check the call arguments
-        call_args = mock_send_mail.call_args
-        assert call_args[1]['subject'] == 'Welcome to Our Platform!'
-        assert user.email in call_args[1]['recipient_list']
+    def test_send_welcome_email_queues_instead_of_sending(self, user, mailoutbox):
+        row = UserEmailService.send_welcome_email(user)
 
-    @patch('apps.users.services.send_mail')
-    def test_send_welcome_email_failure(self, mock_send_mail, user):
-        mock_send_mail.side_effect = Exception('Email sending failed')
-        
-        result = UserEmailService.send_welcome_email(user)
-        
-        assert result is False
+        assert row.subject == 'Welcome to Our Platform!'
+        assert row.to == [user.email]
+        assert row.status == 'pending'
+        assert mailoutbox == []
 
-    @patch('apps.users.services.send_mail')
-    def test_send_password_reset_email_success(self, mock_send_mail, user):
-        mock_send_mail.return_value = True
-        
-        result = UserEmailService.send_password_reset_email(user, 'test-token')
-        
-        assert result is True
-        mock_send_mail.assert_called_once()
-        # Check the call arguments
-        call_args = mock_send_mail.call_args
-        assert call_args[1]['subject'] == 'Password Reset Request'
-        assert user.email in call_args[1]['recipient_list']
\ No newline at end of file
+    def test_send_password_reset_email_queues_the_link(self, user):
+        row = UserEmailService.send_password_reset_email(user, 'test-token')
+
+        assert row.subject == 'Password Reset Request'
+        assert 'reset-password/test-token' in row.body